@@ -8,11 +8,14 @@ _root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if _root not in sys.path:
     sys.path.insert(0, _root)
 
-from backend.create_database import create_database
+from backend.migrations import ensure_schema
 from backend.config import config
 from backend.routes import register_blueprints
+from backend.metrics import init_metrics
+from backend.profiler import init_profiler
+from backend.json_provider import init_json
+from backend.compression import init_compression
 import logging
-import requests
 from flask import Flask, jsonify
 from flask_cors import CORS
 
@@ -24,17 +27,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Initialize database tables on startup
+# Check the schema version on startup. Only the first worker to boot against
+# an outdated database runs the pending migrations (under a DB lock).
 logger.info("Verifying database schema...")
 try:
-    create_database()
-    logger.info("Database schema verified successfully.")
+    schema_version = ensure_schema(auto_migrate=config.AUTO_MIGRATE)
+    logger.info(f"Database schema at version {schema_version}.")
 except Exception as e:
     logger.warning(f"Could not verify database schema on startup: {e}. Tables are assumed to already exist.")
 
 app = Flask(__name__)
+init_json(app)
 # Fully permissive CORS for all routes (important for production connectivity)
 CORS(app, resources={r"/*": {"origins": "*"}})
+init_metrics(app)
+init_profiler(app)
+init_compression(app)
 
 
 @app.route('/', methods=['GET'])
@@ -42,11 +50,16 @@ def home():
     """API status endpoint with database health check"""
     logger.info("Health check endpoint called")
     db_status = "unknown"
+    pool_stats = None
+    cache_stats = None
     try:
-        from backend.database import query_db
+        from backend.database import query_db, get_pool_stats
+        from backend.services.gpa_cache import gpa_cache
         # Simple query to test connection
         query_db("SELECT 1", one=True)
         db_status = "connected"
+        pool_stats = get_pool_stats()
+        cache_stats = gpa_cache.stats()
     except Exception as e:
         db_status = f"error: {str(e)}"
         logger.error(f"Database health check failed: {str(e)}")
@@ -54,38 +67,13 @@ def home():
     return jsonify({
         "status": "online",
         "database": db_status,
+        "pool": pool_stats,
+        "gpa_cache": cache_stats,
         "message": "Academic Tracker API",
         "version": "2.1.0"
     })
 
 
-@app.route('/api/campus-weather')
-def get_weather():
-    """
-    Fetch real weather data using Open-Meteo (Free, No-key required).
-    Coordinates for Vancouver: Lat 49.28, Lon -123.12
-    """
-    try:
-        url = "https://api.open-meteo.com/v1/forecast?latitude=49.2827&longitude=-123.1207&current_weather=true"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        
-        current = data.get('current_weather', {})
-        return jsonify({
-            "temperature": current.get('temperature', 15),
-            "windspeed": current.get('windspeed', 10),
-            "condition": "Live"
-        })
-    except Exception as e:
-        logger.error(f"Weather API error: {str(e)}")
-        # Fallback to mock data if API is down
-        return jsonify({
-            "temperature": 15,
-            "windspeed": 10,
-            "condition": "Offline"
-        })
-
-
 # Register all route blueprints
 register_blueprints(app)
 
@@ -0,0 +1,6 @@
+from backend.services.gpa_history import backfill_gpa_history
+
+
+if __name__ == '__main__':
+    result = backfill_gpa_history()
+    print(f"GPA history backfilled: {result['rows_written']} rows for {result['students']} students.")
@@ -0,0 +1,70 @@
+# Response Compression
+# Compresses JSON and text responses above COMPRESSION_MIN_SIZE bytes with
+# brotli (when the brotli package is installed and the client accepts it)
+# or gzip. Streamed and already-encoded responses are left untouched.
+import gzip
+
+from flask import request
+
+from backend.config import config
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/')
+
+
+def _compressible(response) -> bool:
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """after_request hook: compress the body if it is large enough and the client accepts it."""
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < config.COMPRESSION_MIN_SIZE:
+        return response
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=config.COMPRESSION_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=config.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    # The bytes differ from the identity representation, so any strong
+    # validator becomes weak (If-None-Match uses weak comparison)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Install the compression hook when COMPRESSION_ENABLED is set."""
+    if config.COMPRESSION_ENABLED:
+        app.after_request(compress_response)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load .env file for local development
@@ -17,6 +18,91 @@ class Config:
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     PORT = int(os.getenv('PORT', 5000))
     
+    # Apply pending schema migrations on the first worker boot. Set to False
+    # to require running `python -m backend.migrations` before deploying.
+    AUTO_MIGRATE = os.getenv('AUTO_MIGRATE', 'True').lower() == 'true'
+    
+    # Connection pool settings (PostgreSQL). Idle connections are reaped so
+    # Neon can autosuspend the compute between bursts of traffic.
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 0))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 60))
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+    
+    # Seconds a worker keeps its compiled grading scale and assessment types
+    # before reloading them
+    GRADING_SCALE_TTL = float(os.getenv('GRADING_SCALE_TTL', 300))
+    
+    # Upper bound on scenarios evaluated by one batch GPA forecast request
+    MAX_FORECAST_SCENARIOS = int(os.getenv('MAX_FORECAST_SCENARIOS', 1000))
+    # Upper bound on hypothetical courses in one GPA forecast
+    MAX_FORECAST_COURSES = int(os.getenv('MAX_FORECAST_COURSES', 100))
+    
+    # Monte Carlo forecasts: default and maximum simulations per request
+    FORECAST_SIMULATIONS = int(os.getenv('FORECAST_SIMULATIONS', 100000))
+    MAX_FORECAST_SIMULATIONS = int(os.getenv('MAX_FORECAST_SIMULATIONS', 500000))
+    # Upper bound on simulations x unknown results drawn by one request
+    MAX_SIMULATION_DRAWS = int(os.getenv('MAX_SIMULATION_DRAWS', 2000000))
+    
+    # Upper bound on grid cells in one forecast sensitivity request
+    MAX_SENSITIVITY_CELLS = int(os.getenv('MAX_SENSITIVITY_CELLS', 10000))
+    
+    # Per-student GPA result cache (set GPA_CACHE_ENABLED=false to debug)
+    GPA_CACHE_ENABLED = os.getenv('GPA_CACHE_ENABLED', 'True').lower() == 'true'
+    GPA_CACHE_TTL = float(os.getenv('GPA_CACHE_TTL', 300))
+    GPA_CACHE_MAX_ENTRIES = int(os.getenv('GPA_CACHE_MAX_ENTRIES', 1024))
+    
+    # Prometheus-style metrics on /metrics. Each worker writes its counters
+    # to METRICS_DIR so the endpoint can report across all gunicorn workers.
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'academic-tracker-metrics'))
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 2))
+    # /metrics is only served to requests carrying "Authorization: Bearer
+    # <METRICS_TOKEN>"; without a token the endpoint is off.
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    # Snapshots of workers that exited more than this many seconds ago are dropped
+    METRICS_SNAPSHOT_TTL = float(os.getenv('METRICS_SNAPSHOT_TTL', 300))
+    
+    # SQL profiler: profile every request, or only those sending the
+    # "X-SQL-Profile: 1" header when SQL_PROFILER_ALLOW_HEADER is on (exposes
+    # SQL text in response headers, so it defaults to debug mode only).
+    SQL_PROFILER_ENABLED = os.getenv('SQL_PROFILER_ENABLED', 'False').lower() == 'true'
+    SQL_PROFILER_ALLOW_HEADER = os.getenv('SQL_PROFILER_ALLOW_HEADER', str(DEBUG)).lower() == 'true'
+    SQL_PROFILER_REPEAT_THRESHOLD = int(os.getenv('SQL_PROFILER_REPEAT_THRESHOLD', 3))
+    
+    # Campus weather (Open-Meteo). Values older than WEATHER_CACHE_TTL are
+    # served while a background refresh runs, for up to WEATHER_MAX_STALE.
+    WEATHER_API_URL = os.getenv('WEATHER_API_URL', 'https://api.open-meteo.com/v1/forecast')
+    WEATHER_CACHE_TTL = float(os.getenv('WEATHER_CACHE_TTL', 600))
+    WEATHER_TIMEOUT = float(os.getenv('WEATHER_TIMEOUT', 3))
+    WEATHER_MAX_STALE = float(os.getenv('WEATHER_MAX_STALE', 3600))
+    WEATHER_RETRY_INTERVAL = float(os.getenv('WEATHER_RETRY_INTERVAL', 30))
+    
+    # Cache-Control max-age for the /api/config/* resources; clients
+    # revalidate with If-None-Match afterwards and usually get a 304
+    CONFIG_CACHE_MAX_AGE = int(os.getenv('CONFIG_CACHE_MAX_AGE', 60))
+    
+    # Response compression (brotli needs the optional `brotli` package)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))
+    
+    # Page size for the paginated admin student list
+    ADMIN_PAGE_SIZE = int(os.getenv('ADMIN_PAGE_SIZE', 50))
+    ADMIN_MAX_PAGE_SIZE = int(os.getenv('ADMIN_MAX_PAGE_SIZE', 500))
+    
+    # Cohort GPA summary: split across processes once there are this many courses
+    COHORT_PARALLEL_MIN_COURSES = int(os.getenv('COHORT_PARALLEL_MIN_COURSES', 200000))
+    COHORT_MAX_WORKERS = int(os.getenv('COHORT_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+    
+    # Upper bound on courses + assessments accepted by one bulk import
+    MAX_IMPORT_ROWS = int(os.getenv('MAX_IMPORT_ROWS', 5000))
+    
+    # Rows fetched per round trip when streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
     # CORS settings
     ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '*').split(',')
 
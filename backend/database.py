@@ -1,4 +1,9 @@
+import os
 import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 # Note: psycopg2 is imported lazily inside get_db_connection 
 # to avoid compatibility issues during startup
 
@@ -31,20 +36,284 @@ def is_postgres():
     """Returns True if the configured database is PostgreSQL."""
     return not sanitize_db_uri(config.SQLALCHEMY_DATABASE_URI).startswith('sqlite')
 
+class PoolExhaustedError(RuntimeError):
+    """Raised when no pooled connection becomes free within DB_POOL_TIMEOUT."""
+
+
+class PooledSQLiteConnection(sqlite3.Connection):
+    """
+    Per-thread SQLite connection that survives close().
+    close() only discards uncommitted work, like a fresh connection would,
+    so callers can keep using the open/close pattern.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def really_close(self):
+        sqlite3.Connection.close(self)
+
+
+class PostgresPool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    Connections are handed out LIFO so hot connections get reused and cold
+    ones age out. Idle connections past DB_POOL_IDLE_TIMEOUT are closed by a
+    background reaper (down to min_size), which lets Neon autosuspend.
+    """
+
+    def __init__(self, dsn, min_size=0, max_size=10, timeout=10.0,
+                 idle_timeout=60.0, health_check_interval=30.0):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = []  # list of (conn, last_used) - end of list is hottest
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "created": 0, "reused": 0, "discarded": 0,
+            "reaped": 0, "waits": 0, "timeouts": 0
+        }
+
+        for _ in range(self.min_size):
+            self._size += 1
+            self._idle.append((self._connect(), time.monotonic()))
+
+        if self.idle_timeout > 0:
+            reaper = threading.Thread(target=self._reap_loop, name="pg-pool-reaper", daemon=True)
+            reaper.start()
+
+    def _connect(self):
+        """Open a new connection for a slot already reserved in self._size."""
+        import psycopg2
+        try:
+            conn = psycopg2.connect(self.dsn, connection_factory=_pooled_pg_connection_class())
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        conn._pool = self
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn._pool = None
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """Check out a connection, opening a new one if the pool has room."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolExhaustedError("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolExhaustedError(
+                            f"No database connection available after {self.timeout}s "
+                            f"(max_size={self.max_size})")
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    entry = None
+                    self._size += 1  # reserve the slot before connecting
+
+            if entry is None:
+                return self._connect()
+
+            conn, last_used = entry
+            if self._is_healthy(conn, last_used):
+                with self._cond:
+                    self._stats["reused"] += 1
+                return conn
+            self._discard(conn)
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction."""
+        import psycopg2.extensions
+        if conn.closed or self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def reap(self):
+        """Close connections idle for longer than idle_timeout, keeping min_size."""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            keep = []
+            # Oldest first: the front of the list has been idle the longest
+            for conn, last_used in self._idle:
+                if (now - last_used > self.idle_timeout
+                        and self._size - len(expired) > self.min_size):
+                    expired.append(conn)
+                else:
+                    keep.append((conn, last_used))
+            self._idle = keep
+            self._stats["reaped"] += len(expired)
+        for conn in expired:
+            self._discard(conn)
+
+    def _reap_loop(self):
+        interval = max(self.idle_timeout / 2, 1.0)
+        while not self._closed:
+            time.sleep(interval)
+            try:
+                self.reap()
+            except Exception:
+                pass
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "backend": "postgresql",
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._stats
+            }
+
+
+_pg_connection_class = None
+
+
+def _pooled_pg_connection_class():
+    """Build (once) a psycopg2 connection subclass whose close() returns it to the pool."""
+    global _pg_connection_class
+    if _pg_connection_class is None:
+        import psycopg2.extensions
+
+        class PooledPostgresConnection(psycopg2.extensions.connection):
+            _pool = None
+
+            def close(self):
+                pool = self._pool
+                if pool is not None:
+                    pool.release(self)
+                else:
+                    psycopg2.extensions.connection.close(self)
+
+        _pg_connection_class = PooledPostgresConnection
+    return _pg_connection_class
+
+
+_pool_lock = threading.Lock()
+_pg_pool = None
+_pg_pool_key = None
+_sqlite_local = threading.local()
+_sqlite_stats = {"created": 0, "reused": 0}
+
+
+def _get_pg_pool(db_uri):
+    """Return this process's pool, rebuilding it after a fork or a URI change."""
+    global _pg_pool, _pg_pool_key
+    key = (os.getpid(), db_uri)
+    if _pg_pool_key != key:
+        with _pool_lock:
+            if _pg_pool_key != key:
+                _pg_pool = PostgresPool(
+                    db_uri,
+                    min_size=config.DB_POOL_MIN_SIZE,
+                    max_size=config.DB_POOL_MAX_SIZE,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    idle_timeout=config.DB_POOL_IDLE_TIMEOUT,
+                    health_check_interval=config.DB_POOL_HEALTH_CHECK_INTERVAL
+                )
+                _pg_pool_key = key
+    return _pg_pool
+
+
+def _get_sqlite_connection(db_path):
+    """Return the calling thread's connection for db_path, opening it on first use."""
+    connections = getattr(_sqlite_local, 'connections', None)
+    if connections is None:
+        connections = _sqlite_local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, factory=PooledSQLiteConnection)
+        conn.row_factory = sqlite3.Row
+        # Enforce the declared foreign keys so ON DELETE CASCADE applies
+        conn.execute('PRAGMA foreign_keys = ON')
+        connections[db_path] = conn
+        _sqlite_stats["created"] += 1
+    else:
+        _sqlite_stats["reused"] += 1
+    return conn
+
+
 def get_db_connection():
-    """Get a database connection based on the configuration."""
+    """
+    Get a database connection based on the configuration.
+    Connections are pooled: calling close() hands them back for reuse.
+    """
     db_uri = sanitize_db_uri(config.SQLALCHEMY_DATABASE_URI)
     
     if db_uri.startswith('sqlite'):
-        # SQLite connection
+        # SQLite connection (one reusable connection per thread)
         db_path = db_uri.replace('sqlite:///', '')
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return _get_sqlite_connection(db_path)
     else:
         # PostgreSQL connection (for Render/Neon)
-        import psycopg2
-        return psycopg2.connect(db_uri)
+        return _get_pg_pool(db_uri).acquire()
+
+
+def get_pool_stats():
+    """Report connection pool statistics for the configured database."""
+    if not is_postgres():
+        return {"backend": "sqlite", **_sqlite_stats}
+    return _get_pg_pool(sanitize_db_uri(config.SQLALCHEMY_DATABASE_URI)).stats()
+
 
 def get_cursor(conn):
     """Get a cursor that returns results as dictionaries."""
@@ -63,8 +332,155 @@ def format_query(query, conn):
     else:
         return query.replace('?', '%s') # PostgreSQL uses %s
 
+_query_listeners = []
+
+
+def add_query_listener(listener):
+    """
+    Register listener(query, args, duration_seconds), called after every
+    query_db/execute_db statement (successful or not). Used for metrics
+    and profiling; listeners must be cheap and must not raise.
+    """
+    _query_listeners.append(listener)
+
+
+def _notify_query_listeners(query, args, started):
+    duration = time.perf_counter() - started
+    for listener in _query_listeners:
+        try:
+            listener(query, args, duration)
+        except Exception:
+            pass
+
+
+def _last_id(conn, cursor):
+    if isinstance(conn, sqlite3.Connection):
+        return cursor.lastrowid
+    # PostgreSQL: fetch RETURNING result if query included it
+    if cursor.description:
+        row = cursor.fetchone()
+        return list(row.values())[0] if row else None
+    return None
+
+
+class Transaction:
+    """
+    Unit of work on a single connection, created by transaction().
+    Statements run in order and are committed (or rolled back) together.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def _run(self, query, args):
+        cursor = get_cursor(self.conn)
+        cursor.execute(format_query(query, self.conn), args)
+        return cursor
+
+    def query(self, query, args=(), one=False):
+        """SELECT inside the transaction (sees its uncommitted writes)."""
+        started = time.perf_counter()
+        try:
+            result = self._run(query, args).fetchall()
+            return (result[0] if result else None) if one else result
+        finally:
+            if _query_listeners:
+                _notify_query_listeners(query, args, started)
+
+    def execute(self, query, args=()):
+        """INSERT/UPDATE/DELETE; returns the new row id like execute_db."""
+        started = time.perf_counter()
+        try:
+            return _last_id(self.conn, self._run(query, args))
+        finally:
+            if _query_listeners:
+                _notify_query_listeners(query, args, started)
+
+    def executemany(self, query, seq_of_args):
+        """Run one statement for every args tuple; returns the affected row count."""
+        started = time.perf_counter()
+        seq_of_args = list(seq_of_args)
+        try:
+            cursor = get_cursor(self.conn)
+            cursor.executemany(format_query(query, self.conn), seq_of_args)
+            return cursor.rowcount
+        finally:
+            if _query_listeners:
+                _notify_query_listeners(query, seq_of_args, started)
+
+    def insert_many(self, table, columns, rows, id_column):
+        """
+        Insert many rows in one batch and return their generated ids in
+        input order. PostgreSQL uses execute_values ... RETURNING; SQLite
+        uses executemany, whose AUTOINCREMENT ids are consecutive because
+        the transaction holds the write lock.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        column_list = ', '.join(columns)
+        started = time.perf_counter()
+        query = f'INSERT INTO "{table}" ({column_list}) VALUES %s RETURNING {id_column}'
+        try:
+            if isinstance(self.conn, sqlite3.Connection):
+                query = f'INSERT INTO "{table}" ({column_list}) VALUES ({", ".join("?" * len(columns))})'
+                cursor = self.conn.cursor()
+                cursor.executemany(query, rows)
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                return list(range(last_id - len(rows) + 1, last_id + 1))
+            from psycopg2.extras import execute_values
+            cursor = self.conn.cursor()
+            returned = execute_values(cursor, query, rows, page_size=1000, fetch=True)
+            return [row[0] for row in returned]
+        finally:
+            if _query_listeners:
+                _notify_query_listeners(query, rows, started)
+
+
+_tx_local = threading.local()
+
+
+@contextmanager
+def transaction():
+    """
+    Run several statements on one connection with a single commit:
+
+        with transaction() as tx:
+            tx.execute('DELETE FROM "COURSE" WHERE course_id = ?', (course_id,))
+            tx.execute(...)
+
+    Any exception rolls everything back. query_db/execute_db calls made on
+    the same thread inside the block join the transaction, and nested
+    transaction() blocks reuse the outer one.
+    """
+    current = getattr(_tx_local, 'current', None)
+    if current is not None:
+        yield current
+        return
+
+    conn = get_db_connection()
+    tx = Transaction(conn)
+    try:
+        if isinstance(conn, sqlite3.Connection):
+            # Take the write lock up front so reads and writes see one snapshot
+            conn.execute('BEGIN IMMEDIATE')
+        _tx_local.current = tx
+        yield tx
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _tx_local.current = None
+        conn.close()
+
+
 def query_db(query, args=(), one=False):
     """Execute SELECT query and return results."""
+    tx = getattr(_tx_local, 'current', None)
+    if tx is not None:
+        return tx.query(query, args, one)
+    started = time.perf_counter()
     conn = get_db_connection()
     try:
         formatted_query = format_query(query, conn)
@@ -74,24 +490,56 @@ def query_db(query, args=(), one=False):
         return (result[0] if result else None) if one else result
     finally:
         conn.close()
+        if _query_listeners:
+            _notify_query_listeners(query, args, started)
 
 def execute_db(query, args=()):
     """Execute INSERT/UPDATE/DELETE query."""
+    tx = getattr(_tx_local, 'current', None)
+    if tx is not None:
+        return tx.execute(query, args)
+    started = time.perf_counter()
     conn = get_db_connection()
     try:
         formatted_query = format_query(query, conn)
         cursor = get_cursor(conn)
         cursor.execute(formatted_query, args)
         conn.commit()
+        return _last_id(conn, cursor)
+    finally:
+        conn.close()
+        if _query_listeners:
+            _notify_query_listeners(query, args, started)
+
+
+def stream_query(query, args=(), batch_size=None):
+    """
+    Yield the rows of a SELECT in batches of batch_size without loading the
+    whole result. PostgreSQL uses a named (server-side) cursor; SQLite walks
+    its cursor with fetchmany. The connection is held until the generator
+    is exhausted or closed, so consume it promptly.
+    """
+    batch_size = batch_size or config.EXPORT_BATCH_SIZE
+    started = time.perf_counter()
+    conn = get_db_connection()
+    try:
         if isinstance(conn, sqlite3.Connection):
-            last_id = cursor.lastrowid
+            cursor = conn.cursor()
         else:
-            # PostgreSQL: fetch RETURNING result if query included it
-            if cursor.description:
-                row = cursor.fetchone()
-                last_id = list(row.values())[0] if row else None
-            else:
-                last_id = None
-        return last_id
+            from psycopg2.extras import RealDictCursor
+            cursor = conn.cursor(name=f'stream_{uuid.uuid4().hex}', cursor_factory=RealDictCursor)
+            cursor.itersize = batch_size
+        cursor.execute(format_query(query, conn), args)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+        cursor.close()
     finally:
+        if not isinstance(conn, sqlite3.Connection):
+            # Named cursors live in a transaction; end it before pooling
+            conn.rollback()
         conn.close()
+        if _query_listeners:
+            _notify_query_listeners(query, args, started)
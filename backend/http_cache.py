@@ -0,0 +1,47 @@
+# HTTP Caching
+# Conditional GET support for small, rarely changing JSON resources.
+# The caller supplies a content version that is already held in memory, so a
+# matching If-None-Match is answered with 304 without touching the database
+# or serializing anything; the serialized body is kept per version.
+import hashlib
+import json
+import threading
+
+from flask import current_app, request
+
+from backend.config import config
+
+_lock = threading.Lock()
+_bodies = {}  # cache key -> (version, serialized body)
+
+
+def content_version(payload) -> str:
+    """Stable short hash of a JSON-serializable payload."""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _cache_headers(response, version):
+    response.set_etag(version)
+    response.headers['Cache-Control'] = f'public, max-age={config.CONFIG_CACHE_MAX_AGE}'
+    return response
+
+
+def versioned_json(key: str, version: str, build_payload):
+    """
+    Response for a versioned resource: 304 if the client already has
+    `version`, otherwise the JSON body (serialized once per version) with a
+    strong ETag and Cache-Control.
+    """
+    if request.if_none_match.contains_weak(version):
+        return _cache_headers(current_app.response_class(status=304), version)
+
+    with _lock:
+        cached = _bodies.get(key)
+    if cached is None or cached[0] != version:
+        body = current_app.json.dumps(build_payload())
+        cached = (version, body)
+        with _lock:
+            _bodies[key] = cached
+
+    response = current_app.response_class(cached[1], mimetype='application/json')
+    return _cache_headers(response, version)
@@ -0,0 +1,49 @@
+# JSON Provider
+# Flask JSON provider used for every jsonify() response. It encodes with
+# orjson (a pinned requirement) and handles the types psycopg2 returns natively: DECIMAL columns become
+# numbers and dates/datetimes become ISO 8601 strings, matching what the
+# SQLite backend already returns.
+import datetime
+import decimal
+import json
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson encoding and Decimal/datetime support."""
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj, **kwargs):
+        # orjson has no equivalent for json.dumps keyword arguments (indent,
+        # separators, ...), so calls passing any go through the stdlib
+        if not kwargs:
+            option = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=_default, option=option).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+
+def init_json(app):
+    """Register FastJSONProvider on the app."""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
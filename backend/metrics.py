@@ -0,0 +1,284 @@
+# Request Metrics
+# Per-route latency histograms, status counts, in-flight requests and DB
+# usage per request, exposed in Prometheus text format on /metrics.
+#
+# Each gunicorn worker keeps its own counters in memory and periodically
+# writes a snapshot to METRICS_DIR; /metrics merges the snapshots of all
+# workers so the numbers cover the whole service. A worker removes its
+# snapshot when it exits, and snapshots left behind by workers that died
+# are dropped after METRICS_SNAPSHOT_TTL. The endpoint requires
+# METRICS_TOKEN as a bearer token.
+import atexit
+import bisect
+import glob
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Response, g, has_request_context, request
+
+from backend.config import config
+from backend.database import add_query_listener
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label values are joined with this separator in snapshot keys
+SEP = '|'
+
+
+def _new_histogram(buckets):
+    return {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+
+
+def _observe(histogram, buckets, value):
+    index = bisect.bisect_left(buckets, value)
+    if index < len(buckets):
+        histogram["buckets"][index] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+
+class MetricsRegistry:
+    """In-process metric store. Histogram buckets are stored non-cumulative."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}      # "method|route" -> histogram (seconds)
+        self.db_time = {}      # "method|route" -> histogram (seconds of DB time per request)
+        self.db_queries = {}   # "method|route" -> histogram (queries per request)
+        self.statuses = {}     # "method|route|status" -> count
+        self.in_flight = 0
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._pending_flush = None   # (pid, timer) for the trailing flush
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe_request(self, method, route, status, duration, db_queries, db_seconds):
+        key = f"{method}{SEP}{route}"
+        status_key = f"{key}{SEP}{status}"
+        with self._lock:
+            _observe(self.latency.setdefault(key, _new_histogram(LATENCY_BUCKETS)), LATENCY_BUCKETS, duration)
+            _observe(self.db_time.setdefault(key, _new_histogram(LATENCY_BUCKETS)), LATENCY_BUCKETS, db_seconds)
+            _observe(self.db_queries.setdefault(key, _new_histogram(DB_QUERY_BUCKETS)), DB_QUERY_BUCKETS, db_queries)
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps({
+                "pid": os.getpid(),
+                "latency": self.latency,
+                "db_time": self.db_time,
+                "db_queries": self.db_queries,
+                "statuses": self.statuses,
+                "in_flight": self.in_flight
+            }))
+
+    def flush(self, force=False):
+        """
+        Write this worker's snapshot to METRICS_DIR. Unforced flushes are
+        rate-limited; one skipped by the limit is retried by a timer when
+        the interval ends, so a worker that goes idle still publishes its
+        last requests.
+        """
+        with self._flush_lock:
+            now = time.monotonic()
+            wait = config.METRICS_FLUSH_INTERVAL - (now - self._last_flush)
+            if not force and wait > 0:
+                self._schedule_flush(wait)
+                return
+            self._last_flush = now
+            try:
+                os.makedirs(config.METRICS_DIR, exist_ok=True)
+                path = _snapshot_path(os.getpid())
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.snapshot(), f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def _schedule_flush(self, delay):
+        # Timers don't survive a fork, hence the pid check
+        if self._pending_flush is not None and self._pending_flush[0] == os.getpid():
+            return
+        timer = threading.Timer(delay, self._trailing_flush)
+        timer.daemon = True
+        self._pending_flush = (os.getpid(), timer)
+        timer.start()
+
+    def _trailing_flush(self):
+        self._pending_flush = None
+        self.flush(force=True)
+
+
+def _snapshot_path(pid):
+    return os.path.join(config.METRICS_DIR, f"metrics-{pid}.json")
+
+
+def remove_snapshot():
+    """Delete this worker's snapshot (registered to run when the worker exits)."""
+    try:
+        os.remove(_snapshot_path(os.getpid()))
+    except OSError:
+        pass
+
+
+registry = MetricsRegistry()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _merge_histograms(target, source):
+    for key, histogram in source.items():
+        merged = target.setdefault(key, {"buckets": [0] * len(histogram["buckets"]), "sum": 0.0, "count": 0})
+        merged["buckets"] = [a + b for a, b in zip(merged["buckets"], histogram["buckets"])]
+        merged["sum"] += histogram["sum"]
+        merged["count"] += histogram["count"]
+
+
+def collect_all_workers():
+    """
+    Merge snapshots from every worker. A snapshot whose worker is gone and
+    that hasn't been written for METRICS_SNAPSHOT_TTL seconds is deleted
+    instead (a worker that died without cleaning up).
+    """
+    registry.flush(force=True)
+    merged = {"latency": {}, "db_time": {}, "db_queries": {}, "statuses": {}, "in_flight": 0}
+    now = time.time()
+    for path in glob.glob(os.path.join(config.METRICS_DIR, "metrics-*.json")):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+            expired = now - os.path.getmtime(path) > config.METRICS_SNAPSHOT_TTL
+        except (OSError, ValueError):
+            continue
+        if expired and not _pid_alive(snapshot.get("pid", -1)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        for name in ("latency", "db_time", "db_queries"):
+            _merge_histograms(merged[name], snapshot.get(name, {}))
+        for key, count in snapshot.get("statuses", {}).items():
+            merged["statuses"][key] = merged["statuses"].get(key, 0) + count
+        if _pid_alive(snapshot.get("pid", -1)):
+            merged["in_flight"] += snapshot.get("in_flight", 0)
+    return merged
+
+
+def _labels(**labels):
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _render_histogram(lines, name, help_text, histograms, buckets):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key in sorted(histograms):
+        method, route = key.split(SEP, 1)
+        histogram = histograms[key]
+        cumulative = 0
+        for bound, count in zip(buckets, histogram["buckets"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(method=method, route=route, le='+Inf')} {histogram['count']}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {histogram['sum']}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {histogram['count']}")
+
+
+def render_prometheus(merged) -> str:
+    lines = []
+    _render_histogram(lines, "http_request_duration_seconds",
+                      "Request latency by route.", merged["latency"], LATENCY_BUCKETS)
+
+    lines.append("# HELP http_requests_total Requests by route and status code.")
+    lines.append("# TYPE http_requests_total counter")
+    for key in sorted(merged["statuses"]):
+        method, route, status = key.split(SEP)
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} "
+                     f"{merged['statuses'][key]}")
+
+    lines.append("# HELP http_requests_in_flight Requests currently being served.")
+    lines.append("# TYPE http_requests_in_flight gauge")
+    lines.append(f"http_requests_in_flight {merged['in_flight']}")
+
+    _render_histogram(lines, "db_queries_per_request",
+                      "Database statements issued per request.", merged["db_queries"], DB_QUERY_BUCKETS)
+    _render_histogram(lines, "db_time_per_request_seconds",
+                      "Time spent in the database per request.", merged["db_time"], LATENCY_BUCKETS)
+    return "\n".join(lines) + "\n"
+
+
+def _on_query(query, args, duration):
+    if has_request_context() and 'metrics_started' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_seconds += duration
+
+
+def init_metrics(app):
+    """Install the request hooks and the /metrics endpoint on the app."""
+    if not config.METRICS_ENABLED:
+        return
+
+    add_query_listener(_on_query)
+    atexit.register(remove_snapshot)
+
+    @app.before_request
+    def _metrics_before():
+        if request.path == '/metrics':
+            return
+        g.metrics_started = time.perf_counter()
+        g.metrics_db_queries = 0
+        g.metrics_db_seconds = 0.0
+        registry.request_started()
+
+    @app.after_request
+    def _metrics_after(response):
+        if 'metrics_started' in g:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            registry.observe_request(
+                request.method, route, response.status_code,
+                time.perf_counter() - g.metrics_started,
+                g.metrics_db_queries, g.metrics_db_seconds
+            )
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # Flush only once the request no longer counts as in flight
+        if g.pop('metrics_started', None) is not None:
+            registry.request_finished()
+            registry.flush()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus metrics aggregated across workers (bearer METRICS_TOKEN required)"""
+        if not config.METRICS_TOKEN:
+            return Response("Not found\n", status=404, mimetype='text/plain')
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {config.METRICS_TOKEN}".encode()):
+            return Response("Unauthorized\n", status=401, mimetype='text/plain',
+                            headers={"WWW-Authenticate": "Bearer"})
+        return Response(render_prometheus(collect_all_workers()),
+                        mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,415 @@
+# Schema Migrations
+# Ordered, numbered migrations recorded in a schema_version table.
+# Workers only read the current version at startup; pending migrations are
+# applied once, either by `python -m backend.migrations` or by the first
+# worker to boot, under a database-level lock.
+#
+# Every migration is idempotent (IF NOT EXISTS, insert-if-missing), so a
+# database created before schema_version existed is brought up to date by
+# replaying them all.
+import logging
+import sqlite3
+
+from werkzeug.security import generate_password_hash
+
+from backend.database import get_db_connection, format_query, query_db
+from backend.services.grading_scale import invalidate_grading_scale
+from backend.services.config_service import invalidate_assessment_types
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the migration lock for pg_advisory_lock
+MIGRATION_LOCK_ID = 7_415_203
+
+
+class Dialect:
+    """SQL fragments that differ between SQLite and PostgreSQL."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.is_sqlite = isinstance(conn, sqlite3.Connection)
+        self.pk_type = "INTEGER PRIMARY KEY AUTOINCREMENT" if self.is_sqlite else "SERIAL PRIMARY KEY"
+        self.ignore = "OR IGNORE" if self.is_sqlite else ""
+        self.conflict = "" if self.is_sqlite else "ON CONFLICT DO NOTHING"
+
+    def format(self, query):
+        return format_query(query, self.conn)
+
+
+def _add_column(cursor, dialect, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    if dialect.is_sqlite:
+        cursor.execute(f'PRAGMA table_info("{table}")')
+        if any(row[1] == column for row in cursor.fetchall()):
+            return
+        cursor.execute(f'ALTER TABLE "{table}" ADD COLUMN {column} {definition}')
+    else:
+        cursor.execute(f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS {column} {definition}')
+
+
+def _create_base_tables(cursor, dialect):
+    PK_TYPE = dialect.pk_type
+
+    # Create USER table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "USER" (
+            user_id {PK_TYPE},
+            firstname VARCHAR(50) NOT NULL,
+            lastname VARCHAR(50) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            user_type VARCHAR(10) NOT NULL DEFAULT 'Student'
+        )
+    ''')
+
+    # Create COURSE table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "COURSE" (
+            course_id {PK_TYPE},
+            course_code VARCHAR(20) NOT NULL,
+            course_name VARCHAR(100) NOT NULL,
+            credit_hours DECIMAL(3,1) NOT NULL,
+            semester VARCHAR(20) NOT NULL,
+            student_id INTEGER NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES "USER"(user_id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Create ASSESSMENT table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "ASSESSMENT" (
+            assessment_id {PK_TYPE},
+            name VARCHAR(100) NOT NULL,
+            assessment_type VARCHAR(20) NOT NULL,
+            weight DECIMAL(5,2) NOT NULL,
+            marks DECIMAL(6,2) NOT NULL,
+            earned_marks DECIMAL(6,2),
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES "USER"(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES "COURSE"(course_id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Create GPAREPORT table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "GPAREPORT" (
+            report_id {PK_TYPE},
+            semester_gpa DECIMAL(3,2),
+            cumulative_gpa DECIMAL(3,2),
+            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            student_id INTEGER NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES "USER"(user_id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Create WHATIFSCENARIO table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "WHATIFSCENARIO" (
+            scenario_id {PK_TYPE},
+            scenario_name VARCHAR(100),
+            desired_grades DECIMAL(5,2) NOT NULL,
+            predicted_gpa DECIMAL(3,2),
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            FOREIGN KEY (student_id) REFERENCES "USER"(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES "COURSE"(course_id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Create ASSESSMENT_TYPE table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "ASSESSMENT_TYPE" (
+            type_id {PK_TYPE},
+            name VARCHAR(50) UNIQUE NOT NULL,
+            default_weight DECIMAL(5,2) DEFAULT 0,
+            color VARCHAR(20) DEFAULT '#bb86fc'
+        )
+    ''')
+
+    # Create GRADINGSCALE table
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS "GRADINGSCALE" (
+            scale_id {PK_TYPE},
+            letter_grade VARCHAR(3) UNIQUE NOT NULL,
+            min_score DECIMAL(5,2) NOT NULL,
+            max_score DECIMAL(5,2) NOT NULL,
+            gpa_value DECIMAL(3,2) NOT NULL
+        )
+    ''')
+
+
+def _seed_reference_data(cursor, dialect):
+    # Insert KPU grading scale data
+    grading_scale = [
+        ('A+', 90.00, 100.00, 4.00),
+        ('A', 85.00, 89.99, 4.00),
+        ('A-', 80.00, 84.99, 3.70),
+        ('B+', 77.00, 79.99, 3.30),
+        ('B', 73.00, 76.99, 3.00),
+        ('B-', 70.00, 72.99, 2.70),
+        ('C+', 67.00, 69.99, 2.30),
+        ('C', 63.00, 66.99, 2.00),
+        ('C-', 60.00, 62.99, 1.70),
+        ('D', 50.00, 59.99, 1.00),
+        ('F', 0.00, 49.99, 0.00)
+    ]
+    cursor.executemany(dialect.format(
+        f'INSERT {dialect.ignore} INTO "GRADINGSCALE" (letter_grade, min_score, max_score, gpa_value) '
+        f'VALUES (?, ?, ?, ?) {dialect.conflict}'), grading_scale)
+
+    # Insert Default Assessment Types
+    assessment_types = [
+        ('Assignment', 10.0, '#bb86fc'),  # Purple
+        ('Quiz', 5.0, '#03dac6'),         # Teal
+        ('Midterm', 20.0, '#d76d77'),     # Red
+        ('Final', 30.0, '#3a1c71'),       # Deep Purple
+        ('Project', 15.0, '#ffaf7b'),     # Orange
+        ('Lab', 10.0, '#ff8c00'),         # Dark Orange
+        ('Participation', 5.0, '#cf6679')  # Pink
+    ]
+    cursor.executemany(dialect.format(
+        f'INSERT {dialect.ignore} INTO "ASSESSMENT_TYPE" (name, default_weight, color) '
+        f'VALUES (?, ?, ?) {dialect.conflict}'), assessment_types)
+
+
+def _seed_test_accounts(cursor, dialect):
+    # Only hash and insert when the account is missing
+    accounts = [
+        ('Test', 'Student', 'test@student.com', 'password123', 'Student'),
+        ('Admin', 'User', 'admin@kpu.ca', 'admin123', 'Admin'),
+    ]
+    for firstname, lastname, email, password, user_type in accounts:
+        cursor.execute(dialect.format('SELECT user_id FROM "USER" WHERE email = ?'), (email,))
+        if cursor.fetchone():
+            continue
+        cursor.execute(dialect.format('''
+            INSERT INTO "USER" (firstname, lastname, email, password, user_type)
+            VALUES (?, ?, ?, ?, ?)
+        '''), (firstname, lastname, email, generate_password_hash(password), user_type))
+
+
+def _add_profile_columns(cursor, dialect):
+    _add_column(cursor, dialect, "USER", "student_id", "VARCHAR(50) DEFAULT ''")
+    _add_column(cursor, dialect, "USER", "major", "VARCHAR(100) DEFAULT ''")
+    _add_column(cursor, dialect, "USER", "level", "VARCHAR(50) DEFAULT ''")
+
+
+def _add_gpareport_semester(cursor, dialect):
+    _add_column(cursor, dialect, "GPAREPORT", "semester", "VARCHAR(20)")
+
+
+def _create_foreign_key_indexes(cursor, dialect):
+    # Composite indexes also serve lookups on their leading column, so
+    # COURSE(student_id) and ASSESSMENT(student_id) are covered by them.
+    indexes = [
+        ("idx_course_student_semester",   '"COURSE" (student_id, semester)'),
+        ("idx_course_semester",           '"COURSE" (semester)'),
+        ("idx_assessment_course",         '"ASSESSMENT" (course_id, assessment_id)'),
+        ("idx_assessment_student_course", '"ASSESSMENT" (student_id, course_id)'),
+        # GPA history is always read per student in date order
+        ("idx_gpareport_student_date",    '"GPAREPORT" (student_id, date)'),
+    ]
+    for index_name, index_def in indexes:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {index_def}')
+
+
+def _create_student_directory_indexes(cursor, dialect):
+    # Keyset pagination of the admin student list: each sort order is an
+    # index range scan on (user_type, sort column, user_id).
+    indexes = [
+        ("idx_user_type_id",       '"USER" (user_type, user_id)'),
+        ("idx_user_type_lastname", '"USER" (user_type, lastname, user_id)'),
+        ("idx_user_type_email",    '"USER" (user_type, email, user_id)'),
+    ]
+    for index_name, index_def in indexes:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {index_def}')
+
+
+def _create_cascade_indexes(cursor, dialect):
+    # With foreign keys enforced, deleting a USER or COURSE looks up the
+    # referencing WHATIFSCENARIO rows; without these that is a table scan.
+    indexes = [
+        ("idx_whatif_student", '"WHATIFSCENARIO" (student_id)'),
+        ("idx_whatif_course",  '"WHATIFSCENARIO" (course_id)'),
+    ]
+    for index_name, index_def in indexes:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {index_def}')
+
+
+def _extend_whatif_scenarios(cursor, dialect):
+    # Saved scenarios keep their JSON inputs and computed forecast. A GPA
+    # scenario spans several courses, so course_id and desired_grades (the
+    # target) become optional. USER.grades_version is bumped whenever a
+    # student's grades change so cached results can be checked cheaply.
+    _add_column(cursor, dialect, "USER", "grades_version", "INTEGER NOT NULL DEFAULT 0")
+
+    new_columns = [
+        ("scenario_type", "VARCHAR(20) NOT NULL DEFAULT 'gpa'"),
+        ("inputs", "TEXT"),
+        ("inputs_hash", "VARCHAR(64)"),
+        ("grades_version", "INTEGER"),
+        ("result", "TEXT"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ]
+    if dialect.is_sqlite:
+        cursor.execute('PRAGMA table_info("WHATIFSCENARIO")')
+        if not any(row[1] == 'inputs' for row in cursor.fetchall()):
+            # SQLite can't drop NOT NULL, so rebuild the table. Nothing
+            # references WHATIFSCENARIO, so this is safe with foreign keys on.
+            column_defs = ",\n".join(f"{name} {definition}" for name, definition in new_columns)
+            cursor.execute(f'''
+                CREATE TABLE "WHATIFSCENARIO_new" (
+                    scenario_id {dialect.pk_type},
+                    scenario_name VARCHAR(100),
+                    desired_grades DECIMAL(5,2),
+                    predicted_gpa DECIMAL(3,2),
+                    student_id INTEGER NOT NULL,
+                    course_id INTEGER,
+                    {column_defs},
+                    FOREIGN KEY (student_id) REFERENCES "USER"(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY (course_id) REFERENCES "COURSE"(course_id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute('''
+                INSERT INTO "WHATIFSCENARIO_new"
+                    (scenario_id, scenario_name, desired_grades, predicted_gpa, student_id, course_id)
+                SELECT scenario_id, scenario_name, desired_grades, predicted_gpa, student_id, course_id
+                FROM "WHATIFSCENARIO"
+            ''')
+            cursor.execute('DROP TABLE "WHATIFSCENARIO"')
+            cursor.execute('ALTER TABLE "WHATIFSCENARIO_new" RENAME TO "WHATIFSCENARIO"')
+    else:
+        cursor.execute('ALTER TABLE "WHATIFSCENARIO" ALTER COLUMN desired_grades DROP NOT NULL')
+        cursor.execute('ALTER TABLE "WHATIFSCENARIO" ALTER COLUMN course_id DROP NOT NULL')
+        for name, definition in new_columns:
+            _add_column(cursor, dialect, "WHATIFSCENARIO", name, definition)
+
+    # The rebuild dropped migration 8's indexes; scenarios are also looked up by name
+    _create_cascade_indexes(cursor, dialect)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_whatif_student_name '
+                   'ON "WHATIFSCENARIO" (student_id, scenario_name)')
+
+
+# (version, description, function). Append new migrations; never reorder.
+MIGRATIONS = [
+    (1, "Create base tables", _create_base_tables),
+    (2, "Seed grading scale and assessment types", _seed_reference_data),
+    (3, "Seed test student and admin accounts", _seed_test_accounts),
+    (4, "Add profile columns to USER", _add_profile_columns),
+    (5, "Add semester to GPAREPORT", _add_gpareport_semester),
+    (6, "Index hot foreign keys", _create_foreign_key_indexes),
+    (7, "Index USER for paginated student listing", _create_student_directory_indexes),
+    (8, "Index WHATIFSCENARIO foreign keys for cascading deletes", _create_cascade_indexes),
+    (9, "Store what-if scenario inputs and cached results", _extend_whatif_scenarios),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Current schema version (0 if schema_version doesn't exist yet). One query."""
+    try:
+        row = query_db('SELECT MAX(version) AS version FROM schema_version', one=True)
+    except Exception:
+        return 0
+    return (row['version'] if row else None) or 0
+
+
+def _create_version_table(cursor, dialect):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _current_version(cursor):
+    cursor.execute('SELECT MAX(version) FROM schema_version')
+    row = cursor.fetchone()
+    return (row[0] if row else None) or 0
+
+
+def migrate() -> list:
+    """
+    Apply pending migrations under a database-level lock.
+
+    SQLite holds an exclusive transaction for the whole run; PostgreSQL takes
+    an advisory lock and commits each migration with its version row. Workers
+    that lose the race wait, re-read the version and find nothing to do.
+
+    Returns:
+        list of (version, description) applied by this call
+    """
+    conn = get_db_connection()
+    dialect = Dialect(conn)
+    cursor = conn.cursor()
+    applied = []
+    try:
+        if dialect.is_sqlite:
+            if conn.in_transaction:
+                conn.commit()
+            cursor.execute('BEGIN EXCLUSIVE')
+        else:
+            cursor.execute('SELECT pg_advisory_lock(%s)', (MIGRATION_LOCK_ID,))
+
+        _create_version_table(cursor, dialect)
+        current = _current_version(cursor)
+        if not dialect.is_sqlite:
+            conn.commit()
+
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            apply(cursor, dialect)
+            cursor.execute(dialect.format(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)'), (version, description))
+            if not dialect.is_sqlite:
+                conn.commit()
+            applied.append((version, description))
+            logger.info(f"Migration {version} applied: {description}")
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if not dialect.is_sqlite:
+            try:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', (MIGRATION_LOCK_ID,))
+                conn.commit()
+            except Exception:
+                pass
+        conn.close()
+
+    if applied:
+        invalidate_grading_scale()
+        invalidate_assessment_types()
+    return applied
+
+
+def ensure_schema(auto_migrate: bool = True) -> int:
+    """
+    Startup check for workers: read the schema version and only migrate
+    (under the lock) when it is behind. Returns the resulting version.
+    """
+    version = get_schema_version()
+    if version >= LATEST_VERSION:
+        return version
+    if not auto_migrate:
+        logger.warning(
+            f"Database schema is at version {version}, latest is {LATEST_VERSION}. "
+            f"Run: python -m backend.migrations")
+        return version
+    migrate()
+    return get_schema_version()
+
+
+if __name__ == '__main__':
+    applied = migrate()
+    for version, description in applied:
+        print(f"Applied migration {version}: {description}")
+    print(f"Schema is at version {get_schema_version()} (latest {LATEST_VERSION}).")
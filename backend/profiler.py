@@ -0,0 +1,189 @@
+# SQL Profiler
+# Records every query_db/execute_db statement issued while a profile is
+# active: normalized SQL, number of args, duration and the calling function.
+# Statements repeated with the same shape are reported as N+1 patterns.
+#
+# Per request it is enabled by SQL_PROFILER_ENABLED or, when allowed, by
+# sending the header "X-SQL-Profile: 1"; the summary comes back in the
+# X-SQL-Profile response headers. Tests use query_budget() instead.
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+
+from flask import request
+
+from backend.config import config
+from backend.database import add_query_listener
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are skipped when looking for the caller
+_SKIP_FILES = (
+    os.path.normcase(os.path.join('backend', 'database.py')),
+    os.path.normcase(os.path.join('backend', 'profiler.py')),
+)
+
+_local = threading.local()
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace and replace literals so equivalent statements compare equal."""
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def _caller():
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.normcase(frame.f_code.co_filename)
+        if not filename.endswith(_SKIP_FILES):
+            module = frame.f_globals.get('__name__', '?')
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryProfile:
+    """Statements captured while this profile is active on the current thread."""
+
+    def __init__(self, repeat_threshold=None):
+        self.repeat_threshold = repeat_threshold or config.SQL_PROFILER_REPEAT_THRESHOLD
+        self.statements = []
+
+    def record(self, query, args, duration, caller):
+        self.statements.append({
+            "sql": normalize_sql(query),
+            "args": len(args) if args else 0,
+            "duration_ms": round(duration * 1000, 3),
+            "caller": caller
+        })
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def total_ms(self):
+        return round(sum(s['duration_ms'] for s in self.statements), 3)
+
+    def repeated(self) -> list:
+        """Statements run at least repeat_threshold times, most frequent first."""
+        groups = {}
+        for statement in self.statements:
+            group = groups.setdefault(statement['sql'], {"sql": statement['sql'], "count": 0, "callers": []})
+            group['count'] += 1
+            if statement['caller'] not in group['callers']:
+                group['callers'].append(statement['caller'])
+        return sorted(
+            (g for g in groups.values() if g['count'] >= self.repeat_threshold),
+            key=lambda g: -g['count']
+        )
+
+    def summary(self) -> dict:
+        return {
+            "queries": self.count,
+            "total_ms": self.total_ms,
+            "n_plus_one": self.repeated()
+        }
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements, {self.total_ms} ms"]
+        for statement in self.statements:
+            lines.append(f"  {statement['duration_ms']:>8} ms  {statement['caller']}  {statement['sql']}")
+        for group in self.repeated():
+            lines.append(f"  N+1: {group['count']}x from {', '.join(group['callers'])}: {group['sql']}")
+        return "\n".join(lines)
+
+
+def _active_profiles():
+    profiles = getattr(_local, 'profiles', None)
+    if profiles is None:
+        profiles = _local.profiles = []
+    return profiles
+
+
+def _on_query(query, args, duration):
+    profiles = getattr(_local, 'profiles', None)
+    if not profiles:
+        return
+    caller = _caller()
+    for profile in profiles:
+        profile.record(query, args, duration, caller)
+
+
+add_query_listener(_on_query)
+
+
+@contextmanager
+def profile_queries(repeat_threshold=None):
+    """Capture the statements issued on this thread inside the block."""
+    profile = QueryProfile(repeat_threshold)
+    profiles = _active_profiles()
+    profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        profiles.remove(profile)
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_repeats: bool = False):
+    """
+    Test helper: fail when the block issues more than max_queries statements
+    or, unless allow_repeats is set, when it contains an N+1 pattern.
+
+        with query_budget(3):
+            client.get('/api/students/1/dashboard')
+    """
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > max_queries:
+        raise AssertionError(f"Query budget of {max_queries} exceeded: {profile.report()}")
+    if not allow_repeats and profile.repeated():
+        raise AssertionError(f"Repeated statements (N+1) detected: {profile.report()}")
+
+
+def _header_requested():
+    return (config.SQL_PROFILER_ALLOW_HEADER
+            and request.headers.get('X-SQL-Profile', '').lower() in ('1', 'true', 'on'))
+
+
+def init_profiler(app):
+    """Profile requests when enabled by config or the X-SQL-Profile header."""
+
+    @app.before_request
+    def _profiler_before():
+        if config.SQL_PROFILER_ENABLED or _header_requested():
+            profile = QueryProfile()
+            _active_profiles().append(profile)
+            request.environ['sql_profile'] = profile
+
+    @app.after_request
+    def _profiler_after(response):
+        profile = request.environ.get('sql_profile')
+        if profile is None:
+            return response
+        summary = profile.summary()
+        response.headers['X-SQL-Profile'] = f"queries={summary['queries']}; total_ms={summary['total_ms']}"
+        if summary['n_plus_one']:
+            response.headers['X-SQL-Profile-N-Plus-One'] = json.dumps([
+                {"sql": group['sql'][:200], "count": group['count'], "callers": group['callers']}
+                for group in summary['n_plus_one']
+            ])
+            logger.warning(f"N+1 queries on {request.method} {request.path}: {profile.report()}")
+        return response
+
+    @app.teardown_request
+    def _profiler_teardown(exc):
+        profile = request.environ.pop('sql_profile', None)
+        if profile is not None and profile in _active_profiles():
+            _active_profiles().remove(profile)
@@ -1,14 +1,47 @@
 # Admin Routes
-from flask import Blueprint, jsonify
-from backend.database import query_db, execute_db
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from backend.config import config
+from backend.database import query_db, transaction
+from backend.services.student_directory import list_students_page
+from backend.services.cohort_gpa import compute_cohort_gpa
+from backend.services.transcript_export import FORMATS, export_transcripts
+import logging
 from backend.services.gpa_service import calculate_student_gpa
+from backend.services.gpa_cache import invalidate_student_gpa
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+logger = logging.getLogger(__name__)
 
 
 @admin_bp.route('/students', methods=['GET'])
 def get_all_students():
-    """Get all students (admin only)"""
+    """
+    Get students (admin only).
+
+    Without query parameters the full list is returned as before. With any of
+    limit, cursor, sort (user_id, lastname, email; '-' prefix for descending),
+    q (name/email filter) or include_total, one page is returned:
+    {"students": [...], "next_cursor": ..., "limit": n, "sort": ...}
+    """
+    if any(key in request.args for key in ('limit', 'cursor', 'sort', 'q', 'include_total')):
+        try:
+            limit = int(request.args.get('limit', config.ADMIN_PAGE_SIZE))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        if not 1 <= limit <= config.ADMIN_MAX_PAGE_SIZE:
+            return jsonify({"error": f"limit must be between 1 and {config.ADMIN_MAX_PAGE_SIZE}"}), 400
+        try:
+            page = list_students_page(
+                limit,
+                cursor=request.args.get('cursor'),
+                sort=request.args.get('sort', 'user_id'),
+                search=request.args.get('q', '').strip() or None,
+                include_total=request.args.get('include_total', '').lower() in ('1', 'true')
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(page)
+
     students = query_db(
         '''SELECT user_id, firstname, lastname, email 
            FROM "USER" WHERE user_type = 'Student' '''
@@ -20,21 +53,10 @@ def get_all_students():
 def delete_student(student_id):
     """Delete a student and all related data"""
     try:
-        # Delete assessments for student
-        execute_db('DELETE FROM "ASSESSMENT" WHERE student_id = ?', (student_id,))
-        
-        # Delete assessments for courses owned by student
-        execute_db(
-            '''DELETE FROM "ASSESSMENT" WHERE course_id IN 
-               (SELECT course_id FROM "COURSE" WHERE student_id = ?)''',
-            (student_id,)
-        )
-        
-        # Delete courses
-        execute_db('DELETE FROM "COURSE" WHERE student_id = ?', (student_id,))
-        
-        # Delete user
-        execute_db('DELETE FROM "USER" WHERE user_id = ?', (student_id,))
+        # Courses, assessments and GPA history go with the user (ON DELETE CASCADE)
+        with transaction() as tx:
+            tx.execute('DELETE FROM "USER" WHERE user_id = ?', (student_id,))
+        invalidate_student_gpa(student_id)
         
         return jsonify({"success": True})
     except Exception as e:
@@ -46,3 +68,31 @@ def get_student_gpa(student_id):
     """Get GPA for a specific student (admin view)"""
     result = calculate_student_gpa(student_id)
     return jsonify(result)
+
+
+@admin_bp.route('/gpa-summary', methods=['GET'])
+def get_gpa_summary():
+    """
+    Cumulative and per-semester GPA for every student plus distribution
+    histograms, computed in bulk. Pass students=false for histograms only.
+    """
+    try:
+        include_students = request.args.get('students', 'true').lower() not in ('0', 'false')
+        return jsonify(compute_cohort_gpa(include_students=include_students))
+    except Exception as e:
+        logger.error(f"GPA summary error: {str(e)}", exc_info=True)
+        return jsonify({"error": "GPA summary failed", "message": str(e)}), 500
+
+
+@admin_bp.route('/export', methods=['GET'])
+def export_all_students():
+    """Stream every student's courses and assessments (?format=csv|ndjson, default csv)"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({"success": False, "error": f"format must be one of: {', '.join(FORMATS)}"}), 400
+
+    return Response(
+        stream_with_context(export_transcripts(fmt)),
+        mimetype=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transcripts.{fmt}"'}
+    )
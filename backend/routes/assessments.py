@@ -1,10 +1,34 @@
 # Assessment Routes
+import logging
+
 from flask import Blueprint, request, jsonify
 from backend.database import query_db, execute_db
+from backend.services.assessment_batch import BatchValidationError, apply_assessment_batch
+from backend.services.grade_events import grades_changed
+
+logger = logging.getLogger(__name__)
 
 assessments_bp = Blueprint('assessments', __name__)
 
 
+def _assessment_owner(assessment_id):
+    """Student who owns an assessment (None if it doesn't exist)."""
+    row = query_db(
+        'SELECT student_id FROM "ASSESSMENT" WHERE assessment_id = ?',
+        (assessment_id,), one=True
+    )
+    return row['student_id'] if row else None
+
+
+def _course_owner(course_id):
+    """Student who owns a course (None if it doesn't exist)."""
+    row = query_db(
+        'SELECT student_id FROM "COURSE" WHERE course_id = ?',
+        (course_id,), one=True
+    )
+    return row['student_id'] if row else None
+
+
 @assessments_bp.route('/api/assessments/<int:course_id>', methods=['GET'])
 def get_assessments(course_id):
     """Get all assessments for a course"""
@@ -26,6 +50,7 @@ def add_assessment():
         (data['name'], data['assessment_type'], data['weight'], data['marks'],
          data.get('earned_marks'), data['student_id'], data['course_id'])
     )
+    grades_changed(data['student_id'])
     return jsonify({"success": True, "assessment_id": assessment_id})
 
 
@@ -41,11 +66,43 @@ def update_assessment(assessment_id):
         (data['name'], data['assessment_type'], data['weight'],
          data['marks'], data.get('earned_marks'), assessment_id)
     )
+    grades_changed(_assessment_owner(assessment_id))
     return jsonify({"success": True})
 
 
 @assessments_bp.route('/api/delete-assessment/<int:assessment_id>', methods=['DELETE'])
 def delete_assessment(assessment_id):
     """Delete an assessment"""
+    student_id = _assessment_owner(assessment_id)
     execute_db('DELETE FROM "ASSESSMENT" WHERE assessment_id = ?', (assessment_id,))
+    grades_changed(student_id)
     return jsonify({"success": True})
+
+
+@assessments_bp.route('/api/course/<int:course_id>/assessments/batch', methods=['POST'])
+def batch_assessments(course_id):
+    """
+    Create, update and delete a course's assessments in one transaction.
+
+    Body: {"create": [...], "update": [{"assessment_id", ...}], "delete": [ids]}.
+    Nothing is written if any operation is invalid (422). The response
+    carries the course's assessments and recomputed grade.
+    """
+    try:
+        student_id = _course_owner(course_id)
+        if student_id is None:
+            return jsonify({"success": False, "error": "Course not found"}), 404
+
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"success": False, "error": 'Expected {"create", "update", "delete"}'}), 400
+
+        result = apply_assessment_batch(course_id, student_id, payload)
+        if result['created_ids'] or result['updated'] or result['deleted']:
+            grades_changed(student_id)
+        return jsonify({"success": True, **result})
+    except BatchValidationError as e:
+        return jsonify({"success": False, "error": str(e), "errors": e.errors}), 422
+    except Exception as e:
+        logger.error(f"Batch update error for course {course_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": "Batch update failed", "message": str(e)}), 500
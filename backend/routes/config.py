@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify
-from backend.services.config_service import get_assessment_types, get_semesters
+from backend.services.config_service import (
+    get_assessment_types_versioned, get_semesters, get_semesters_version
+)
+from backend.http_cache import versioned_json
 import logging
 
 config_bp = Blueprint('config', __name__)
@@ -9,8 +12,8 @@ logger = logging.getLogger(__name__)
 def assessment_types():
     """Get list of available assessment types"""
     try:
-        types = get_assessment_types()
-        return jsonify(types)
+        types, version = get_assessment_types_versioned()
+        return versioned_json('assessment-types', version, lambda: types)
     except Exception as e:
         logger.error(f"Assessment types error: {str(e)}", exc_info=True)
         # Return sensible defaults so the UI doesn't break
@@ -28,8 +31,7 @@ def assessment_types():
 def semesters():
     """Get list of available semesters"""
     try:
-        result = get_semesters()
-        return jsonify(result)
+        return versioned_json('semesters', get_semesters_version(), get_semesters)
     except Exception as e:
         logger.error(f"Semesters error: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to fetch semesters", "message": str(e)}), 500
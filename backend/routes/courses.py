@@ -1,10 +1,20 @@
 # Course Routes
 from flask import Blueprint, request, jsonify
-from backend.database import query_db, execute_db, is_postgres
+from backend.database import query_db, execute_db, is_postgres, transaction
+from backend.services.grade_events import grades_changed
 
 courses_bp = Blueprint('courses', __name__)
 
 
+def _course_owner(course_id):
+    """Student who owns a course (None if it doesn't exist)."""
+    row = query_db(
+        'SELECT student_id FROM "COURSE" WHERE course_id = ?',
+        (course_id,), one=True
+    )
+    return row['student_id'] if row else None
+
+
 @courses_bp.route('/api/courses/<int:student_id>', methods=['GET'])
 def get_courses(student_id):
     """Get all courses for a student"""
@@ -41,6 +51,7 @@ def add_course():
             (data['course_code'], data['course_name'], data['credit_hours'],
              data['semester'], data['student_id'])
         )
+        grades_changed(data['student_id'])
         return jsonify({"success": True, "course_id": course_id})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -63,6 +74,7 @@ def update_course(course_id):
             'UPDATE "COURSE" SET course_code = ?, course_name = ?, credit_hours = ?, semester = ? WHERE course_id = ?',
             (course_code, course_name, credit_hours, semester, course_id)
         )
+        grades_changed(_course_owner(course_id))
         return jsonify({"success": True})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -71,6 +83,9 @@ def update_course(course_id):
 @courses_bp.route('/api/delete-course/<int:course_id>', methods=['DELETE'])
 def delete_course(course_id):
     """Delete a course and its assessments"""
-    execute_db('DELETE FROM "ASSESSMENT" WHERE course_id = ?', (course_id,))
-    execute_db('DELETE FROM "COURSE" WHERE course_id = ?', (course_id,))
+    with transaction() as tx:
+        student_id = _course_owner(course_id)
+        # Assessments go with the course (ON DELETE CASCADE)
+        tx.execute('DELETE FROM "COURSE" WHERE course_id = ?', (course_id,))
+    grades_changed(student_id)
     return jsonify({"success": True})
@@ -1,25 +1,50 @@
 # External API Routes
 # Weather and other external service integrations
 from flask import Blueprint, jsonify
-import requests
+import logging
+
+from backend.services.weather_service import weather_service
+
+logger = logging.getLogger(__name__)
 
 external_bp = Blueprint('external', __name__)
 
 
+@external_bp.route('/api/campus-weather', methods=['GET'])
+def get_weather():
+    """
+    Current weather for the dashboard widget (Open-Meteo, no key required).
+    Coordinates for Vancouver: Lat 49.28, Lon -123.12
+    """
+    current = weather_service.get_current(49.2827, -123.1207)
+    if current is None:
+        # Fallback to mock data if the API is down
+        return jsonify({
+            "temperature": 15,
+            "windspeed": 10,
+            "condition": "Offline"
+        })
+    return jsonify({
+        "temperature": current.get('temperature', 15),
+        "windspeed": current.get('windspeed', 10),
+        "condition": "Live"
+    })
+
+
 @external_bp.route('/campus-weather', methods=['GET'])
 def get_campus_weather():
     """Get weather for KPU Richmond campus"""
     try:
         # Richmond, BC coordinates
-        response = requests.get(
-            'https://api.open-meteo.com/v1/forecast?latitude=49.17&longitude=-123.14&current_weather=true'
-        )
-        weather = response.json()
+        current = weather_service.get_current(49.17, -123.14)
+        if current is None:
+            return jsonify({"error": "Weather service unavailable"}), 503
 
         return jsonify({
-            "temperature": weather['current_weather']['temperature'],
-            "windspeed": weather['current_weather']['windspeed'],
-            "time": weather['current_weather']['time']
+            "temperature": current['temperature'],
+            "windspeed": current['windspeed'],
+            "time": current['time']
         })
     except Exception as e:
+        logger.error(f"Weather API error: {str(e)}")
         return jsonify({"error": str(e)}), 500
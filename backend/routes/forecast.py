@@ -1,11 +1,42 @@
 from flask import Blueprint, request, jsonify
-from backend.services.forecast_service import calculate_gpa_forecast, calculate_course_grade_forecast
+from backend.config import config
+from backend.services.forecast_service import (
+    calculate_gpa_forecast, calculate_gpa_forecast_batch, calculate_course_grade_forecast,
+    calculate_course_grade_sensitivity
+)
 from backend.services.gpa_service import calculate_student_gpa
+from backend.services.monte_carlo_forecast import (
+    performance_distributions, simulate_course_grade, simulate_gpa
+)
 import logging
 
 forecast_bp = Blueprint('forecast', __name__, url_prefix='/api/forecast')
 logger = logging.getLogger(__name__)
 
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _simulation_options(data, unknowns):
+    """
+    (simulations, seed) for a Monte Carlo request, or None if not requested.
+    unknowns is how many results each simulation draws; the total is capped
+    at MAX_SIMULATION_DRAWS.
+    """
+    if data.get('mode') != 'monte_carlo':
+        return None
+    simulations = data.get('simulations', config.FORECAST_SIMULATIONS)
+    if not _is_int(simulations) or not 1 <= simulations <= config.MAX_FORECAST_SIMULATIONS:
+        raise ValueError(f"simulations must be between 1 and {config.MAX_FORECAST_SIMULATIONS}")
+    seed = data.get('seed')
+    if seed is not None and (not _is_int(seed) or seed < 0):
+        raise ValueError("seed must be a non-negative integer")
+    if simulations * unknowns > config.MAX_SIMULATION_DRAWS:
+        raise ValueError(f"{simulations} simulations of {unknowns} unknown grades exceed the limit of "
+                         f"{config.MAX_SIMULATION_DRAWS} draws; lower simulations")
+    return simulations, seed
+
 @forecast_bp.route('/gpa', methods=['POST'])
 def forecast_gpa():
     """
@@ -14,12 +45,18 @@ def forecast_gpa():
         "student_id": 1, (optional, if provided calculates current summary from DB)
         "current_summary": { "cumulative_gpa": 3.0, "total_credits": 30 }, (optional override)
         "hypothetical_courses": [ { "code": "CS1", "credits": 3, "hypothetical": 90 }, ... ],
-        "target_gpa": 3.5
+        "target_gpa": 3.5,
+        "scenarios": [ [90, 75], [80, null], ... ] (optional batch mode, one grade per course),
+        "mode": "monte_carlo", "simulations": 100000, "seed": 1 (optional)
     }
+    With "scenarios", every row is evaluated in one pass and a compact result
+    matrix is returned instead of the single-scenario breakdown. With
+    "mode": "monte_carlo", courses without a hypothetical grade are also
+    simulated from the student's history and "monte_carlo" holds the
+    probability of reaching the target and percentile bands.
     """
     try:
         data = request.get_json(silent=True) or {}
-
         current_summary = data.get('current_summary')
         student_id = data.get('student_id')
 
@@ -35,9 +72,38 @@ def forecast_gpa():
             current_summary = {"cumulative_gpa": 0, "total_credits": 0}
 
         hypothetical = data.get('hypothetical_courses', [])
+        if not isinstance(hypothetical, list) or len(hypothetical) > config.MAX_FORECAST_COURSES:
+            return jsonify({
+                "error": "Invalid courses",
+                "message": f"Provide a list of at most {config.MAX_FORECAST_COURSES} hypothetical courses"
+            }), 400
+        try:
+            simulation = _simulation_options(data, sum(
+                1 for c in hypothetical if not isinstance(c, dict) or c.get('hypothetical') is None))
+        except ValueError as e:
+            return jsonify({"error": "Invalid simulation options", "message": str(e)}), 400
         target = data.get('target_gpa')
+        scenarios = data.get('scenarios')
+
+        if scenarios is not None:
+            if not isinstance(scenarios, list) or len(scenarios) > config.MAX_FORECAST_SCENARIOS:
+                return jsonify({
+                    "error": "Invalid scenarios",
+                    "message": f"Provide a list of at most {config.MAX_FORECAST_SCENARIOS} scenarios"
+                }), 400
+            try:
+                result = calculate_gpa_forecast_batch(current_summary, hypothetical, scenarios, target)
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": "Invalid scenarios", "message": str(e)}), 400
+            return jsonify(result)
 
         result = calculate_gpa_forecast(current_summary, hypothetical, target)
+        if simulation:
+            simulations, seed = simulation
+            result["monte_carlo"] = simulate_gpa(
+                current_summary, hypothetical, target,
+                performance_distributions(student_id), simulations, seed
+            )
         return jsonify(result)
     except Exception as e:
         logger.error(f"GPA forecast error: {str(e)}", exc_info=True)
@@ -49,17 +115,66 @@ def forecast_grade():
     """
     Predict Course Grade.
     Input: {
-        "assessments": [ { "name": "A1", "weight": 20, "mark": 80 }, { "name": "Final", "weight": 40 } ],
-        "target_grade": 85
+        "assessments": [ { "name": "A1", "type": "Assignment", "weight": 20, "mark": 80 },
+                         { "name": "Final", "type": "Final", "weight": 40 } ],
+        "target_grade": 85,
+        "student_id": 1, "mode": "monte_carlo", "simulations": 100000, "seed": 1 (optional)
     }
+    With "mode": "monte_carlo", unmarked assessments are sampled from the
+    student's per-type history (defaults without a student_id).
     """
     try:
         data = request.get_json(silent=True) or {}
         assessments = data.get('assessments', [])
+        if not isinstance(assessments, list):
+            return jsonify({"error": "Invalid assessments", "message": "assessments must be a list"}), 400
+        try:
+            simulation = _simulation_options(data, sum(
+                1 for a in assessments if not isinstance(a, dict) or a.get('mark') is None))
+        except ValueError as e:
+            return jsonify({"error": "Invalid simulation options", "message": str(e)}), 400
         target = data.get('target_grade')
 
         result = calculate_course_grade_forecast(assessments, target)
+        if simulation:
+            simulations, seed = simulation
+            result["monte_carlo"] = simulate_course_grade(
+                assessments, target, performance_distributions(data.get('student_id')), simulations, seed
+            )
         return jsonify(result)
     except Exception as e:
         logger.error(f"Course grade forecast error: {str(e)}", exc_info=True)
         return jsonify({"error": "Forecast calculation failed", "message": str(e)}), 500
+
+
+@forecast_bp.route('/course-grade/sensitivity', methods=['POST'])
+def forecast_grade_sensitivity():
+    """
+    Course grade and GPA over a grid of marks, for charts.
+    Input: {
+        "assessments": [ { "name": "A1", "weight": 60, "mark": 80 }, { "name": "Final", "weight": 40 } ],
+        "vary": [ { "assessment": "Final", "min": 0, "max": 100, "step": 5 } ], (one or two)
+        "current_summary": { "cumulative_gpa": 3.0, "total_credits": 30 }, "credits": 3 (optional),
+        "scale_partial": false (optional; scale to the graded weight like the course page)
+    }
+    Each cell matches /api/forecast/course-grade for the same marks unless
+    scale_partial is set.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        vary = data.get('vary')
+        if not isinstance(vary, list):
+            return jsonify({"error": "Invalid grid", "message": "vary must be a list of ranges"}), 400
+        try:
+            result = calculate_course_grade_sensitivity(
+                data.get('assessments', []), vary,
+                data.get('current_summary'), data.get('credits'),
+                max_cells=config.MAX_SENSITIVITY_CELLS,
+                scale_partial=data.get('scale_partial') is True
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": "Invalid grid", "message": str(e)}), 400
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Sensitivity forecast error: {str(e)}", exc_info=True)
+        return jsonify({"error": "Forecast calculation failed", "message": str(e)}), 500
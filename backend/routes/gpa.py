@@ -1,7 +1,10 @@
 # GPA Calculation Routes
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from backend.database import query_db
-from backend.services.gpa_service import calculate_student_gpa, calculate_gpa_breakdown, get_grading_scale
+from backend.services.gpa_service import calculate_student_gpa, calculate_gpa_breakdown
+from backend.services.gpa_history import get_gpa_history
+from backend.services.grading_scale import get_compiled_scale
+from backend.http_cache import versioned_json
 import logging
 
 gpa_bp = Blueprint('gpa', __name__)
@@ -30,12 +33,31 @@ def get_gpa_breakdown(student_id):
         return jsonify({"error": "GPA breakdown failed", "message": str(e)}), 500
 
 
+@gpa_bp.route('/api/gpa/<int:student_id>/history', methods=['GET'])
+def get_gpa_history_route(student_id):
+    """
+    Get the student's GPA time series.
+    Optional query params: since, until (ISO dates), semester
+    """
+    try:
+        history = get_gpa_history(
+            student_id,
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            semester=request.args.get('semester')
+        )
+        return jsonify({"student_id": student_id, "history": history})
+    except Exception as e:
+        logger.error(f"GPA history error for student {student_id}: {str(e)}", exc_info=True)
+        return jsonify({"error": "GPA history failed", "message": str(e)}), 500
+
+
 @gpa_bp.route('/api/config/grading-scale', methods=['GET'])
 def get_grading_scale_route():
     """Get the global grading scale"""
     try:
-        scale = get_grading_scale()
-        return jsonify(scale)
+        scale = get_compiled_scale()
+        return versioned_json('grading-scale', scale.version, lambda: scale.rows)
     except Exception as e:
         logger.error(f"Grading scale error: {str(e)}", exc_info=True)
         return jsonify({"error": "Failed to fetch grading scale", "message": str(e)}), 500
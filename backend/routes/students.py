@@ -1,10 +1,23 @@
 # Student API Routes
 # Profile, Historical Performance, and Grade Prediction
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from backend.database import query_db, execute_db
 from backend.services.gpa_service import calculate_student_gpa
+from backend.services.dashboard_service import build_student_dashboard
+from backend.services.student_stats import get_student_stats
+from backend.services.bulk_import import (
+    ImportFormatError, parse_csv, parse_json, import_courses, student_exists
+)
+from backend.services.grade_events import grades_changed
+from backend.services.transcript_export import FORMATS, export_transcripts
+from backend.services.scenario_store import (
+    ScenarioError, list_scenarios, save_scenario, load_scenario, delete_scenario
+)
+import io
+import logging
 
 students_bp = Blueprint('students', __name__, url_prefix='/api/students')
+logger = logging.getLogger(__name__)
 
 
 @students_bp.route('/<int:user_id>/profile', methods=['GET'])
@@ -72,19 +85,135 @@ def update_profile(user_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@students_bp.route('/<int:student_id>/import', methods=['POST'])
+def import_courses_route(student_id):
+    """
+    Bulk import courses with their assessments.
+
+    Accepts JSON ({"courses": [{..., "assessments": [...]}]}), a text/csv
+    body or a multipart "file" upload. Nothing is written if any row is
+    invalid unless ?partial=true, which imports the valid courses.
+    """
+    try:
+        if not student_exists(student_id):
+            return jsonify({"success": False, "error": "Student not found"}), 404
+
+        if 'file' in request.files:
+            collector = parse_csv(io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig'))
+        elif request.mimetype == 'text/csv':
+            collector = parse_csv(io.TextIOWrapper(request.stream, encoding='utf-8-sig'))
+        else:
+            collector = parse_json(request.get_json(silent=True))
+
+        partial = request.args.get('partial', '').lower() in ('1', 'true')
+        result = import_courses(student_id, collector, partial=partial)
+        if result['inserted']['courses']:
+            grades_changed(student_id)
+
+        status = 200 if result['inserted']['courses'] or not result['errors'] else 422
+        return jsonify({"success": status == 200, **result}), status
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Import error for student {student_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": "Import failed", "message": str(e)}), 500
+
+
+@students_bp.route('/<int:student_id>/export', methods=['GET'])
+def export_student(student_id):
+    """Stream a student's courses and assessments (?format=csv|ndjson, default csv)"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({"success": False, "error": f"format must be one of: {', '.join(FORMATS)}"}), 400
+    if not student_exists(student_id):
+        return jsonify({"success": False, "error": "Student not found"}), 404
+
+    return Response(
+        stream_with_context(export_transcripts(fmt, student_id)),
+        mimetype=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="student-{student_id}-transcript.{fmt}"'}
+    )
+
+
+@students_bp.route('/<int:student_id>/scenarios', methods=['GET'])
+def get_scenarios(student_id):
+    """List saved what-if scenarios (without results; stale ones are flagged)"""
+    try:
+        if not student_exists(student_id):
+            return jsonify({"success": False, "error": "Student not found"}), 404
+        return jsonify({"scenarios": list_scenarios(student_id)})
+    except Exception as e:
+        logger.error(f"Scenario list error for student {student_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@students_bp.route('/<int:student_id>/scenarios', methods=['POST'])
+def save_scenario_route(student_id):
+    """
+    Save (or replace by name) a what-if scenario with its computed forecast.
+    Body: {"name", "type": "gpa"|"course_grade", "course_id" (optional), plus
+    the inputs of /api/forecast/gpa or /api/forecast/course-grade}.
+    """
+    try:
+        if not student_exists(student_id):
+            return jsonify({"success": False, "error": "Student not found"}), 404
+        data = request.get_json(silent=True) or {}
+        course_id = data.get('course_id')
+        if course_id is not None:
+            if not isinstance(course_id, int) or isinstance(course_id, bool):
+                return jsonify({"success": False, "error": "course_id must be an integer"}), 400
+            owner = query_db('SELECT student_id FROM "COURSE" WHERE course_id = ?', (course_id,), one=True)
+            if owner is None or owner['student_id'] != student_id:
+                return jsonify({"success": False, "error": "Course not found"}), 404
+        scenario = save_scenario(student_id, data.get('name'), data.get('type', 'gpa'), data, course_id)
+        return jsonify({"success": True, "scenario": scenario})
+    except ScenarioError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Scenario save error for student {student_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@students_bp.route('/<int:student_id>/scenarios/<int:scenario_id>', methods=['GET'])
+def get_scenario(student_id, scenario_id):
+    """Load a scenario; its forecast is recomputed only if the grades changed"""
+    try:
+        scenario = load_scenario(student_id, scenario_id)
+        if scenario is None:
+            return jsonify({"success": False, "error": "Scenario not found"}), 404
+        return jsonify({"success": True, "scenario": scenario})
+    except Exception as e:
+        logger.error(f"Scenario load error for student {student_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@students_bp.route('/<int:student_id>/scenarios/<int:scenario_id>', methods=['DELETE'])
+def delete_scenario_route(student_id, scenario_id):
+    """Delete a saved scenario"""
+    try:
+        if not delete_scenario(student_id, scenario_id):
+            return jsonify({"success": False, "error": "Scenario not found"}), 404
+        return jsonify({"success": True})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@students_bp.route('/<int:student_id>/dashboard', methods=['GET'])
+def get_dashboard(student_id):
+    """Everything the student dashboard renders, in one response"""
+    try:
+        return jsonify(build_student_dashboard(student_id))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @students_bp.route('/<int:student_id>/historical-performance', methods=['GET'])
 def get_historical_performance(student_id):
     """Get aggregated historical data for trend-based predictions"""
     try:
-        assessments = query_db(
-            '''SELECT a.assessment_type, a.earned_marks, a.marks, c.semester
-               FROM "ASSESSMENT" a
-               JOIN "COURSE" c ON a.course_id = c.course_id
-               WHERE a.student_id = ? AND a.earned_marks IS NOT NULL''',
-            (student_id,)
-        )
+        stats = get_student_stats(student_id)
 
-        if not assessments:
+        if not stats['total']:
             return jsonify({
                 "student_id": student_id,
                 "data_quality": {"total_assessments": 0, "confidence_score": 0},
@@ -96,43 +225,25 @@ def get_historical_performance(student_id):
                 "component_trend_factors": {}
             })
 
-        # Calculate component averages
-        component_data = {}
-        semester_data = {}
-
-        for a in assessments:
-            ass_type = a['assessment_type']
-            pct = (a['earned_marks'] / a['marks']) * 100 if a['marks'] > 0 else 0
-            semester = a['semester']
-
-            if ass_type not in component_data:
-                component_data[ass_type] = []
-            component_data[ass_type].append(pct)
-
-            if semester not in semester_data:
-                semester_data[semester] = []
-            semester_data[semester].append(pct)
-
         component_averages = {
-            t: round(sum(s) / len(s), 2) for t, s in component_data.items()
+            t: round(g['mean'], 2) for t, g in stats['by_type'].items()
         }
 
-        # Calculate trend factors
+        # Calculate trend factors (second half vs first half, in entry order)
         component_trend_factors = {}
-        for comp_type, scores in component_data.items():
-            if len(scores) >= 2:
-                mid = len(scores) // 2
-                first_half = sum(scores[:mid]) / mid if mid > 0 else scores[0]
-                second_half = sum(scores[mid:]) / (len(scores) - mid)
-                trend = second_half / first_half if first_half > 0 else 1.0
+        for comp_type, g in stats['by_type'].items():
+            first, second = g['halves']
+            if g['count'] >= 2:
+                trend = second['mean'] / first['mean'] if first['mean'] > 0 else 1.0
                 component_trend_factors[comp_type] = round(min(max(trend, 0.8), 1.2), 3)
             else:
                 component_trend_factors[comp_type] = 1.0
 
         # Overall trend
         overall_trend = 1.0
+        semester_data = stats['by_semester']
         if len(semester_data) >= 2:
-            sem_avgs = [sum(s)/len(s) for s in semester_data.values()]
+            sem_avgs = [g['mean'] for g in semester_data.values()]
             mid = len(sem_avgs) // 2
             if mid > 0:
                 old_avg = sum(sem_avgs[:mid]) / mid
@@ -140,12 +251,12 @@ def get_historical_performance(student_id):
                 if old_avg > 0:
                     overall_trend = round(min(max(new_avg / old_avg, 0.8), 1.2), 3)
 
-        confidence_score = round(min(len(assessments) / 20, 1.0), 2)
+        confidence_score = round(min(stats['total'] / 20, 1.0), 2)
 
         return jsonify({
             "student_id": student_id,
             "data_quality": {
-                "total_assessments": len(assessments),
+                "total_assessments": stats['total'],
                 "confidence_score": confidence_score,
                 "semesters_covered": len(semester_data)
             },
@@ -166,39 +277,15 @@ def get_historical_performance(student_id):
 def get_semester_timeline(student_id):
     """Get semester-by-semester performance"""
     try:
-        assessments = query_db(
-            '''SELECT a.assessment_type, a.earned_marks, a.marks, c.semester
-               FROM "ASSESSMENT" a
-               JOIN "COURSE" c ON a.course_id = c.course_id
-               WHERE a.student_id = ? AND a.earned_marks IS NOT NULL
-               ORDER BY c.semester''',
-            (student_id,)
-        )
-
-        if not assessments:
-            return jsonify({"timeline": []})
-
-        semester_data = {}
-        for a in assessments:
-            sem = a['semester']
-            pct = (a['earned_marks'] / a['marks']) * 100 if a['marks'] > 0 else 0
-            if sem not in semester_data:
-                semester_data[sem] = {'by_type': {}, 'all': []}
-
-            t = a['assessment_type']
-            if t not in semester_data[sem]['by_type']:
-                semester_data[sem]['by_type'][t] = []
-            semester_data[sem]['by_type'][t].append(pct)
-            semester_data[sem]['all'].append(pct)
+        stats = get_student_stats(student_id)
 
         timeline = []
-        for sem in sorted(semester_data.keys()):
-            d = semester_data[sem]
-            avgs = {t: round(sum(s)/len(s), 2) for t, s in d['by_type'].items()}
+        for sem, g in stats['by_semester'].items():
+            avgs = {t: round(tg['mean'], 2) for t, tg in g['by_type'].items()}
             timeline.append({
                 "semester": sem,
                 "assessment_averages": avgs,
-                "overall_average": round(sum(d['all'])/len(d['all']), 2)
+                "overall_average": round(g['mean'], 2)
             })
 
         return jsonify({"timeline": timeline})
@@ -0,0 +1,104 @@
+# Assessment Batch
+# Applies a set of assessment creates, updates and deletes for one course in
+# a single transaction and returns the course's new state, so an editing
+# session is one request instead of one per row.
+from backend.database import transaction
+from backend.services.grade_engine import compute_course_grade
+from backend.services.validation import validate_assessment
+
+ASSESSMENT_COLUMNS = ('name', 'assessment_type', 'weight', 'marks', 'earned_marks', 'student_id', 'course_id')
+
+
+class BatchValidationError(ValueError):
+    """The batch was rejected; errors lists every problem found."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid operation(s)")
+        self.errors = errors
+
+
+def _validate(payload, existing_ids):
+    not_lists = [{"op": op, "field": op, "message": "must be a list"}
+                 for op in ('create', 'update', 'delete')
+                 if payload.get(op) is not None and not isinstance(payload.get(op), list)]
+    if not_lists:
+        raise BatchValidationError(not_lists)
+
+    errors = []
+    creates, updates, deletes = [], [], []
+
+    for index, raw in enumerate(payload.get('create') or []):
+        values, field_errors = validate_assessment(raw if isinstance(raw, dict) else {})
+        errors += [{"op": "create", "index": index, "field": f, "message": m} for f, m in field_errors]
+        creates.append(values)
+
+    seen = set()
+    for op, items in (("update", payload.get('update') or []), ("delete", payload.get('delete') or [])):
+        for index, raw in enumerate(items):
+            if op == "update" and not isinstance(raw, dict):
+                errors.append({"op": op, "index": index, "field": "update", "message": "must be an object"})
+                continue
+            assessment_id = raw.get('assessment_id') if isinstance(raw, dict) else raw
+            if (not isinstance(assessment_id, int) or isinstance(assessment_id, bool)
+                    or assessment_id not in existing_ids):
+                errors.append({"op": op, "index": index, "field": "assessment_id",
+                               "message": "is not an assessment of this course"})
+                continue
+            if assessment_id in seen:
+                errors.append({"op": op, "index": index, "field": "assessment_id",
+                               "message": "appears more than once in the batch"})
+                continue
+            seen.add(assessment_id)
+            if op == "delete":
+                deletes.append((assessment_id,))
+                continue
+            values, field_errors = validate_assessment(raw)
+            errors += [{"op": op, "index": index, "field": f, "message": m} for f, m in field_errors]
+            updates.append(values + (assessment_id,))
+
+    if errors:
+        raise BatchValidationError(errors)
+    return creates, updates, deletes
+
+
+def apply_assessment_batch(course_id: int, student_id: int, payload: dict) -> dict:
+    """
+    Apply {"create": [...], "update": [{assessment_id, ...}], "delete": [ids]}
+    to a course atomically. Updates replace all editable fields, like
+    /api/update-assessment.
+
+    Returns:
+        dict with created_ids, updated, deleted, the course's assessments
+        and its recomputed grade
+    Raises:
+        BatchValidationError if any operation is invalid (nothing is written)
+    """
+    with transaction() as tx:
+        existing = tx.query('SELECT assessment_id FROM "ASSESSMENT" WHERE course_id = ?', (course_id,))
+        creates, updates, deletes = _validate(payload, {row['assessment_id'] for row in existing})
+
+        if deletes:
+            tx.executemany('DELETE FROM "ASSESSMENT" WHERE assessment_id = ?', deletes)
+        if updates:
+            tx.executemany(
+                '''UPDATE "ASSESSMENT"
+                   SET name = ?, assessment_type = ?, weight = ?, marks = ?, earned_marks = ?
+                   WHERE assessment_id = ?''',
+                updates
+            )
+        created_ids = tx.insert_many(
+            'ASSESSMENT', ASSESSMENT_COLUMNS,
+            [values + (student_id, course_id) for values in creates], 'assessment_id'
+        )
+
+        assessments = tx.query('SELECT * FROM "ASSESSMENT" WHERE course_id = ? ORDER BY assessment_id',
+                               (course_id,))
+        course = compute_course_grade(course_id)
+
+    return {
+        "created_ids": created_ids,
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "assessments": [dict(a) for a in assessments],
+        "course": course
+    }
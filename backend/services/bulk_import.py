@@ -0,0 +1,163 @@
+# Bulk Import
+# Imports many courses with their assessments for one student in a single
+# request. Input (JSON or CSV) is validated row by row as it is read, then
+# every course and assessment is inserted in one transaction with batched
+# inserts, so a transcript costs one round trip instead of hundreds.
+import csv
+
+from backend.config import config
+from backend.database import query_db, transaction
+from backend.services.validation import validate_assessment, validate_course
+
+COURSE_COLUMNS = ('course_code', 'course_name', 'credit_hours', 'semester', 'student_id')
+ASSESSMENT_COLUMNS = ('name', 'assessment_type', 'weight', 'marks', 'earned_marks', 'student_id', 'course_id')
+
+# CSV layout: course_code, course_name, credit_hours, semester,
+# assessment_name, assessment_type, weight, marks, earned_marks.
+# One line per assessment; a line without assessment_name adds the course
+# only. Lines sharing course_code and semester form one course.
+
+
+class ImportFormatError(ValueError):
+    """The import as a whole cannot be processed (bad format, too many rows)."""
+
+
+class _Collector:
+    """Accumulates validated courses while recording per-row errors."""
+
+    def __init__(self):
+        self.courses = []   # [{"row", "values", "assessments": [(row, values)], "valid"}]
+        self.errors = []
+        self.rows = 0
+
+    def count_row(self):
+        self.rows += 1
+        if self.rows > config.MAX_IMPORT_ROWS:
+            raise ImportFormatError(f"Imports are limited to {config.MAX_IMPORT_ROWS} rows")
+
+    def error(self, row, field_errors, assessment=None):
+        for field, message in field_errors:
+            entry = {"row": row, "field": field, "message": message}
+            if assessment is not None:
+                entry["assessment"] = assessment
+            self.errors.append(entry)
+
+
+def parse_json(payload) -> _Collector:
+    """
+    Validate {"courses": [...]} (or a bare list) where each course may carry
+    an "assessments" list. Rows are numbered by course index.
+    """
+    courses = payload.get('courses') if isinstance(payload, dict) else payload
+    if not isinstance(courses, list):
+        raise ImportFormatError('Expected a JSON list of courses or {"courses": [...]}')
+
+    collector = _Collector()
+    for index, raw in enumerate(courses):
+        collector.count_row()
+        if not isinstance(raw, dict):
+            collector.error(index, [("course", "must be an object")])
+            continue
+        values, errors = validate_course(raw)
+        collector.error(index, errors)
+        course = {"row": index, "values": values, "assessments": [], "valid": not errors}
+        for a_index, raw_assessment in enumerate(raw.get('assessments') or []):
+            collector.count_row()
+            if not isinstance(raw_assessment, dict):
+                a_errors = [("assessment", "must be an object")]
+            else:
+                a_values, a_errors = validate_assessment(raw_assessment)
+            collector.error(index, a_errors, assessment=a_index)
+            if a_errors:
+                course["valid"] = False
+            else:
+                course["assessments"].append((a_index, a_values))
+        collector.courses.append(course)
+    return collector
+
+
+def parse_csv(lines) -> _Collector:
+    """
+    Validate CSV text lines (header + one line per assessment). Rows are
+    numbered by CSV line, so the first data line is row 2.
+    """
+    reader = csv.DictReader(lines)
+    missing = {'course_code', 'semester', 'credit_hours'} - set(reader.fieldnames or ())
+    if missing:
+        raise ImportFormatError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    collector = _Collector()
+    by_key = {}
+    for line, raw in enumerate(reader, start=2):
+        collector.count_row()
+        values, errors = validate_course(raw)
+        collector.error(line, errors)
+        if errors:
+            continue
+
+        key = (values[0], values[3])
+        course = by_key.get(key)
+        if course is None:
+            course = by_key[key] = {"row": line, "values": values, "assessments": [], "valid": True}
+            collector.courses.append(course)
+        elif values[2] != course["values"][2] or (
+                (raw.get('course_name') or '').strip() and values[1] != course["values"][1]):
+            collector.error(line, [("course", f"conflicts with the {key[0]} course on row {course['row']}")])
+            course["valid"] = False
+            continue
+
+        if (raw.get('assessment_name') or '').strip():
+            a_values, a_errors = validate_assessment({**raw, 'name': raw.get('assessment_name')})
+            collector.error(line, [('assessment_name' if f == 'name' else f, m) for f, m in a_errors])
+            if a_errors:
+                course["valid"] = False
+            else:
+                course["assessments"].append((line, a_values))
+    return collector
+
+
+def import_courses(student_id: int, collector: _Collector, partial: bool = False) -> dict:
+    """
+    Insert the validated courses in one transaction.
+
+    Unless partial is set, nothing is written when any row has errors.
+    Courses with an invalid assessment are skipped as a whole.
+
+    Returns:
+        dict with courses (row, course_id, course_code, assessment_ids),
+        errors and inserted counts
+    """
+    result = {"courses": [], "errors": collector.errors, "inserted": {"courses": 0, "assessments": 0}}
+    if collector.errors and not partial:
+        return result
+
+    courses = [c for c in collector.courses if c["valid"]]
+    if not courses:
+        return result
+
+    with transaction() as tx:
+        course_ids = tx.insert_many(
+            'COURSE', COURSE_COLUMNS,
+            (c["values"] + (student_id,) for c in courses), 'course_id'
+        )
+        assessment_rows = [
+            values + (student_id, course_id)
+            for course, course_id in zip(courses, course_ids)
+            for _, values in course["assessments"]
+        ]
+        assessment_ids = iter(tx.insert_many('ASSESSMENT', ASSESSMENT_COLUMNS, assessment_rows, 'assessment_id'))
+
+    for course, course_id in zip(courses, course_ids):
+        result["courses"].append({
+            "row": course["row"],
+            "course_id": course_id,
+            "course_code": course["values"][0],
+            "semester": course["values"][3],
+            "assessment_ids": [next(assessment_ids) for _ in course["assessments"]]
+        })
+    result["inserted"] = {"courses": len(course_ids), "assessments": len(assessment_rows)}
+    return result
+
+
+def student_exists(student_id: int) -> bool:
+    return query_db('SELECT 1 AS found FROM "USER" WHERE user_id = ?', (student_id,), one=True) is not None
@@ -0,0 +1,222 @@
+# Cohort GPA
+# Cumulative and per-semester GPA for every student at once. One grouped
+# query returns a row per course; the rows are turned into numpy columns and
+# all grades, GPA lookups and per-student / per-semester sums are computed
+# with vectorized operations. Large cohorts are split by student across a
+# process pool.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.config import config
+from backend.database import query_db
+from backend.services.config_service import semester_sort_key
+from backend.services.grading_scale import get_compiled_scale
+
+
+# One row per course with its assessments already folded:
+# weighted = sum(percentage * weight / 100) over graded assessments.
+# Rows follow grade_engine's course order so float sums round identically.
+COURSE_TOTALS_QUERY = '''
+    SELECT c.student_id, c.course_id, c.credit_hours, c.semester,
+           COUNT(a.assessment_id) AS assessment_count,
+           COALESCE(SUM(CASE WHEN a.earned_marks IS NOT NULL THEN a.weight END), 0) AS graded_weight,
+           COALESCE(SUM(CASE WHEN a.earned_marks IS NOT NULL
+                             THEN (a.earned_marks * 1.0 / NULLIF(a.marks, 0)) * a.weight END), 0) AS weighted
+    FROM "COURSE" c
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    GROUP BY c.student_id, c.course_id, c.credit_hours, c.semester
+    ORDER BY c.student_id, c.semester, c.course_id
+'''
+
+STUDENTS_QUERY = '''
+    SELECT user_id, firstname, lastname FROM "USER"
+    WHERE user_type = 'Student'
+    ORDER BY user_id
+'''
+
+GPA_HISTOGRAM_STEP = 0.5
+
+
+def _compute_chunk(chunk):
+    """
+    Grades and GPA sums for a contiguous range of students.
+
+    chunk is (student_idx, sem_idx, credits, counts, graded_weight, weighted,
+    boundaries, gpa_values, n_semesters) as numpy arrays / ints. Module level
+    so it can run in a worker process.
+    """
+    (student_idx, sem_idx, credits, counts, graded_weight, weighted,
+     boundaries, gpa_values, n_semesters) = chunk
+
+    # Course grade, adjusted for partial completion like grade_engine
+    grade = weighted.copy()
+    partial = (graded_weight > 0) & (graded_weight < 100)
+    grade[partial] = weighted[partial] / graded_weight[partial] * 100
+
+    band = np.searchsorted(boundaries, grade, side='right') - 1
+    matched = band >= 0
+    gpa = np.where(matched, gpa_values[np.clip(band, 0, None)], 0.0)
+
+    has_assessments = counts > 0
+    # Cumulative GPA only counts courses with graded work and a scale match
+    in_summary = has_assessments & (graded_weight > 0) & matched
+
+    first = int(student_idx[0])
+    local = student_idx - first
+    n_students = int(local[-1]) + 1
+    cumulative_points = np.bincount(local, weights=np.where(in_summary, gpa * credits, 0.0), minlength=n_students)
+    cumulative_credits = np.bincount(local, weights=np.where(in_summary, credits, 0.0), minlength=n_students)
+
+    # Semester GPA counts every course that has assessments
+    group = (local * n_semesters + sem_idx)[has_assessments]
+    groups, inverse = np.unique(group, return_inverse=True)
+    semester_points = np.bincount(inverse, weights=(gpa * credits)[has_assessments], minlength=len(groups))
+    semester_credits = np.bincount(inverse, weights=credits[has_assessments], minlength=len(groups))
+
+    letter_counts = np.bincount(band[in_summary], minlength=len(boundaries))
+
+    return {
+        "first": first,
+        "cumulative_points": cumulative_points,
+        "cumulative_credits": cumulative_credits,
+        "group_student": groups // n_semesters + first,
+        "group_semester": groups % n_semesters,
+        "semester_points": semester_points,
+        "semester_credits": semester_credits,
+        "letter_counts": letter_counts,
+    }
+
+
+def _split(student_idx, parts):
+    """Slice boundaries that split the course rows into `parts` ranges of whole students."""
+    cuts = np.linspace(0, len(student_idx), parts + 1).astype(int)
+    bounds = [0]
+    for cut in cuts[1:-1]:
+        # Move the cut forward to the start of the next student
+        cut = int(np.searchsorted(student_idx, student_idx[cut], side='left')) if cut < len(student_idx) else cut
+        if cut > bounds[-1]:
+            bounds.append(cut)
+    bounds.append(len(student_idx))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _number(value):
+    """Credits as int when whole (they come from INTEGER columns)."""
+    return int(value) if float(value).is_integer() else round(float(value), 2)
+
+
+def _histogram(values, max_gpa):
+    edges = np.arange(0.0, max_gpa + GPA_HISTOGRAM_STEP, GPA_HISTOGRAM_STEP)
+    if len(edges) < 2 or edges[-1] < max_gpa:
+        edges = np.append(edges, edges[-1] + GPA_HISTOGRAM_STEP)
+    counts, _ = np.histogram(values, bins=edges)
+    return {"bins": [round(float(e), 2) for e in edges], "counts": counts.tolist()}
+
+
+def compute_cohort_gpa(include_students: bool = True, workers: int = None) -> dict:
+    """
+    GPA summary for every student.
+
+    Returns:
+        dict with
+            students: [{student_id, firstname, lastname, cumulative_gpa,
+                        total_credits, semesters: [{semester, gpa, credits}]}]
+                      (omitted when include_students is False)
+            histograms: cumulative_gpa and per-semester GPA distributions over
+                        students with graded credits, letter_grades counts
+            student_count, course_count, workers
+    """
+    scale = get_compiled_scale()
+    rows = query_db(COURSE_TOTALS_QUERY)
+    students = query_db(STUDENTS_QUERY)
+
+    # Columnar arrays; students and semesters become dense indexes
+    student_ids = np.array([r['student_id'] for r in rows], dtype=np.int64)
+    semester_labels = [r['semester'] or 'Unknown' for r in rows]
+    semesters = sorted(set(semester_labels), key=semester_sort_key)
+    semester_index = {s: i for i, s in enumerate(semesters)}
+
+    all_ids = np.union1d(np.array([s['user_id'] for s in students], dtype=np.int64), student_ids)
+    student_idx = np.searchsorted(all_ids, student_ids)
+    columns = (
+        student_idx,
+        np.array([semester_index[s] for s in semester_labels], dtype=np.int64),
+        np.array([float(r['credit_hours'] or 0) for r in rows]),
+        np.array([r['assessment_count'] for r in rows], dtype=np.int64),
+        np.array([float(r['graded_weight']) for r in rows]),
+        np.array([float(r['weighted']) for r in rows]),
+    )
+    boundaries = np.array(scale.boundaries, dtype=float)
+    gpa_values = np.array([float(v) for v in scale.gpa_values], dtype=float)
+
+    if workers is None:
+        workers = config.COHORT_MAX_WORKERS if len(rows) >= config.COHORT_PARALLEL_MIN_COURSES else 1
+    chunks = [
+        tuple(col[start:end] for col in columns) + (boundaries, gpa_values, max(len(semesters), 1))
+        for start, end in (_split(student_idx, workers) if len(rows) else [])
+    ]
+    if len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            results = list(pool.map(_compute_chunk, chunks))
+    else:
+        results = [_compute_chunk(chunk) for chunk in chunks]
+
+    n = len(all_ids)
+    cumulative_points = np.zeros(n)
+    cumulative_credits = np.zeros(n)
+    letter_counts = np.zeros(len(boundaries), dtype=np.int64)
+    group_student, group_semester, semester_points, semester_credits = [], [], [], []
+    for result in results:
+        first = result['first']
+        size = len(result['cumulative_points'])
+        cumulative_points[first:first + size] += result['cumulative_points']
+        cumulative_credits[first:first + size] += result['cumulative_credits']
+        letter_counts += result['letter_counts']
+        group_student.append(result['group_student'])
+        group_semester.append(result['group_semester'])
+        semester_points.append(result['semester_points'])
+        semester_credits.append(result['semester_credits'])
+
+    cumulative_gpa = np.divide(cumulative_points, cumulative_credits,
+                               out=np.zeros(n), where=cumulative_credits > 0)
+    group_student = np.concatenate(group_student) if results else np.zeros(0, dtype=np.int64)
+    group_semester = np.concatenate(group_semester) if results else np.zeros(0, dtype=np.int64)
+    semester_points = np.concatenate(semester_points) if results else np.zeros(0)
+    semester_credits = np.concatenate(semester_credits) if results else np.zeros(0)
+    semester_gpa = np.divide(semester_points, semester_credits,
+                             out=np.zeros(len(semester_points)), where=semester_credits > 0)
+
+    max_gpa = float(gpa_values.max()) if len(gpa_values) else 4.0
+    graded = cumulative_credits > 0
+    histograms = {
+        "cumulative_gpa": _histogram(cumulative_gpa[graded], max_gpa),
+        "semester_gpa": {
+            semester: _histogram(semester_gpa[(group_semester == i) & (semester_credits > 0)], max_gpa)
+            for i, semester in enumerate(semesters)
+        },
+        "letter_grades": {letter: int(count) for letter, count in zip(scale.letters, letter_counts)}
+    }
+
+    result = {
+        "student_count": n,
+        "course_count": len(rows),
+        "workers": max(len(results), 1),
+        "histograms": histograms
+    }
+    if include_students:
+        names = {s['user_id']: dict(s) for s in students}
+        per_student = [[] for _ in range(n)]
+        # Groups come out sorted by (student, semester index), i.e. chronological
+        for s_idx, sem, gpa, credits in zip(group_student.tolist(), group_semester.tolist(),
+                                            semester_gpa.tolist(), semester_credits.tolist()):
+            per_student[s_idx].append({"semester": semesters[sem], "gpa": round(gpa, 2), "credits": _number(credits)})
+        result["students"] = [{
+            "student_id": int(student_id),
+            "firstname": names.get(student_id, {}).get('firstname'),
+            "lastname": names.get(student_id, {}).get('lastname'),
+            "cumulative_gpa": round(float(cumulative_gpa[i]), 2),
+            "total_credits": _number(cumulative_credits[i]),
+            "semesters": per_student[i]
+        } for i, student_id in enumerate(all_ids.tolist())]
+    return result
@@ -1,18 +1,49 @@
 # Config Service
 # Handles retrieval of system configuration and static data
+import threading
+import time
+
+from backend.config import config
 from backend.database import query_db
+from backend.http_cache import content_version
+
+
+_types_lock = threading.Lock()
+_types_cache = None  # (loaded_at, types, version)
+
+
+def get_assessment_types_versioned() -> tuple:
+    """
+    Assessment types and their content version. The rows are kept per
+    process like the grading scale: reloaded after
+    invalidate_assessment_types() or once GRADING_SCALE_TTL expires.
+    """
+    global _types_cache
+    cached = _types_cache
+    if cached is not None and time.monotonic() - cached[0] < config.GRADING_SCALE_TTL:
+        return cached[1], cached[2]
+    with _types_lock:
+        if _types_cache is None or time.monotonic() - _types_cache[0] >= config.GRADING_SCALE_TTL:
+            types = [dict(row) for row in query_db('SELECT * FROM "ASSESSMENT_TYPE" ORDER BY name')]
+            _types_cache = (time.monotonic(), types, content_version(types))
+        return _types_cache[1], _types_cache[2]
 
 
 def get_assessment_types() -> list:
     """
     Get all assessment types (Assignment, Quiz, etc.) with defaults.
     """
-    types = query_db('SELECT * FROM "ASSESSMENT_TYPE" ORDER BY name')
-    if not types:
-        return []
+    types, _ = get_assessment_types_versioned()
     return [dict(row) for row in types]
 
 
+def invalidate_assessment_types():
+    """Drop the cached assessment types so the next read reloads them."""
+    global _types_cache
+    with _types_lock:
+        _types_cache = None
+
+
 def get_semesters() -> list:
     """
     Get available semesters grouped by year.
@@ -25,3 +56,26 @@ def get_semesters() -> list:
         for term in SEMESTER_TERMS:
             result.append(f"{term} {year}")
     return result
+
+
+def get_semesters_version() -> str:
+    """Content version of get_semesters() (it only changes with a deploy)."""
+    return _SEMESTERS_VERSION
+
+
+SEMESTER_ORDER = ["Spring", "Summer", "Fall", "Winter"]
+
+
+def semester_sort_key(semester: str):
+    """
+    Chronological sort key for labels like 'Fall 2025'.
+    Labels that don't follow the '<Term> <Year>' pattern sort last.
+    """
+    parts = (semester or '').split(' ')
+    term = parts[0]
+    year = parts[1] if len(parts) > 1 else '0'
+    term_index = SEMESTER_ORDER.index(term) if term in SEMESTER_ORDER else 999
+    return (year, term_index, semester or '')
+
+
+_SEMESTERS_VERSION = content_version(get_semesters())
@@ -0,0 +1,82 @@
+# Dashboard Service
+# Builds everything the student dashboard renders from one DB round trip.
+from backend.database import query_db
+from backend.services.grade_engine import aggregate_course_rows, build_grade_report
+from backend.services.config_service import semester_sort_key
+from backend.services.grading_scale import get_compiled_scale
+
+
+DASHBOARD_QUERY = '''
+    SELECT c.course_id, c.course_code, c.course_name, c.credit_hours, c.semester, c.student_id,
+           a.assessment_id, a.assessment_type, a.weight, a.marks, a.earned_marks
+    FROM "COURSE" c
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    WHERE c.student_id = ?
+    ORDER BY c.semester, c.course_id, a.assessment_id
+'''
+
+def build_student_dashboard(student_id: int) -> dict:
+    """
+    GPA summary, courses, per-semester GPAs and per-type, per-semester
+    assessment averages for one student.
+    """
+    rows = query_db(DASHBOARD_QUERY, (student_id,))
+    scale = get_compiled_scale()
+    graded_courses = aggregate_course_rows(rows)
+    report = build_grade_report(graded_courses, scale) if rows else None
+
+    courses = []
+    seen = set()
+    trends = {}
+    for row in rows:
+        if row['course_id'] not in seen:
+            seen.add(row['course_id'])
+            courses.append({
+                "course_id": row['course_id'],
+                "course_code": row['course_code'],
+                "course_name": row['course_name'],
+                "credit_hours": row['credit_hours'],
+                "semester": row['semester'],
+                "student_id": row['student_id']
+            })
+
+        if row['assessment_id'] is None or row['earned_marks'] is None or not row['marks'] > 0:
+            continue
+        semester = row['semester'] or 'Unknown'
+        bucket = trends.setdefault(row['assessment_type'], {}).setdefault(semester, [0, 0])
+        bucket[0] += (row['earned_marks'] / row['marks']) * 100
+        bucket[1] += 1
+
+    summary = report['summary'] if report else {
+        "semester_gpa": 0.0, "cumulative_gpa": 0.0, "total_credits": 0, "course_grades": []
+    }
+
+    # Semester GPAs over the courses that count towards the cumulative GPA
+    semester_totals = {}
+    for course in graded_courses:
+        totals = semester_totals.setdefault(course['semester'] or 'Unknown', [0, 0])
+        gpa_value = scale.gpa_for(course['grade']) if course['graded_weight'] > 0 else None
+        if gpa_value is not None and course['credit_hours']:
+            totals[0] += gpa_value * course['credit_hours']
+            totals[1] += course['credit_hours']
+    semester_gpas = sorted([
+        {"semester": semester, "gpa": round(points / credits, 2) if credits > 0 else 0.0, "credits": credits}
+        for semester, (points, credits) in semester_totals.items()
+    ], key=lambda s: semester_sort_key(s['semester']))
+
+    assessment_trends = {
+        assessment_type: sorted([
+            {"semester": semester, "averageScore": round(total / count, 2), "count": count}
+            for semester, (total, count) in by_semester.items()
+        ], key=lambda s: semester_sort_key(s['semester']))
+        for assessment_type, by_semester in trends.items()
+    }
+
+    return {
+        "student_id": student_id,
+        "gpa": summary,
+        "courses": courses,
+        "total_credits": sum(c['credit_hours'] for c in courses),
+        "semester_gpas": semester_gpas,
+        "assessment_trends": assessment_trends
+    }
@@ -1,4 +1,103 @@
+import math
+
+import numpy as np
+
 from backend.services.gpa_service import get_gpa_value_for_percentage
+from backend.services.grading_scale import get_compiled_scale
+
+# GPA values and credit hours carry at most two decimals, so points are
+# exact integers in units of 1/10000 before the gcd reduction
+POINT_SCALE = 100
+# Upper bound on DP table cells (courses x point totals); larger problems
+# are solved on coarser units. The backtrack keeps one byte per cell.
+MAX_SOLVER_STATES = 2_000_000
+
+
+def solve_minimum_grades(credits: list, needed_points: float, scale) -> list:
+    """
+    Cheapest letter grade per course whose credit-weighted GPA points add up
+    to at least needed_points.
+
+    The scale is a step function, so each course picks one band. Points are
+    integers (GPA and credits scaled to hundredths, divided by their gcd) and
+    a DP over the capped points total keeps, for every total, the choice with
+    the smallest credit-weighted sum of band minimum percentages.
+
+    Returns:
+        [(minimum_percent, gpa, letter_grade)] per course, or None if even
+        the top band everywhere falls short
+    """
+    options = [(float(m), float(g), letter)
+               for m, g, letter in zip(scale.boundaries, scale.gpa_values, scale.letters)]
+    if not options or options[0][0] > 0:
+        # Below the lowest band counts as 0 points and costs nothing
+        options.insert(0, (0.0, 0.0, None))
+    if not len(credits):
+        return None
+
+    credits = np.array(credits, dtype=float)
+    credit_units = np.rint(credits * POINT_SCALE).astype(np.int64)
+    gpa_units = np.rint(np.array([o[1] for o in options]) * POINT_SCALE).astype(np.int64)
+    units = np.outer(credit_units, gpa_units)
+    positive = units[units > 0]
+    if not len(positive):
+        return None
+    divisor = int(np.gcd.reduce(positive))
+    units //= divisor
+    target = math.ceil(needed_points * POINT_SCALE * POINT_SCALE / divisor - 1e-6)
+
+    best = units.max(axis=1)
+    if best.sum() < target:
+        return None
+    states_per_course = MAX_SOLVER_STATES // len(credits) - 1
+    if target > states_per_course:
+        # Rounding points down keeps any answer found valid, just not minimal
+        factor = math.ceil(target / max(states_per_course, 1))
+        units //= factor
+        target = math.ceil(target / factor)
+        if units.max(axis=1).sum() < target:
+            top = max(range(len(options)), key=lambda b: (options[b][1], -options[b][0]))
+            return [options[top]] * len(credits)
+
+    efforts = np.outer(credits, [o[0] for o in options])
+    steps = np.minimum(units, target)
+    cost = np.full(target + 1, np.inf)
+    cost[0] = 0.0
+    # choices[i, t]: band course i took to reach total t. The previous total
+    # is t - steps[i, band], except at the capped target, where any total
+    # within reach may have collapsed onto it; that one is kept per course.
+    choices = np.zeros((len(credits), target + 1), dtype=np.int8 if len(options) < 128 else np.int16)
+    target_previous = []
+    for i in range(len(credits)):
+        new_cost = np.full(target + 1, np.inf)
+        choice = choices[i]
+        from_total = 0
+        for b in range(len(options)):
+            v = int(steps[i, b])
+            candidate = cost + efforts[i, b]
+            # Totals below the target move up by v
+            if v < target:
+                better = candidate[:target - v] < new_cost[v:target]
+                new_cost[v:target][better] = candidate[:target - v][better]
+                choice[v:target][better] = b
+            # Totals that reach the target collapse onto it
+            start = target - v
+            s = start + int(np.argmin(candidate[start:]))
+            if candidate[s] < new_cost[target]:
+                new_cost[target] = candidate[s]
+                choice[target] = b
+                from_total = s
+        cost = new_cost
+        target_previous.append(from_total)
+
+    picks = []
+    state = target
+    for i in reversed(range(len(credits))):
+        band = int(choices[i, state])
+        picks.append(options[band])
+        state = target_previous[i] if state == target else state - int(steps[i, band])
+    return picks[::-1]
+
 
 def calculate_gpa_forecast(current_summary: dict, hypothetical_courses: list, target_gpa: float = None) -> dict:
     """
@@ -81,48 +180,96 @@ def calculate_gpa_forecast(current_summary: dict, hypothetical_courses: list, ta
                     c['minimum_required'] = "Impossible" if status == "Impossible" else "0.00"
 
         else:
-            # Distribute remaining points across unknowns
-            # remaining_needed is GPA_POINTS. Need to convert to Average GPA then to Percent.
-            # Avg GPA needed for unknowns = remaining_needed / unknown_credits
-            
             required_avg_gpa = remaining_needed / unknown_credits
-            
-            # This is tricky because GPA is step-function of Percent.
-            # But the requirement is usually simplified to "Average Points".
-            # Mapping Avg Points -> Percent is approximate or requires solving.
-            # Using simple Linear approximation: 4.0 = 100%, 0.0 = 0% is too simple?
-            # Creating a reverse lookup or linear scale 0-4 -> 0-100?
-            # KPU Scale: 4.33=90-100, 4.0=85-89, 3.67=80-84 ... 
-            # Let's use a simpler approximation: Percent = (GPA / 4.0) * 100 ?
-            # Or better, scan the grading scale to find the minimum percent that yields >= required_avg_gpa.
-            
-            # Since we can't easily reverse the step function perfectly for an average,
-            # we will provide the "Average GPA Required" for the unknowns.
-            # And an ESTIMATED percent.
-            
-            estimated_percent = (required_avg_gpa / 4.0) * 100 # Rough estimate
-            # Clamp
-            estimated_percent = max(0, min(100, estimated_percent))
-            
-            # Check feasibility
-            status = "Possible"
-            if required_avg_gpa > 4.33:
-               status = "Impossible"
-               estimated_percent = 100
-            elif required_avg_gpa <= 0:
-               status = "Satisfied"
-               estimated_percent = 0
+            unknowns = [c for c in hypothetical_results if c['hypothetical'] is None]
+            scale = get_compiled_scale()
+
+            if remaining_needed <= 0:
+                status = "Satisfied"
+                minimums = None
+            else:
+                minimums = solve_minimum_grades([c['credits'] for c in unknowns], remaining_needed, scale)
+                status = "Possible" if minimums is not None else "Impossible"
 
             result["target_analysis"] = {
                 "status": status,
                 "target_gpa": target_gpa,
                 "required_avg_gpa_for_unknowns": round(required_avg_gpa, 2),
-                "estimated_percent_required": round(estimated_percent, 2)
+                "course_minimums": None
             }
-            
-            for c in hypothetical_results:
-                if c['hypothetical'] is None:
-                    c['minimum_required'] = "Impossible" if status == "Impossible" else f"{estimated_percent:.2f}"
+
+            if minimums is None:
+                for c in unknowns:
+                    c['minimum_required'] = "Impossible" if status == "Impossible" else "0.00"
+            else:
+                course_minimums = []
+                minimum_points = 0
+                for c, (percent, gpa, letter) in zip(unknowns, minimums):
+                    c['minimum_required'] = f"{percent:.2f}"
+                    c['minimum_letter'] = letter
+                    minimum_points += gpa * c['credits']
+                    course_minimums.append({
+                        "course_code": c['course_code'],
+                        "credits": c['credits'],
+                        "minimum_percent": percent,
+                        "letter_grade": letter,
+                        "gpa": gpa
+                    })
+                result["target_analysis"]["course_minimums"] = course_minimums
+                result["target_analysis"]["projected_gpa_at_minimums"] = round(
+                    (current_points + future_points + minimum_points) / total_combined_credits, 2
+                )
+
+    return result
+
+def calculate_gpa_forecast_batch(current_summary: dict, hypothetical_courses: list,
+                                 scenarios: list, target_gpa: float = None) -> dict:
+    """
+    Evaluate many grade combinations for the same set of hypothetical courses.
+
+    scenarios is a matrix with one row per scenario and one percent per course
+    (null = unknown, counted as 0 points like the single-scenario projection).
+    All scenarios are converted and summed as one array operation.
+    """
+    current_credits = float(current_summary.get('total_credits', 0))
+    current_gpa = float(current_summary.get('cumulative_gpa', 0))
+    current_points = current_credits * current_gpa
+
+    credits = np.array([float(c.get('credits', 0)) for c in hypothetical_courses], dtype=float)
+    if any(len(row) != len(credits) for row in scenarios):
+        raise ValueError("Each scenario must have one grade per hypothetical course")
+
+    grades = np.array(
+        [[np.nan if g is None else float(g) for g in row] for row in scenarios],
+        dtype=float
+    ).reshape(len(scenarios), len(credits))
+
+    gpa_matrix = get_compiled_scale().gpa_for_many(grades)
+    total_credits = current_credits + credits.sum()
+    if total_credits > 0:
+        projected = (current_points + gpa_matrix @ credits) / total_credits
+    else:
+        projected = np.zeros(len(scenarios))
+
+    result = {
+        "current": {
+            "gpa": current_gpa,
+            "credits": current_credits
+        },
+        "courses": [
+            {"course_code": c.get('code'), "credits": float(cr)}
+            for c, cr in zip(hypothetical_courses, credits)
+        ],
+        "scenario_count": len(scenarios),
+        "total_credits": float(total_credits),
+        "gpa_matrix": gpa_matrix.tolist(),
+        "projected_cumulative_gpa": np.round(projected, 2).tolist(),
+        "meets_target": None
+    }
+
+    if target_gpa is not None:
+        result["target_gpa"] = target_gpa
+        result["meets_target"] = (projected >= float(target_gpa)).tolist()
 
     return result
 
@@ -212,3 +359,102 @@ def calculate_course_grade_forecast(assessments: list, target_grade: float = Non
         },
         "target_analysis": analysis
     }
+
+
+def _axis_range(axis: dict) -> tuple:
+    """
+    (start, step, count) of one varying input, with min/max clamped to
+    0-100. Only the count is worked out here, so oversized grids can be
+    rejected before any values are allocated.
+    """
+    try:
+        start = float(axis.get('min', 0))
+        stop = float(axis.get('max', 100))
+        step = float(axis.get('step', 5))
+    except (TypeError, ValueError):
+        raise ValueError("min, max and step must be numbers")
+    if not all(math.isfinite(v) for v in (start, stop, step)) or step <= 0:
+        raise ValueError("Each varying input needs finite min/max and a positive step")
+    start, stop = max(start, 0.0), min(stop, 100.0)
+    if stop < start:
+        raise ValueError("Each varying input needs min <= max within 0-100")
+    return start, step, int(math.floor((stop - start) / step + 1e-9)) + 1
+
+
+def _axis_values(start: float, step: float, count: int) -> np.ndarray:
+    return np.round(start + step * np.arange(count), 4)
+
+
+def calculate_course_grade_sensitivity(assessments: list, vary: list, current_summary: dict = None,
+                                       credits: float = None, max_cells: int = 10000,
+                                       scale_partial: bool = False) -> dict:
+    """
+    Course grade (and GPA) over a grid of marks for one or two assessments.
+
+    vary lists up to two {"assessment": index or name, "min", "max", "step"}
+    ranges; every other assessment keeps its mark. By default each cell is
+    the grade calculate_course_grade_forecast gives for those marks (unmarked
+    assessments earn nothing). With scale_partial, unmarked assessments are
+    instead left out and the grade is scaled to the graded weight, like
+    grade_engine. The whole grid is computed with array operations.
+
+    Returns:
+        dict with axes (assessment, index, values) and course_grade /
+        course_gpa matrices shaped [len(axis 0)][len(axis 1)] (a flat list
+        for one axis); cumulative_gpa too when current_summary and credits
+        are given
+    """
+    if not 1 <= len(vary) <= 2:
+        raise ValueError("Vary one or two assessments")
+
+    names = [a.get('name') for a in assessments]
+    axes = []
+    for axis in vary:
+        if not isinstance(axis, dict):
+            raise ValueError("Each varying input must be an object")
+        ref = axis.get('assessment')
+        index = ref if isinstance(ref, int) and not isinstance(ref, bool) else (
+            names.index(ref) if ref in names else None)
+        if index is None or not 0 <= index < len(assessments):
+            raise ValueError(f"Unknown assessment: {ref}")
+        if any(index == other['index'] for other in axes):
+            raise ValueError("Each assessment can only be varied once")
+        axes.append({"assessment": names[index], "index": index, "range": _axis_range(axis)})
+
+    # Plain ints: the product can't overflow and nothing is allocated yet
+    cells = math.prod(axis['range'][2] for axis in axes)
+    if cells > max_cells:
+        raise ValueError(f"Grid has {cells} cells; the limit is {max_cells}")
+    for axis in axes:
+        axis['values'] = _axis_values(*axis.pop('range'))
+
+    weights = np.array([float(a.get('weight', 0)) for a in assessments], dtype=float)
+    varied = {axis['index'] for axis in axes}
+    fixed = [i for i, a in enumerate(assessments) if i not in varied and a.get('mark') is not None]
+    weighted = sum(float(assessments[i]['mark']) * weights[i] / 100 for i in fixed)
+    graded_weight = weights[fixed].sum() + weights[list(varied)].sum()
+
+    # Broadcast each axis along its own dimension
+    for dim, axis in enumerate(axes):
+        shape = [1] * len(axes)
+        shape[dim] = len(axis['values'])
+        weighted = weighted + axis['values'].reshape(shape) * weights[axis['index']] / 100
+    grade = np.asarray(weighted, dtype=float)
+    if scale_partial and 0 < graded_weight < 100:
+        grade = grade / graded_weight * 100
+
+    course_gpa = get_compiled_scale().gpa_for_many(grade)
+    result = {
+        "axes": [{**axis, "values": axis['values'].tolist()} for axis in axes],
+        "course_grade": np.round(grade, 2).tolist(),
+        "course_gpa": course_gpa.tolist(),
+        "cumulative_gpa": None
+    }
+
+    if current_summary is not None and credits:
+        current_credits = float(current_summary.get('total_credits', 0))
+        current_points = current_credits * float(current_summary.get('cumulative_gpa', 0))
+        cumulative = (current_points + course_gpa * float(credits)) / (current_credits + float(credits))
+        result["cumulative_gpa"] = np.round(cumulative, 2).tolist()
+
+    return result
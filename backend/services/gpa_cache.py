@@ -0,0 +1,96 @@
+# GPA Result Cache
+# Per-student cache of computed grade reports (GPA summary + breakdown).
+# Entries are evicted LRU-first and expire after GPA_CACHE_TTL seconds. Each
+# entry is stored with the student's grades version (USER.grades_version,
+# bumped by every grade write in any worker), so a worker never serves a
+# result computed before another worker's write; invalidate_student_gpa()
+# additionally drops the entry in the worker that handled the write.
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from backend.config import config
+
+
+class GpaResultCache:
+    """Thread-safe LRU + TTL cache keyed by student_id."""
+
+    def __init__(self, max_entries=1024, ttl=300.0, enabled=True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()  # student_id -> (expires_at, version, value)
+        self._lock = threading.Lock()
+        self._invalidation_seq = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0,
+                       "stale": 0}
+
+    def get_or_compute(self, student_id, compute, version=None):
+        """
+        Return the cached value for student_id, computing and storing it on a
+        miss. An entry stored under a different version counts as a miss.
+        """
+        if not self.enabled:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is not None:
+                expires_at, entry_version, value = entry
+                if expires_at > now and entry_version == version:
+                    self._entries.move_to_end(student_id)
+                    self._stats["hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[student_id]
+                self._stats["expirations" if expires_at <= now else "stale"] += 1
+            self._stats["misses"] += 1
+            seq = self._invalidation_seq
+
+        value = compute()
+
+        with self._lock:
+            if seq != self._invalidation_seq:
+                # A write landed while we were computing; don't cache a stale result
+                return copy.deepcopy(value)
+            self._entries[student_id] = (time.monotonic() + self.ttl, version, value)
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return copy.deepcopy(value)
+
+    def invalidate(self, student_id):
+        with self._lock:
+            self._invalidation_seq += 1
+            if self._entries.pop(student_id, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._invalidation_seq += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                **self._stats
+            }
+
+
+gpa_cache = GpaResultCache(
+    max_entries=config.GPA_CACHE_MAX_ENTRIES,
+    ttl=config.GPA_CACHE_TTL,
+    enabled=config.GPA_CACHE_ENABLED
+)
+
+
+def invalidate_student_gpa(student_id):
+    """Drop cached GPA results for a student after their courses or grades change."""
+    if student_id is not None:
+        gpa_cache.invalidate(int(student_id))
@@ -0,0 +1,134 @@
+# GPA History
+# Incremental time series of semester and cumulative GPA stored in GPAREPORT.
+# A row is appended only for semesters whose GPA changed since the last
+# snapshot, so trend charts read history with an indexed range scan instead
+# of recomputing every past semester.
+from backend.database import query_db, transaction
+from backend.services.gpa_service import calculate_gpa_breakdown
+from backend.services.grade_engine import load_all_course_grades, build_grade_report
+from backend.services.grading_scale import get_compiled_scale
+
+
+LATEST_SNAPSHOT_QUERY = '''
+    SELECT report_id, student_id, semester, semester_gpa, cumulative_gpa
+    FROM "GPAREPORT"
+    WHERE report_id IN (
+        SELECT MAX(report_id) FROM "GPAREPORT" {where} GROUP BY student_id, semester
+    )
+'''
+
+INSERT_SNAPSHOT_QUERY = '''
+    INSERT INTO "GPAREPORT" (student_id, semester, semester_gpa, cumulative_gpa)
+    VALUES (?, ?, ?, ?)
+'''
+
+
+def _as_float(value):
+    return None if value is None else round(float(value), 2)
+
+
+def _latest_by_student(rows) -> dict:
+    """Group latest-snapshot rows into student_id -> {"semesters": {...}, "cumulative": x}."""
+    latest = {}
+    for row in rows:
+        entry = latest.setdefault(row['student_id'], {"semesters": {}, "cumulative": None, "report_id": -1})
+        entry['semesters'][row['semester']] = _as_float(row['semester_gpa'])
+        if row['report_id'] > entry['report_id']:
+            entry['report_id'] = row['report_id']
+            entry['cumulative'] = _as_float(row['cumulative_gpa'])
+    return latest
+
+
+def diff_snapshot(student_id: int, breakdown: dict, latest: dict) -> list:
+    """
+    Rows to append so the history reflects the current breakdown.
+
+    Semesters without graded courses are not recorded; a semester that
+    disappears (its courses were deleted) gets a row with a NULL semester_gpa.
+    """
+    latest = latest or {"semesters": {}, "cumulative": None}
+    previous = latest['semesters']
+    cumulative = _as_float(breakdown.get('cumulative_gpa', 0))
+
+    current = {
+        s['semester']: _as_float(s['gpa'])
+        for s in breakdown.get('semesters', []) if s['credits'] > 0
+    }
+
+    rows = []
+    for semester, gpa in current.items():
+        if previous.get(semester) != gpa:
+            rows.append((student_id, semester, gpa, cumulative))
+    for semester, gpa in previous.items():
+        if semester not in current and gpa is not None:
+            rows.append((student_id, semester, None, cumulative))
+
+    if not rows and current and latest['cumulative'] != cumulative:
+        # Cumulative moved without any semester changing (e.g. credit edits)
+        semester = next(reversed(current))
+        rows.append((student_id, semester, current[semester], cumulative))
+    return rows
+
+
+def _insert_snapshots(rows):
+    if not rows:
+        return
+    with transaction() as tx:
+        tx.executemany(INSERT_SNAPSHOT_QUERY, rows)
+
+
+def record_gpa_snapshot(student_id: int) -> int:
+    """
+    Append history rows for a student whose grades just changed.
+    Returns the number of rows written.
+    """
+    breakdown = calculate_gpa_breakdown(student_id)
+    latest = _latest_by_student(query_db(
+        LATEST_SNAPSHOT_QUERY.format(where='WHERE student_id = ?'), (student_id,)
+    ))
+    rows = diff_snapshot(student_id, breakdown, latest.get(student_id))
+    _insert_snapshots(rows)
+    return len(rows)
+
+
+def get_gpa_history(student_id: int, since: str = None, until: str = None, semester: str = None) -> list:
+    """Read a student's GPA history in date order, optionally within [since, until]."""
+    query = '''SELECT date, semester, semester_gpa, cumulative_gpa
+               FROM "GPAREPORT" WHERE student_id = ?'''
+    args = [student_id]
+    if since:
+        query += ' AND date >= ?'
+        args.append(since)
+    if until:
+        query += ' AND date <= ?'
+        args.append(until)
+    if semester:
+        query += ' AND semester = ?'
+        args.append(semester)
+    query += ' ORDER BY date, report_id'
+
+    return [{
+        "date": str(row['date']),
+        "semester": row['semester'],
+        "semester_gpa": _as_float(row['semester_gpa']),
+        "cumulative_gpa": _as_float(row['cumulative_gpa'])
+    } for row in query_db(query, tuple(args))]
+
+
+def backfill_gpa_history() -> dict:
+    """
+    Bring GPAREPORT up to date for every student in bulk: one query for all
+    grades, one for the latest snapshots, one batched insert. Safe to re-run;
+    students whose history is current get no new rows.
+    """
+    scale = get_compiled_scale()
+    courses_by_student = load_all_course_grades()
+    latest = _latest_by_student(query_db(LATEST_SNAPSHOT_QUERY.format(where='')))
+
+    rows = []
+    for student_id, courses in courses_by_student.items():
+        breakdown = build_grade_report(courses, scale)['breakdown']
+        rows.extend(diff_snapshot(student_id, breakdown, latest.get(student_id)))
+
+    _insert_snapshots(rows)
+    return {"students": len(courses_by_student), "rows_written": len(rows)}
@@ -0,0 +1,218 @@
+# Grade Engine
+# Loads a student's courses and assessments in one query and derives
+# course grades, semester GPAs and cumulative GPA in a single pass.
+from backend.database import query_db
+from backend.services.grading_scale import get_compiled_scale
+
+
+COURSE_GRADES_QUERY = '''
+    SELECT c.course_id, c.course_code, c.credit_hours, c.semester,
+           a.assessment_id, a.weight, a.marks, a.earned_marks
+    FROM "COURSE" c
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    WHERE c.student_id = ?
+    ORDER BY c.semester, c.course_id, a.assessment_id
+'''
+
+
+ALL_COURSE_GRADES_QUERY = '''
+    SELECT c.student_id, c.course_id, c.course_code, c.credit_hours, c.semester,
+           a.assessment_id, a.weight, a.marks, a.earned_marks
+    FROM "COURSE" c
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    ORDER BY c.student_id, c.semester, c.course_id, a.assessment_id
+'''
+
+
+SINGLE_COURSE_QUERY = '''
+    SELECT c.course_id, c.course_code, c.credit_hours, c.semester,
+           a.assessment_id, a.weight, a.marks, a.earned_marks
+    FROM "COURSE" c
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    WHERE c.course_id = ?
+    ORDER BY a.assessment_id
+'''
+
+
+def load_course_grades(student_id: int) -> list:
+    """
+    Load every course for a student with its grade already aggregated.
+
+    Returns a list of course dicts (ordered by semester, then course_id) with:
+        assessment_count, graded_weight and grade (percentage, adjusted for
+        partial completion the same way the GPA routes always have).
+    """
+    rows = query_db(COURSE_GRADES_QUERY, (student_id,))
+    return aggregate_course_rows(rows)
+
+
+def load_all_course_grades() -> dict:
+    """
+    Bulk variant of load_course_grades for every student in one query.
+
+    Returns:
+        dict of student_id -> list of course dicts
+    """
+    rows = query_db(ALL_COURSE_GRADES_QUERY)
+    by_student = {}
+    start = 0
+    for i in range(1, len(rows) + 1):
+        if i == len(rows) or rows[i]['student_id'] != rows[start]['student_id']:
+            by_student[rows[start]['student_id']] = aggregate_course_rows(rows[start:i])
+            start = i
+    return by_student
+
+
+def aggregate_course_rows(rows) -> list:
+    """Fold joined COURSE/ASSESSMENT rows into one entry per course."""
+    courses = []
+    current = None
+
+    for row in rows:
+        if current is None or current['course_id'] != row['course_id']:
+            current = {
+                'course_id': row['course_id'],
+                'course_code': row['course_code'],
+                'credit_hours': row['credit_hours'],
+                'semester': row['semester'],
+                'assessment_count': 0,
+                'graded_weight': 0,
+                'grade': 0
+            }
+            courses.append(current)
+
+        if row['assessment_id'] is None:
+            continue  # LEFT JOIN row for a course without assessments
+
+        current['assessment_count'] += 1
+        if row['earned_marks'] is not None:
+            percentage = (row['earned_marks'] / row['marks']) * 100
+            current['grade'] += (percentage * row['weight'] / 100)
+            current['graded_weight'] += row['weight']
+
+    for course in courses:
+        total_weight = course['graded_weight']
+        if 0 < total_weight < 100:
+            # Adjust for partial completion
+            course['grade'] = (course['grade'] / total_weight) * 100
+
+    return courses
+
+
+def build_grade_report(courses: list, scale) -> dict:
+    """
+    Compute the legacy GPA summary and the semester breakdown in one pass.
+
+    Returns:
+        dict with "summary" (shape of calculate_student_gpa) and
+        "breakdown" (shape of calculate_gpa_breakdown)
+    """
+    summary_points = 0
+    summary_credits = 0
+    summary_grades = []
+
+    semesters = {}
+    total_points_global = 0
+    total_credits_global = 0
+
+    for course in courses:
+        sem = course['semester'] or 'Unknown'
+        if sem not in semesters:
+            semesters[sem] = {"points": 0, "credits": 0, "courses": []}
+        bucket = semesters[sem]
+
+        if course['assessment_count'] == 0:
+            bucket['courses'].append({
+                "course_code": course['course_code'],
+                "credits": course['credit_hours'],
+                "grade": 0,
+                "gpa": 0
+            })
+            continue
+
+        gpa_value = scale.gpa_for(course['grade'])
+
+        # Summary only counts courses with graded work and a scale match
+        if course['graded_weight'] > 0 and gpa_value is not None:
+            summary_points += gpa_value * course['credit_hours']
+            summary_credits += course['credit_hours']
+            summary_grades.append({
+                'course_id': course['course_id'],
+                'course_code': course['course_code'],
+                'grade': round(course['grade'], 2),
+                'gpa': gpa_value
+            })
+
+        # Breakdown counts every course that has assessments
+        gpa_val = gpa_value if gpa_value is not None else 0.0
+        bucket['points'] += gpa_val * course['credit_hours']
+        bucket['credits'] += course['credit_hours']
+        bucket['courses'].append({
+            "course_code": course['course_code'],
+            "credits": course['credit_hours'],
+            "grade": round(course['grade'], 2),
+            "gpa": gpa_val
+        })
+
+    semesters_result = []
+    for sem, bucket in semesters.items():
+        sem_gpa = bucket['points'] / bucket['credits'] if bucket['credits'] > 0 else 0.0
+        semesters_result.append({
+            "semester": sem,
+            "gpa": round(sem_gpa, 2),
+            "credits": bucket['credits'],
+            "courses": bucket['courses']
+        })
+        total_points_global += bucket['points']
+        total_credits_global += bucket['credits']
+
+    # Summary lists courses in insertion (course_id) order
+    summary_grades.sort(key=lambda c: c['course_id'])
+    for entry in summary_grades:
+        del entry['course_id']
+
+    cumulative_gpa = summary_points / summary_credits if summary_credits > 0 else 0.0
+    cumulative = total_points_global / total_credits_global if total_credits_global > 0 else 0.0
+
+    return {
+        "summary": {
+            "semester_gpa": round(cumulative_gpa, 2),  # Legacy support
+            "cumulative_gpa": round(cumulative_gpa, 2),
+            "total_credits": summary_credits,
+            "course_grades": summary_grades
+        },
+        "breakdown": {
+            "semesters": semesters_result,
+            "cumulative_gpa": round(cumulative, 2),
+            "total_credits": total_credits_global
+        }
+    }
+
+
+def compute_course_grade(course_id: int) -> dict:
+    """
+    Grade of a single course with its letter and GPA value, or None if the
+    course doesn't exist. total_weight covers every assessment, graded or not.
+    """
+    rows = query_db(SINGLE_COURSE_QUERY, (course_id,))
+    if not rows:
+        return None
+    course = aggregate_course_rows(rows)[0]
+    scale = get_compiled_scale()
+    graded = course['graded_weight'] > 0
+    return {
+        "course_id": course['course_id'],
+        "grade": round(course['grade'], 2) if graded else None,
+        "graded_weight": float(course['graded_weight']),
+        "total_weight": float(sum(r['weight'] for r in rows if r['assessment_id'] is not None)),
+        "letter_grade": scale.letter_for(course['grade']) if graded else None,
+        "gpa": scale.gpa_for(course['grade']) if graded else None
+    }
+
+
+def compute_student_report(student_id: int) -> dict:
+    """Load and compute the full grade report for one student."""
+    courses = load_course_grades(student_id)
+    if not courses:
+        return None
+    return build_grade_report(courses, get_compiled_scale())
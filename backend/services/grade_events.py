@@ -0,0 +1,26 @@
+# Grade Events
+# Single hook for "this student's courses or grades changed", called by every
+# write route after its statement succeeds.
+import logging
+
+from backend.database import execute_db
+from backend.services.gpa_cache import invalidate_student_gpa
+from backend.services.gpa_history import record_gpa_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def grades_changed(student_id):
+    """
+    Bump the student's grades_version (marking saved what-if results stale),
+    invalidate cached GPA results and append the new GPA to the history.
+    """
+    if student_id is None:
+        return
+    execute_db('UPDATE "USER" SET grades_version = grades_version + 1 WHERE user_id = ?', (student_id,))
+    invalidate_student_gpa(student_id)
+    try:
+        record_gpa_snapshot(int(student_id))
+    except Exception as e:
+        # History is derived data; never fail the write because of it
+        logger.warning(f"Could not record GPA history for student {student_id}: {e}")
@@ -0,0 +1,93 @@
+# Grading Scale
+# Compiled, in-memory view of the GRADINGSCALE table.
+# The table is small and static, so it is loaded once per process and every
+# percentage -> GPA conversion is a bisect over the sorted lower boundaries.
+import bisect
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+
+from backend.config import config
+from backend.database import query_db
+
+
+class CompiledGradingScale:
+    """
+    Sorted grading scale with O(log n) lookups.
+
+    Each band covers [min_score, next band's min_score), so values that fall
+    between the stored ranges (e.g. 89.995 between 89.99 and 90.00) resolve
+    to the lower band instead of missing like a BETWEEN query would. Scores
+    above the top band (bonus marks) resolve to the top band.
+    """
+
+    def __init__(self, rows):
+        # API order: highest band first, as the route has always returned it
+        self.rows = sorted((dict(r) for r in rows), key=lambda r: float(r['min_score']), reverse=True)
+        ascending = list(reversed(self.rows))
+        self.boundaries = [float(r['min_score']) for r in ascending]
+        self.gpa_values = [r['gpa_value'] for r in ascending]
+        self.letters = [r['letter_grade'] for r in ascending]
+        self._boundary_array = np.array(self.boundaries, dtype=float)
+        self._gpa_array = np.array([float(v) for v in self.gpa_values], dtype=float)
+        self.version = hashlib.sha1(
+            json.dumps(self.rows, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    def band_index(self, percentage):
+        """Index into the ascending boundaries, or None below the lowest band."""
+        index = bisect.bisect_right(self.boundaries, percentage) - 1
+        return index if index >= 0 else None
+
+    def gpa_for(self, percentage):
+        """GPA value for a percentage, or None if it is below every band."""
+        index = self.band_index(percentage)
+        return self.gpa_values[index] if index is not None else None
+
+    def gpa_for_many(self, percentages):
+        """
+        Vectorized gpa_for over an array of percentages.
+        Values below every band (and NaN) map to 0.0.
+        """
+        percentages = np.asarray(percentages, dtype=float)
+        indexes = np.searchsorted(self._boundary_array, percentages, side='right') - 1
+        gpas = self._gpa_array[np.clip(indexes, 0, None)]
+        return np.where((indexes >= 0) & ~np.isnan(percentages), gpas, 0.0)
+
+    def letter_for(self, percentage):
+        """Letter grade for a percentage, or None if it is below every band."""
+        index = self.band_index(percentage)
+        return self.letters[index] if index is not None else None
+
+
+_lock = threading.Lock()
+_compiled = None
+_loaded_at = 0.0
+
+
+def get_compiled_scale() -> CompiledGradingScale:
+    """
+    Return the process-wide compiled scale, loading it on first use.
+    It is reloaded after invalidate_grading_scale() or once GRADING_SCALE_TTL
+    expires, so edits made by another worker are picked up eventually.
+    """
+    global _compiled, _loaded_at
+    scale = _compiled
+    if scale is not None and time.monotonic() - _loaded_at < config.GRADING_SCALE_TTL:
+        return scale
+    with _lock:
+        if _compiled is None or time.monotonic() - _loaded_at >= config.GRADING_SCALE_TTL:
+            rows = query_db('SELECT * FROM "GRADINGSCALE" ORDER BY min_score DESC')
+            _compiled = CompiledGradingScale(rows)
+            _loaded_at = time.monotonic()
+        return _compiled
+
+
+def invalidate_grading_scale():
+    """Drop the compiled scale so the next lookup reloads it from the database."""
+    global _compiled
+    with _lock:
+        _compiled = None
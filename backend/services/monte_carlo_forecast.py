@@ -0,0 +1,153 @@
+# Monte Carlo Forecast
+# Probabilistic versions of the course-grade and GPA forecasts. Unknown
+# assessment and course results are drawn from the student's historical
+# per-type distributions (mean and spread of graded percentages) and every
+# simulation is evaluated at once as NumPy array operations.
+import math
+
+import numpy as np
+
+from backend.services.grading_scale import get_compiled_scale
+from backend.services.student_stats import get_student_stats
+
+# Used when a student has no graded history (same as historical-performance)
+DEFAULT_COMPONENT_AVERAGES = {
+    "Assignment": 80.0, "Quiz": 80.0, "Midterm": 75.0, "Final": 75.0, "Project": 80.0
+}
+DEFAULT_MEAN = 77.0
+DEFAULT_STD = 10.0
+# Floor on the spread so a handful of identical marks doesn't make the
+# forecast look certain
+MIN_STD = 5.0
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Course GPA draws come from a table of this many equally likely outcomes
+GPA_TABLE_SIZE = 1 << 16
+
+
+def performance_distributions(student_id: int = None) -> dict:
+    """
+    (mean, std) of graded percentages per assessment type plus overall,
+    from get_student_stats. Types with fewer than two graded results borrow
+    the overall spread; students without history get the defaults.
+    """
+    stats = get_student_stats(student_id) if student_id else None
+    if not stats or not stats['total']:
+        return {
+            "source": "default",
+            "overall": (DEFAULT_MEAN, DEFAULT_STD),
+            "by_type": {t: (mean, DEFAULT_STD) for t, mean in DEFAULT_COMPONENT_AVERAGES.items()}
+        }
+
+    overall = stats['overall']
+    overall_std = max(overall['std'] or DEFAULT_STD, MIN_STD)
+    return {
+        "source": "history",
+        "overall": (overall['mean'], overall_std),
+        "by_type": {
+            t: (g['mean'], max(g['std'], MIN_STD) if g['std'] is not None else overall_std)
+            for t, g in stats['by_type'].items()
+        }
+    }
+
+
+def _sample(rng, means, stds, simulations):
+    """simulations x len(means) matrix of percentages clipped to [0, 100]."""
+    samples = rng.normal(np.asarray(means, dtype=float), np.asarray(stds, dtype=float),
+                         size=(simulations, len(means)))
+    return np.clip(samples, 0.0, 100.0, out=samples)
+
+
+def _gpa_table(scale, mean, std):
+    """
+    GPA value for each of GPA_TABLE_SIZE equally likely course outcomes
+    under a normal(mean, std) percentage clipped to [0, 100]. Indexing it
+    with uniform integers samples course GPAs without drawing percentages
+    and searching the scale for every simulation.
+    """
+    boundaries = np.array(scale.boundaries, dtype=float)
+    cdf = np.array([0.5 * (1 + math.erf((b - mean) / (std * math.sqrt(2)))) for b in boundaries])
+    # Clipping moves everything below 0% onto 0%
+    cdf[boundaries <= 0] = 0.0
+    quantiles = (np.arange(GPA_TABLE_SIZE) + 0.5) / GPA_TABLE_SIZE
+    band = np.searchsorted(cdf, quantiles, side='right') - 1
+    gpa_values = np.array([float(v) for v in scale.gpa_values], dtype=float)
+    return np.where(band >= 0, gpa_values[np.clip(band, 0, None)], 0.0)
+
+
+def _summarize(values, target, decimals):
+    summary = {
+        "mean": round(float(values.mean()), decimals),
+        "percentiles": [
+            {"percentile": p, "value": round(float(v), decimals)}
+            for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+        ],
+        "probability_of_target": None
+    }
+    if target is not None:
+        summary["probability_of_target"] = round(float(np.mean(values >= float(target) - 1e-9)), 4)
+    return summary
+
+
+def simulate_course_grade(assessments: list, target_grade: float = None, distributions: dict = None,
+                          simulations: int = 100000, seed: int = None) -> dict:
+    """
+    Final course grade distribution. Assessments with a mark are fixed;
+    the rest are sampled from their type's distribution (overall if the
+    type has no history).
+    """
+    distributions = distributions or performance_distributions()
+    weights = np.array([float(a.get('weight', 0)) for a in assessments], dtype=float)
+    known = np.array([a.get('mark') is not None for a in assessments], dtype=bool)
+    earned = float(sum(float(a['mark']) * w / 100 for a, w in zip(assessments, weights) if a.get('mark') is not None))
+
+    params = [distributions['by_type'].get(a.get('type'), distributions['overall'])
+              for a, is_known in zip(assessments, known) if not is_known]
+    rng = np.random.default_rng(seed)
+    if params:
+        samples = _sample(rng, [p[0] for p in params], [p[1] for p in params], simulations)
+        grades = earned + samples @ (weights[~known] / 100)
+    else:
+        grades = np.full(simulations, earned)
+
+    return {
+        "simulations": simulations,
+        "distribution_source": distributions['source'],
+        **_summarize(grades, target_grade, 2)
+    }
+
+
+def simulate_gpa(current_summary: dict, hypothetical_courses: list, target_gpa: float = None,
+                 distributions: dict = None, simulations: int = 100000, seed: int = None) -> dict:
+    """
+    Cumulative GPA distribution. Courses with a hypothetical percent are
+    fixed; the rest draw a course percentage from the overall distribution
+    and go through the grading scale like real grades (via _gpa_table).
+    """
+    distributions = distributions or performance_distributions()
+    current_credits = float(current_summary.get('total_credits', 0))
+    current_points = current_credits * float(current_summary.get('cumulative_gpa', 0))
+
+    credits = np.array([float(c.get('credits', 0)) for c in hypothetical_courses], dtype=float)
+    fixed = np.array([np.nan if c.get('hypothetical') is None else float(c['hypothetical'])
+                      for c in hypothetical_courses], dtype=float)
+    unknown = np.isnan(fixed)
+    scale = get_compiled_scale()
+
+    fixed_points = float(scale.gpa_for_many(fixed[~unknown]) @ credits[~unknown]) if (~unknown).any() else 0.0
+    points = np.full(simulations, current_points + fixed_points)
+    if unknown.any():
+        table = _gpa_table(scale, *distributions['overall'])
+        draws = np.random.default_rng(seed).integers(
+            0, GPA_TABLE_SIZE, size=(simulations, int(unknown.sum())), dtype=np.uint32
+        )
+        points += table[draws] @ credits[unknown]
+
+    total_credits = current_credits + credits.sum()
+    gpas = points / total_credits if total_credits > 0 else np.zeros(simulations)
+    return {
+        "simulations": simulations,
+        "distribution_source": distributions['source'],
+        **_summarize(gpas, target_gpa, 2)
+    }
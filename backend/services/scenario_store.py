@@ -0,0 +1,192 @@
+# Scenario Store
+# Named what-if scenarios saved in WHATIFSCENARIO with their inputs and the
+# computed forecast. A stored result is reused while its inputs hash (which
+# includes the grading scale version) and the student's grades_version still
+# match; otherwise it is recomputed the next time the scenario is opened.
+import hashlib
+import json
+
+from flask import json as flask_json
+
+from backend.config import config
+from backend.database import is_postgres, query_db, transaction
+from backend.services.forecast_service import calculate_gpa_forecast, calculate_course_grade_forecast
+from backend.services.gpa_service import calculate_student_gpa
+from backend.services.grading_scale import get_compiled_scale
+
+SCENARIO_TYPES = ('gpa', 'course_grade')
+
+LIST_QUERY = '''
+    SELECT s.scenario_id, s.scenario_name, s.scenario_type, s.course_id, s.desired_grades,
+           s.predicted_gpa, s.grades_version, s.created_at, s.updated_at, u.grades_version AS current_version
+    FROM "WHATIFSCENARIO" s
+    JOIN "USER" u ON u.user_id = s.student_id
+    WHERE s.student_id = ?
+    ORDER BY s.scenario_name, s.scenario_id
+'''
+
+LOAD_QUERY = '''
+    SELECT s.*, u.grades_version AS current_version
+    FROM "WHATIFSCENARIO" s
+    JOIN "USER" u ON u.user_id = s.student_id
+    WHERE s.scenario_id = ? AND s.student_id = ?
+'''
+
+
+class ScenarioError(ValueError):
+    """The scenario inputs are invalid."""
+
+
+def normalize_inputs(scenario_type: str, data: dict) -> dict:
+    """The forecast inputs a scenario stores, with unrelated keys dropped."""
+    if scenario_type not in SCENARIO_TYPES:
+        raise ScenarioError(f"type must be one of: {', '.join(SCENARIO_TYPES)}")
+    if scenario_type == 'gpa':
+        courses = data.get('hypothetical_courses')
+        if not isinstance(courses, list) or len(courses) > config.MAX_FORECAST_COURSES:
+            raise ScenarioError(f"hypothetical_courses must be a list of at most {config.MAX_FORECAST_COURSES} courses")
+        inputs = {"hypothetical_courses": courses, "target_gpa": data.get('target_gpa')}
+        if data.get('current_summary') is not None:
+            inputs["current_summary"] = data['current_summary']
+        return inputs
+
+    assessments = data.get('assessments')
+    if not isinstance(assessments, list):
+        raise ScenarioError("assessments must be a list")
+    return {"assessments": assessments, "target_grade": data.get('target_grade')}
+
+
+def inputs_hash(scenario_type: str, inputs: dict) -> str:
+    """Stable hash of the inputs and the grading scale they are evaluated with."""
+    payload = json.dumps([scenario_type, inputs, get_compiled_scale().version], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def compute_scenario(student_id: int, scenario_type: str, inputs: dict) -> dict:
+    if scenario_type == 'gpa':
+        summary = inputs.get('current_summary')
+        if summary is None:
+            gpa = calculate_student_gpa(student_id)
+            summary = {"cumulative_gpa": gpa.get('cumulative_gpa', 0), "total_credits": gpa.get('total_credits', 0)}
+        return calculate_gpa_forecast(summary, inputs['hypothetical_courses'], inputs.get('target_gpa'))
+    return calculate_course_grade_forecast(inputs['assessments'], inputs.get('target_grade'))
+
+
+def _target(scenario_type, inputs):
+    return inputs.get('target_gpa') if scenario_type == 'gpa' else inputs.get('target_grade')
+
+
+def _predicted_gpa(scenario_type, result):
+    return result['projected']['cumulative_gpa'] if scenario_type == 'gpa' else None
+
+
+def _serialize(row, inputs=None, result=None, recomputed=False):
+    scenario = {
+        "scenario_id": row['scenario_id'],
+        "name": row['scenario_name'],
+        "type": row['scenario_type'],
+        "course_id": row['course_id'],
+        "target": float(row['desired_grades']) if row['desired_grades'] is not None else None,
+        "predicted_gpa": float(row['predicted_gpa']) if row['predicted_gpa'] is not None else None,
+        "stale": row['grades_version'] != row['current_version'],
+        "created_at": row['created_at'],
+        "updated_at": row['updated_at']
+    }
+    if inputs is not None:
+        scenario.update(inputs=inputs, result=result, recomputed=recomputed, stale=False)
+    return scenario
+
+
+def list_scenarios(student_id: int) -> list:
+    """Saved scenarios without their inputs/results; stale ones are flagged."""
+    return [_serialize(row) for row in query_db(LIST_QUERY, (student_id,))]
+
+
+def save_scenario(student_id: int, name: str, scenario_type: str, data: dict, course_id: int = None) -> dict:
+    """
+    Create or replace the student's scenario called name. The forecast is
+    only recomputed if the inputs or the student's grades changed since it
+    was last stored.
+    """
+    name = (name or '').strip()
+    if not name or len(name) > 100:
+        raise ScenarioError("name is required (at most 100 characters)")
+    inputs = normalize_inputs(scenario_type, data)
+    digest = inputs_hash(scenario_type, inputs)
+
+    with transaction() as tx:
+        version = tx.query('SELECT grades_version FROM "USER" WHERE user_id = ?',
+                           (student_id,), one=True)['grades_version']
+        existing = tx.query(
+            '''SELECT scenario_id, scenario_type, inputs_hash, grades_version, result
+               FROM "WHATIFSCENARIO" WHERE student_id = ? AND scenario_name = ?
+               ORDER BY scenario_id LIMIT 1''',
+            (student_id, name), one=True
+        )
+        reusable = (existing is not None and existing['inputs_hash'] == digest
+                    and existing['grades_version'] == version and existing['result'])
+        result = json.loads(existing['result']) if reusable else compute_scenario(student_id, scenario_type, inputs)
+
+        values = (scenario_type, json.dumps(inputs), digest, version, flask_json.dumps(result),
+                  _target(scenario_type, inputs), _predicted_gpa(scenario_type, result), course_id)
+        if existing is None:
+            sql = '''INSERT INTO "WHATIFSCENARIO"
+                     (scenario_type, inputs, inputs_hash, grades_version, result,
+                      desired_grades, predicted_gpa, course_id, scenario_name, student_id)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+            if is_postgres():
+                sql += ' RETURNING scenario_id'
+            scenario_id = tx.execute(sql, values + (name, student_id))
+        else:
+            scenario_id = existing['scenario_id']
+            tx.execute(
+                '''UPDATE "WHATIFSCENARIO"
+                   SET scenario_type = ?, inputs = ?, inputs_hash = ?, grades_version = ?, result = ?,
+                       desired_grades = ?, predicted_gpa = ?, course_id = ?, updated_at = CURRENT_TIMESTAMP
+                   WHERE scenario_id = ?''',
+                values + (scenario_id,)
+            )
+        row = tx.query(LOAD_QUERY, (scenario_id, student_id), one=True)
+
+    return _serialize(row, inputs, result, recomputed=not reusable)
+
+
+def load_scenario(student_id: int, scenario_id: int) -> dict:
+    """
+    A saved scenario with its forecast, or None if it doesn't exist. The
+    stored result is returned as-is unless the student's grades or the
+    grading scale changed, in which case it is recomputed and stored.
+    """
+    row = query_db(LOAD_QUERY, (scenario_id, student_id), one=True)
+    if row is None:
+        return None
+    inputs = json.loads(row['inputs']) if row['inputs'] else None
+    if inputs is None:
+        # Rows from before scenarios stored their inputs can't be evaluated
+        return _serialize(row)
+
+    scenario_type = row['scenario_type']
+    digest = inputs_hash(scenario_type, inputs)
+    if row['result'] and row['inputs_hash'] == digest and row['grades_version'] == row['current_version']:
+        return _serialize(row, inputs, json.loads(row['result']))
+
+    result = compute_scenario(student_id, scenario_type, inputs)
+    with transaction() as tx:
+        tx.execute(
+            '''UPDATE "WHATIFSCENARIO"
+               SET inputs_hash = ?, grades_version = ?, result = ?, predicted_gpa = ?,
+                   updated_at = CURRENT_TIMESTAMP
+               WHERE scenario_id = ?''',
+            (digest, row['current_version'], flask_json.dumps(result), _predicted_gpa(scenario_type, result), scenario_id)
+        )
+        row = tx.query(LOAD_QUERY, (scenario_id, student_id), one=True)
+    return _serialize(row, inputs, result, recomputed=True)
+
+
+def delete_scenario(student_id: int, scenario_id: int) -> bool:
+    with transaction() as tx:
+        found = tx.query('SELECT 1 AS found FROM "WHATIFSCENARIO" WHERE scenario_id = ? AND student_id = ?',
+                         (scenario_id, student_id), one=True)
+        if found:
+            tx.execute('DELETE FROM "WHATIFSCENARIO" WHERE scenario_id = ?', (scenario_id,))
+    return found is not None
@@ -0,0 +1,129 @@
+# Student Directory
+# Paginated, filterable student listing for the admin dashboard.
+# Pages are fetched with keyset pagination: the cursor carries the sort value
+# and user_id of the last row, so every page is an index range scan on
+# (user_type, sort column, user_id) no matter how deep the admin scrolls.
+import base64
+import json
+
+from backend.database import query_db, is_postgres
+
+# sort parameter -> column; prefix with '-' for descending order
+SORT_COLUMNS = {
+    "user_id": "user_id",
+    "lastname": "lastname",
+    "email": "email",
+}
+
+# Python type of each sort column's values, checked when a cursor is decoded
+SORT_TYPES = {
+    "user_id": int,
+    "lastname": str,
+    "email": str,
+}
+
+STUDENT_COLUMNS = 'user_id, firstname, lastname, email'
+
+
+def encode_cursor(sort: str, row: dict) -> str:
+    column = SORT_COLUMNS[sort.lstrip('-')]
+    payload = json.dumps([sort, row[column], row['user_id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str):
+    """Return (sort value, user_id) from a cursor made for the same sort order."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, value, user_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or not isinstance(user_id, int) or isinstance(user_id, bool):
+        raise ValueError("Cursor does not match the requested sort order")
+    expected = SORT_TYPES.get(sort.lstrip('-'))
+    if expected is None or not isinstance(value, expected) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return value, user_id
+
+
+def _like_pattern(search: str) -> str:
+    """Substring pattern with LIKE wildcards in the search term escaped."""
+    escaped = search.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _filters(search: str):
+    clauses = ["user_type = 'Student'"]
+    args = []
+    if search:
+        pattern = _like_pattern(search)
+        clauses.append("(LOWER(firstname) LIKE ? ESCAPE '\\' OR LOWER(lastname) LIKE ? ESCAPE '\\' "
+                       "OR LOWER(email) LIKE ? ESCAPE '\\')")
+        args += [pattern, pattern, pattern]
+    return clauses, args
+
+
+def count_students(search: str = None) -> tuple:
+    """
+    Number of students matching the filter as (count, is_estimate).
+    PostgreSQL uses the planner's row estimate instead of scanning the table;
+    SQLite counts exactly.
+    """
+    clauses, args = _filters(search)
+    where = ' AND '.join(clauses)
+    if is_postgres():
+        row = query_db(f'EXPLAIN (FORMAT JSON) SELECT 1 FROM "USER" WHERE {where}', tuple(args), one=True)
+        plan = row['QUERY PLAN']
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows']), True
+    row = query_db(f'SELECT COUNT(*) AS total FROM "USER" WHERE {where}', tuple(args), one=True)
+    return row['total'], False
+
+
+def list_students_page(limit: int, cursor: str = None, sort: str = 'user_id',
+                       search: str = None, include_total: bool = False) -> dict:
+    """
+    One page of students in `sort` order, starting after `cursor`.
+
+    Returns:
+        dict with students, next_cursor (None on the last page), limit, sort
+        and, when include_total is set, total and total_is_estimate.
+    Raises:
+        ValueError for an unknown sort or a malformed cursor
+    """
+    descending = sort.startswith('-')
+    if sort.lstrip('-') not in SORT_COLUMNS:
+        raise ValueError(f"Unknown sort '{sort}'. Use one of: {', '.join(SORT_COLUMNS)}")
+    column = SORT_COLUMNS[sort.lstrip('-')]
+    direction, comparison = ('DESC', '<') if descending else ('ASC', '>')
+
+    clauses, args = _filters(search)
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if column == 'user_id':
+            clauses.append(f'user_id {comparison} ?')
+            args.append(last_id)
+        else:
+            clauses.append(f'({column} {comparison} ? OR ({column} = ? AND user_id {comparison} ?))')
+            args += [value, value, last_id]
+
+    order = f'user_id {direction}' if column == 'user_id' else f'{column} {direction}, user_id {direction}'
+    rows = query_db(
+        f'''SELECT {STUDENT_COLUMNS} FROM "USER"
+            WHERE {' AND '.join(clauses)}
+            ORDER BY {order}
+            LIMIT ?''',
+        tuple(args) + (limit + 1,)
+    )
+
+    students = [dict(r) for r in rows[:limit]]
+    page = {
+        "students": students,
+        "next_cursor": encode_cursor(sort, students[-1]) if len(rows) > limit else None,
+        "limit": limit,
+        "sort": sort
+    }
+    if include_total:
+        page["total"], page["total_is_estimate"] = count_students(search)
+    return page
@@ -0,0 +1,102 @@
+# Student Statistics
+# Per-student assessment statistics aggregated in SQL, so the work done in
+# Python scales with the number of (type, semester) groups rather than the
+# number of graded assessments.
+from backend.database import query_db
+from backend.services.config_service import semester_sort_key
+
+
+# Each graded assessment is tagged with the half of its type's history it
+# falls in (by assessment_id, i.e. entry order) so trend factors can be
+# derived from the grouped rows. Window functions run on SQLite >= 3.25
+# and PostgreSQL alike.
+GROUPED_STATS_QUERY = '''
+    SELECT assessment_type, semester, trend_half,
+           COUNT(*) AS n, SUM(pct) AS total, SUM(pct * pct) AS total_sq
+    FROM (
+        SELECT a.assessment_type, c.semester,
+               CASE WHEN a.marks > 0 THEN (a.earned_marks * 1.0 / a.marks) * 100 ELSE 0 END AS pct,
+               CASE WHEN ROW_NUMBER() OVER (PARTITION BY a.assessment_type ORDER BY a.assessment_id)
+                         <= COUNT(*) OVER (PARTITION BY a.assessment_type) / 2
+                    THEN 0 ELSE 1 END AS trend_half
+        FROM "ASSESSMENT" a
+        JOIN "COURSE" c ON a.course_id = c.course_id
+        WHERE a.student_id = ? AND a.earned_marks IS NOT NULL
+    ) graded
+    GROUP BY assessment_type, semester, trend_half
+    ORDER BY semester, assessment_type, trend_half
+'''
+
+
+def _group():
+    return {"count": 0, "sum": 0.0, "sum_sq": 0.0}
+
+
+def _add(group, count, total, total_sq):
+    group["count"] += count
+    group["sum"] += total
+    group["sum_sq"] += total_sq
+
+
+def _finish(group):
+    count = group["count"]
+    group["mean"] = group["sum"] / count if count else None
+    # Sample standard deviation; None until there are two values
+    group["std"] = (
+        max(group["sum_sq"] - group["sum"] ** 2 / count, 0.0) / (count - 1)
+    ) ** 0.5 if count >= 2 else None
+    return group
+
+
+def get_student_stats(student_id: int) -> dict:
+    """
+    Counts, sums and means of graded assessment percentages for a student.
+
+    Returns:
+        dict with
+            total: number of graded assessments
+            overall: {count, sum, sum_sq, mean, std} over every assessment
+            by_type: type -> {count, sum, sum_sq, mean, std, halves: [first, second]}
+            by_semester: semester -> {count, sum, sum_sq, mean, std, by_type: {type -> {...}}}
+        Semesters are in chronological order; each type's halves split its
+        assessments in entry order for trend calculations.
+    """
+    rows = query_db(GROUPED_STATS_QUERY, (student_id,))
+
+    by_type = {}
+    by_semester = {}
+    overall = _group()
+    total = 0
+    for row in rows:
+        count = row['n']
+        row_sum = float(row['total'] or 0)
+        row_sum_sq = float(row['total_sq'] or 0)
+        assessment_type = row['assessment_type']
+        semester = row['semester']
+        total += count
+        _add(overall, count, row_sum, row_sum_sq)
+
+        type_group = by_type.setdefault(assessment_type, {**_group(), "halves": [_group(), _group()]})
+        _add(type_group, count, row_sum, row_sum_sq)
+        _add(type_group["halves"][row['trend_half']], count, row_sum, row_sum_sq)
+
+        sem_group = by_semester.setdefault(semester, {**_group(), "by_type": {}})
+        _add(sem_group, count, row_sum, row_sum_sq)
+        _add(sem_group["by_type"].setdefault(assessment_type, _group()), count, row_sum, row_sum_sq)
+
+    for type_group in by_type.values():
+        _finish(type_group)
+        for half in type_group["halves"]:
+            _finish(half)
+    semesters = sorted(by_semester, key=semester_sort_key)
+    for semester in semesters:
+        sem_group = _finish(by_semester[semester])
+        for type_group in sem_group["by_type"].values():
+            _finish(type_group)
+
+    return {
+        "total": total,
+        "overall": _finish(overall),
+        "by_type": by_type,
+        "by_semester": {semester: by_semester[semester] for semester in semesters}
+    }
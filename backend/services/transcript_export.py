@@ -0,0 +1,76 @@
+# Transcript Export
+# Streams courses and assessments as CSV or NDJSON, one line per assessment
+# (courses without assessments get one line with empty assessment fields).
+# Rows are read in batches from a streaming cursor and written out as they
+# arrive, so memory stays flat and the header goes out before the query runs.
+import csv
+import decimal
+import io
+
+from flask import json
+
+from backend.database import stream_query
+
+EXPORT_COLUMNS = (
+    'student_id', 'firstname', 'lastname', 'email',
+    'course_id', 'course_code', 'course_name', 'credit_hours', 'semester',
+    'assessment_id', 'assessment_name', 'assessment_type', 'weight', 'marks', 'earned_marks'
+)
+
+EXPORT_QUERY = '''
+    SELECT u.user_id AS student_id, u.firstname, u.lastname, u.email,
+           c.course_id, c.course_code, c.course_name, c.credit_hours, c.semester,
+           a.assessment_id, a.name AS assessment_name, a.assessment_type,
+           a.weight, a.marks, a.earned_marks
+    FROM "USER" u
+    JOIN "COURSE" c ON c.student_id = u.user_id
+    LEFT JOIN "ASSESSMENT" a ON a.course_id = c.course_id
+    WHERE u.user_type = 'Student' {where}
+    ORDER BY u.user_id, c.course_id, a.assessment_id
+'''
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _csv_lines(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue()
+
+
+def _value(value):
+    return float(value) if isinstance(value, decimal.Decimal) else value
+
+
+def _ndjson_lines(batches):
+    for rows in batches:
+        yield ''.join(
+            json.dumps({column: _value(row[column]) for column in EXPORT_COLUMNS}) + '\n'
+            for row in rows
+        )
+
+
+def export_transcripts(fmt: str, student_id: int = None):
+    """
+    Generator of text chunks for one student's transcript, or every
+    student's when student_id is None. fmt is a key of FORMATS.
+    """
+    if student_id is None:
+        batches = stream_query(EXPORT_QUERY.format(where=''))
+    else:
+        batches = stream_query(EXPORT_QUERY.format(where='AND u.user_id = ?'), (student_id,))
+    lines = _csv_lines(batches) if fmt == 'csv' else _ndjson_lines(batches)
+    try:
+        yield from lines
+    finally:
+        # Hand the connection back even if the client disconnects mid-export
+        batches.close()
@@ -0,0 +1,69 @@
+# Validation
+# Field-level checks for course and assessment input shared by the write
+# paths that accept many rows at once (bulk import, assessment batches).
+# Each validator returns the cleaned values as a tuple in column order
+# together with a list of (field, message) problems.
+import math
+
+
+def _text(raw, field, errors, max_length, required=True):
+    value = raw.get(field)
+    value = str(value).strip() if value is not None else ''
+    if not value:
+        if required:
+            errors.append((field, "is required"))
+        return None
+    if len(value) > max_length:
+        errors.append((field, f"must be at most {max_length} characters"))
+        return None
+    return value
+
+
+def _number(raw, field, errors, minimum=None, maximum=None, required=True, decimals=None):
+    value = raw.get(field)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            errors.append((field, "is required"))
+        return None
+    if isinstance(value, bool):
+        errors.append((field, "must be a number"))
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        errors.append((field, "must be a number"))
+        return None
+    if not math.isfinite(number):
+        errors.append((field, "must be a finite number"))
+        return None
+    if decimals is not None:
+        if abs(round(number, decimals) - number) > 1e-9:
+            errors.append((field, f"must have at most {decimals} decimal place{'s' if decimals != 1 else ''}"))
+            return None
+        number = round(number, decimals)
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        errors.append((field, f"must be between {minimum} and {maximum}"))
+        return None
+    return number
+
+
+def validate_course(raw: dict) -> tuple:
+    """Return (course tuple without student_id, [(field, message)])."""
+    errors = []
+    code = _text(raw, 'course_code', errors, 20)
+    name = _text(raw, 'course_name', errors, 100, required=False) or code
+    # COURSE.credit_hours is DECIMAL(3,1)
+    credits = _number(raw, 'credit_hours', errors, minimum=0, maximum=20, decimals=1)
+    semester = _text(raw, 'semester', errors, 20)
+    return (code, name, credits, semester), errors
+
+
+def validate_assessment(raw: dict) -> tuple:
+    """Return (assessment tuple without student/course ids, [(field, message)])."""
+    errors = []
+    name = _text(raw, 'name', errors, 100)
+    assessment_type = _text(raw, 'assessment_type', errors, 20)
+    weight = _number(raw, 'weight', errors, minimum=0, maximum=100)
+    marks = _number(raw, 'marks', errors, minimum=0.01, maximum=9999)
+    earned = _number(raw, 'earned_marks', errors, minimum=0, maximum=9999, required=False)
+    return (name, assessment_type, weight, marks, earned), errors
@@ -0,0 +1,118 @@
+# Weather Service
+# Current campus weather from Open-Meteo, shared by the weather routes.
+# Responses are cached per location for WEATHER_CACHE_TTL seconds. Once a
+# value is stale it is still served immediately while one background thread
+# refreshes it (stale-while-revalidate), and concurrent misses for the same
+# location share a single upstream request, so a slow upstream never holds
+# more than one worker thread.
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherService:
+    """TTL cache in front of the Open-Meteo current_weather API."""
+
+    def __init__(self, base_url, ttl=600.0, timeout=3.0, max_stale=3600.0, retry_interval=30.0):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_stale = max_stale
+        self.retry_interval = retry_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._entries = {}   # (lat, lon) -> (fetched_at, current_weather)
+        self._inflight = {}  # (lat, lon) -> threading.Event set when the fetch finishes
+        self._failed_at = {}  # (lat, lon) -> monotonic time of the last failed fetch
+
+    def _fetch(self, key):
+        latitude, longitude = key
+        try:
+            response = self.session.get(self.base_url, params={
+                "latitude": latitude, "longitude": longitude, "current_weather": "true"
+            }, timeout=self.timeout)
+            response.raise_for_status()
+            current = response.json()['current_weather']
+        except Exception as e:
+            logger.warning(f"Weather API error for {key}: {e}")
+            with self._lock:
+                self._failed_at[key] = time.monotonic()
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), current)
+            self._failed_at.pop(key, None)
+
+    def _run_fetch(self, key, done):
+        try:
+            self._fetch(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def _start_fetch(self, key):
+        """Return (event, started) where started is True if this caller owns the fetch. Call with the lock held."""
+        done = self._inflight.get(key)
+        if done is not None:
+            return done, False
+        done = self._inflight[key] = threading.Event()
+        return done, True
+
+    def get_current(self, latitude: float, longitude: float):
+        """
+        Latest current_weather dict for a location, or None when no value
+        has ever been fetched and the upstream is unavailable.
+        """
+        key = (round(latitude, 4), round(longitude, 4))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry[0] if entry else None
+            if entry and age < self.ttl:
+                return entry[1]
+            failed_recently = now - self._failed_at.get(key, float('-inf')) < self.retry_interval
+            if entry and (age < self.max_stale or failed_recently):
+                # Serve the last good value; refresh it in the background
+                if not failed_recently:
+                    done, owner = self._start_fetch(key)
+                    if owner:
+                        threading.Thread(target=self._run_fetch, args=(key, done), daemon=True).start()
+                return entry[1]
+            if failed_recently:
+                return None
+            done, owner = self._start_fetch(key)
+
+        if owner:
+            self._run_fetch(key, done)
+        else:
+            done.wait(self.timeout)
+
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failed_at.clear()
+
+
+weather_service = WeatherService(
+    config.WEATHER_API_URL,
+    ttl=config.WEATHER_CACHE_TTL,
+    timeout=config.WEATHER_TIMEOUT,
+    max_stale=config.WEATHER_MAX_STALE,
+    retry_interval=config.WEATHER_RETRY_INTERVAL
+)
@@ -1,12 +1,47 @@
 import unittest
 import sys
 import os
+import json
+import time
 
 # Add backend to path so imports work
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.app import app
-from backend.database import get_db_connection
+from backend.database import get_db_connection, execute_db, query_db
+from backend.profiler import query_budget
+
+
+def create_student_with_grades(courses):
+    """
+    Insert a throwaway student. courses is a list of
+    (code, credits, semester, [(weight, marks, earned_marks), ...]).
+    """
+    student_id = execute_db(
+        '''INSERT INTO "USER" (firstname, lastname, email, password, user_type)
+           VALUES (?, ?, ?, ?, 'Student')''',
+        ('Fixture', 'Student', f'fixture-{os.getpid()}-{id(courses)}@test.com', 'x')
+    )
+    for code, credits, semester, assessments in courses:
+        course_id = execute_db(
+            '''INSERT INTO "COURSE" (course_code, course_name, credit_hours, semester, student_id)
+               VALUES (?, ?, ?, ?, ?)''',
+            (code, code, credits, semester, student_id)
+        )
+        for weight, marks, earned in assessments:
+            execute_db(
+                '''INSERT INTO "ASSESSMENT" (name, assessment_type, weight, marks, earned_marks, student_id, course_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                ('Item', 'Quiz', weight, marks, earned, student_id, course_id)
+            )
+    return student_id
+
+
+def delete_student(student_id):
+    execute_db('DELETE FROM "GPAREPORT" WHERE student_id = ?', (student_id,))
+    execute_db('DELETE FROM "ASSESSMENT" WHERE student_id = ?', (student_id,))
+    execute_db('DELETE FROM "COURSE" WHERE student_id = ?', (student_id,))
+    execute_db('DELETE FROM "USER" WHERE user_id = ?', (student_id,))
 
 class BasicTests(unittest.TestCase):
     def setUp(self):
@@ -35,5 +70,976 @@ class BasicTests(unittest.TestCase):
         self.assertIsInstance(data, list)
         self.assertTrue(any(d['letter_grade'] == 'A' for d in data))
 
+    def test_config_conditional_get(self):
+        for path in ('/api/config/grading-scale', '/api/config/assessment-types', '/api/config/semesters'):
+            first = self.app.get(path)
+            etag = first.headers['ETag']
+            self.assertIn('max-age=', first.headers['Cache-Control'])
+            with query_budget(0):
+                second = self.app.get(path, headers={'If-None-Match': etag})
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second.headers['ETag'], etag)
+            self.assertEqual(self.app.get(path, headers={'If-None-Match': '"stale"'}).status_code, 200)
+
+class GpaCalculationTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([
+            ('CS101', 3, 'Fall 2025', [(50, 100, 90), (50, 100, 80)]),   # 85 -> A
+            ('MA101', 4, 'Fall 2025', [(40, 50, 35), (60, 100, None)]),  # 70 -> B-
+            ('EN101', 3, 'Spring 2026', []),                              # no assessments
+        ])
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def test_calculate_gpa(self):
+        data = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+        self.assertEqual(data['total_credits'], 7)
+        self.assertEqual(data['cumulative_gpa'], round((4.0 * 3 + 2.7 * 4) / 7, 2))
+        self.assertEqual([c['course_code'] for c in data['course_grades']], ['CS101', 'MA101'])
+
+    def test_breakdown(self):
+        data = self.app.get(f'/api/gpa/{self.student_id}/breakdown').json
+        self.assertEqual([s['semester'] for s in data['semesters']], ['Fall 2025', 'Spring 2026'])
+        self.assertEqual(data['semesters'][1]['courses'][0]['grade'], 0)
+        self.assertEqual(data['total_credits'], 7)
+
+    def test_cached_gpa_invalidated_by_writes(self):
+        from backend.services.gpa_cache import gpa_cache
+        before = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+        hits = gpa_cache.stats()['hits']
+        self.assertEqual(self.app.get(f'/api/calculate-gpa/{self.student_id}').json, before)
+        self.assertEqual(gpa_cache.stats()['hits'], hits + 1)
+
+        course_id = self.app.get(f'/api/courses/{self.student_id}').json[2]['course_id']
+        self.app.post('/api/add-assessment', json={
+            "name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+            "earned_marks": 95, "student_id": self.student_id, "course_id": course_id
+        })
+        after = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+        self.assertEqual(after['total_credits'], 10)
+
+    def test_cache_in_another_worker_sees_writes(self):
+        from unittest import mock
+        from backend.services.gpa_cache import GpaResultCache
+        # A second worker's cache: the write below only invalidates this process's one
+        other_worker = GpaResultCache()
+        with mock.patch('backend.services.gpa_service.gpa_cache', other_worker):
+            before = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+            self.assertEqual(self.app.get(f'/api/calculate-gpa/{self.student_id}').json, before)
+            self.assertEqual(other_worker.stats()['hits'], 1)
+
+        course_id = self.app.get(f'/api/courses/{self.student_id}').json[2]['course_id']
+        self.app.post('/api/add-assessment', json={
+            "name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+            "earned_marks": 95, "student_id": self.student_id, "course_id": course_id
+        })
+        with mock.patch('backend.services.gpa_service.gpa_cache', other_worker):
+            after = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+        self.assertEqual(after['total_credits'], 10)
+        self.assertEqual(other_worker.stats()['stale'], 1)
+
+
+    def test_gpa_history_appends_on_change(self):
+        from backend.services.gpa_history import backfill_gpa_history
+        backfill_gpa_history()
+        history = self.app.get(f'/api/gpa/{self.student_id}/history').json['history']
+        self.assertEqual([h['semester'] for h in history], ['Fall 2025'])
+
+        # Re-running the backfill is a no-op for an up-to-date student
+        backfill_gpa_history()
+        self.assertEqual(len(self.app.get(f'/api/gpa/{self.student_id}/history').json['history']), 1)
+
+        course_id = self.app.get(f'/api/courses/{self.student_id}').json[2]['course_id']
+        self.app.post('/api/add-assessment', json={
+            "name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+            "earned_marks": 60, "student_id": self.student_id, "course_id": course_id
+        })
+        history = self.app.get(f'/api/gpa/{self.student_id}/history').json['history']
+        self.assertEqual(history[-1]['semester'], 'Spring 2026')
+        self.assertEqual(history[-1]['semester_gpa'], 1.7)
+
+
+    def test_dashboard_bundle(self):
+        data = self.app.get(f'/api/students/{self.student_id}/dashboard').json
+        self.assertEqual(data['gpa'], self.app.get(f'/api/calculate-gpa/{self.student_id}').json)
+        self.assertEqual(len(data['courses']), 3)
+        self.assertEqual(data['total_credits'], 10)
+        self.assertEqual([s['semester'] for s in data['semester_gpas']], ['Fall 2025', 'Spring 2026'])
+        self.assertEqual(data['assessment_trends']['Quiz'],
+                         [{"semester": "Fall 2025", "averageScore": 80.0, "count": 3}])
+
+    def test_dashboard_query_budget(self):
+        self.app.get('/api/config/grading-scale')  # warm the compiled scale
+        with query_budget(1):
+            self.app.get(f'/api/students/{self.student_id}/dashboard')
+
+
+    def test_cohort_gpa_summary_matches_per_student(self):
+        from backend.services.cohort_gpa import compute_cohort_gpa
+        data = self.app.get('/api/admin/gpa-summary').json
+        row = next(s for s in data['students'] if s['student_id'] == self.student_id)
+        gpa = self.app.get(f'/api/calculate-gpa/{self.student_id}').json
+        self.assertEqual(row['cumulative_gpa'], gpa['cumulative_gpa'])
+        self.assertEqual(row['total_credits'], gpa['total_credits'])
+        self.assertEqual(row['semesters'], [{"semester": "Fall 2025", "gpa": gpa["cumulative_gpa"], "credits": 7}])
+        self.assertEqual(sum(data['histograms']['cumulative_gpa']['counts']),
+                         sum(1 for s in data['students'] if s['total_credits'] > 0))
+
+        # Splitting the cohort across processes gives the same answer
+        self.assertEqual(compute_cohort_gpa(workers=2)['students'], data['students'])
+
+    def test_historical_performance_and_timeline(self):
+        data = self.app.get(f'/api/students/{self.student_id}/historical-performance').json
+        self.assertEqual(data['component_averages'], {'Quiz': 80.0})
+        self.assertEqual(data['component_trend_factors'], {'Quiz': round(75 / 90, 3)})
+        self.assertEqual(data['data_quality']['total_assessments'], 3)
+
+        timeline = self.app.get(f'/api/students/{self.student_id}/semester-timeline').json['timeline']
+        self.assertEqual(timeline, [{
+            "semester": "Fall 2025", "assessment_averages": {"Quiz": 80.0}, "overall_average": 80.0
+        }])
+
+
+class QueryPlanTests(unittest.TestCase):
+    """Every per-student query must be served by an index, never a full scan."""
+
+    # Small static configuration tables are allowed to be scanned. Anything
+    # else reported as SCAN (including "SCAN t USING [COVERING] INDEX", which
+    # still walks the whole index) fails; only SEARCH is index-driven.
+    SCAN_ALLOWED = {'GRADINGSCALE', 'ASSESSMENT_TYPE'}
+
+    def setUp(self):
+        from backend.database import is_postgres
+        if is_postgres():
+            self.skipTest("Query plan checks run against SQLite")
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([
+            ('CS101', 3, 'Fall 2025', [(50, 100, 90), (50, 100, None)]),
+            ('MA101', 4, 'Spring 2026', [(100, 100, 75)]),
+        ])
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def _capture_statements(self, requests):
+        from backend.services.gpa_cache import gpa_cache
+        gpa_cache.clear()
+        conn = get_db_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            for method, url, body in requests:
+                response = self.app.open(url, method=method, json=body)
+                self.assertLess(response.status_code, 400, url)
+        finally:
+            conn.set_trace_callback(None)
+        return conn, [s for s in statements
+                      if s.lstrip().split(' ', 1)[0].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE')]
+
+    def test_per_student_queries_use_indexes(self):
+        sid = self.student_id
+        course_id = self.app.get(f'/api/courses/{sid}').json[0]['course_id']
+        conn, statements = self._capture_statements([
+            ('GET', f'/api/calculate-gpa/{sid}', None),
+            ('GET', f'/api/gpa/{sid}/breakdown', None),
+            ('GET', f'/api/gpa/{sid}/history', None),
+            ('GET', f'/api/courses/{sid}', None),
+            ('GET', f'/api/course/{course_id}', None),
+            ('PUT', f'/api/update-course/{course_id}', {
+                "course_code": "CS101", "course_name": "CS101", "credit_hours": 3, "semester": "Fall 2025"}),
+            ('GET', f'/api/students/{sid}/profile', None),
+            ('GET', f'/api/students/{sid}/dashboard', None),
+            ('GET', f'/api/students/{sid}/historical-performance', None),
+            ('GET', f'/api/students/{sid}/semester-timeline', None),
+            ('DELETE', f'/api/delete-course/{course_id}', None),
+        ])
+        self._assert_indexed(conn, statements)
+
+    def test_student_pages_use_indexes(self):
+        first = self.app.get('/api/admin/students?limit=1&sort=-lastname').json
+        conn, statements = self._capture_statements([
+            ('GET', '/api/admin/students?limit=1', None),
+            ('GET', f"/api/admin/students?limit=1&sort=-lastname&cursor={first['next_cursor']}", None),
+            ('GET', '/api/admin/students?limit=1&sort=email&q=fixture', None),
+        ])
+        self._assert_indexed(conn, statements)
+
+    def _assert_indexed(self, conn, statements):
+        self.assertTrue(statements)
+        for statement in statements:
+            plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + statement)]
+            subqueries = {line.split(' ', 1)[1] for line in plan
+                          if line.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+            for line in plan:
+                if not line.startswith('SCAN '):
+                    continue
+                target = line.split(' ')[1]
+                if target in subqueries or target.strip('"') in self.SCAN_ALLOWED:
+                    continue
+                self.fail(f"Full scan ({line}) in query: {' '.join(statement.split())}")
+
+
+class GradingScaleTests(unittest.TestCase):
+    def test_lookup_closes_gaps_between_bands(self):
+        from backend.services.grading_scale import get_compiled_scale
+        scale = get_compiled_scale()
+        self.assertEqual(scale.letter_for(89.995), 'A')
+        self.assertEqual(scale.letter_for(90.0), 'A+')
+        self.assertEqual(scale.letter_for(49.999), 'F')
+        self.assertEqual(float(scale.gpa_for(72.995)), 2.7)
+        self.assertEqual(scale.letter_for(104), 'A+')
+
+
+class ForecastTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+
+    def test_batch_scenarios_match_single_scenario(self):
+        courses = [{"code": "CS1", "credits": 3}, {"code": "CS2", "credits": 4}]
+        summary = {"cumulative_gpa": 3.0, "total_credits": 30}
+        grades = [[92, 71], [85, None], [40, 89.995]]
+        batch = self.app.post('/api/forecast/gpa', json={
+            "current_summary": summary, "hypothetical_courses": courses,
+            "scenarios": grades, "target_gpa": 3.1
+        }).json
+        self.assertEqual(batch['scenario_count'], 3)
+        for row, projected in zip(grades, batch['projected_cumulative_gpa']):
+            single = self.app.post('/api/forecast/gpa', json={
+                "current_summary": summary,
+                "hypothetical_courses": [dict(c, hypothetical=g) for c, g in zip(courses, row)]
+            }).json
+            self.assertEqual(single['projected']['cumulative_gpa'], projected)
+        self.assertEqual(batch['gpa_matrix'][1], [4.0, 0.0])
+
+    def test_target_minimums_follow_grading_scale_steps(self):
+        result = self.app.post('/api/forecast/gpa', json={
+            "current_summary": {"cumulative_gpa": 3.0, "total_credits": 30},
+            "hypothetical_courses": [{"code": "CS1", "credits": 3}, {"code": "CS2", "credits": 4},
+                                     {"code": "CS3", "credits": 3, "hypothetical": 75}],
+            "target_gpa": 3.1
+        }).json
+        analysis = result['target_analysis']
+        self.assertEqual(analysis['status'], "Possible")
+        minimums = analysis['course_minimums']
+        # Every minimum is a band's lower bound and together they reach the target
+        boundaries = [float(b['min_score']) for b in self.app.get('/api/config/grading-scale').json]
+        self.assertTrue(all(m['minimum_percent'] in boundaries for m in minimums))
+        points = 3.0 * 30 + 3.0 * 3 + sum(m['gpa'] * m['credits'] for m in minimums)
+        self.assertGreaterEqual(points / 40, 3.1 - 1e-9)
+        self.assertEqual([c['minimum_required'] for c in result['courses']],
+                         [f"{m['minimum_percent']:.2f}" for m in minimums[:2]] + ["-"])
+
+        impossible = self.app.post('/api/forecast/gpa', json={
+            "current_summary": {"cumulative_gpa": 2.0, "total_credits": 60},
+            "hypothetical_courses": [{"code": "CS1", "credits": 3}], "target_gpa": 3.9
+        }).json
+        self.assertEqual(impossible['target_analysis']['status'], "Impossible")
+
+    def test_monte_carlo_uses_student_history(self):
+        student_id = create_student_with_grades([('CS101', 3, 'Fall 2025', [(50, 100, 90), (50, 100, 94)])])
+        try:
+            body = {"student_id": student_id, "mode": "monte_carlo", "seed": 7, "target_grade": 80,
+                    "assessments": [{"name": "A1", "weight": 50, "mark": 90},
+                                    {"name": "Quiz", "type": "Quiz", "weight": 50}]}
+            result = self.app.post('/api/forecast/course-grade', json=body).json['monte_carlo']
+            self.assertEqual(result['distribution_source'], "history")
+            self.assertEqual(result['simulations'], 100000)
+            bands = [band['value'] for band in result['percentiles']]
+            self.assertEqual(bands, sorted(bands))
+            # History averages 92%, so 45 + 0.5 * sample is centred near 91
+            self.assertAlmostEqual(bands[2], 91, delta=0.5)
+            self.assertGreater(result['probability_of_target'], 0.95)
+            self.assertEqual(self.app.post('/api/forecast/course-grade', json=body).json['monte_carlo'], result)
+
+            gpa = self.app.post('/api/forecast/gpa', json={
+                "student_id": student_id, "mode": "monte_carlo", "simulations": 20000, "target_gpa": 3.5,
+                "hypothetical_courses": [{"code": "CS2", "credits": 3}, {"code": "CS3", "credits": 3,
+                                                                       "hypothetical": 95}]
+            }).json['monte_carlo']
+            self.assertTrue(0 < gpa['probability_of_target'] <= 1)
+            self.assertLessEqual(gpa['percentiles'][-1]['value'], 4.0)
+        finally:
+            delete_student(student_id)
+        response = self.app.post('/api/forecast/gpa', json={"mode": "monte_carlo", "simulations": 10 ** 9})
+        self.assertEqual(response.status_code, 400)
+
+    def test_monte_carlo_rejects_bad_options_and_oversized_draws(self):
+        courses = [{"code": "CS1", "credits": 3}]
+        for options in ({"simulations": True}, {"seed": -1}, {"seed": True}, {"seed": 1.5}):
+            response = self.app.post('/api/forecast/gpa', json={
+                "mode": "monte_carlo", "hypothetical_courses": courses, **options})
+            self.assertEqual(response.status_code, 400, options)
+
+        started = time.perf_counter()
+        assessments = [{"name": f"A{i}", "weight": 0.5} for i in range(200)]
+        response = self.app.post('/api/forecast/course-grade', json={
+            "mode": "monte_carlo", "simulations": 500000, "assessments": assessments})
+        self.assertEqual(response.status_code, 400)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        # Fewer simulations of the same assessments fit under the cap
+        response = self.app.post('/api/forecast/course-grade', json={
+            "mode": "monte_carlo", "simulations": 5000, "assessments": assessments, "seed": 0})
+        self.assertEqual(response.json['monte_carlo']['simulations'], 5000)
+
+    def test_sensitivity_grid_matches_single_forecasts(self):
+        assessments = [{"name": "A1", "weight": 30, "mark": 80}, {"name": "Midterm", "weight": 30},
+                       {"name": "Final", "weight": 40}]
+        grid = self.app.post('/api/forecast/course-grade/sensitivity', json={
+            "assessments": assessments,
+            "vary": [{"assessment": "Final", "min": 50, "max": 100, "step": 10},
+                     {"assessment": 1, "min": 60, "max": 90, "step": 15}],
+            "current_summary": {"cumulative_gpa": 3.0, "total_credits": 30}, "credits": 3
+        }).json
+        self.assertEqual([a['values'] for a in grid['axes']], [[50, 60, 70, 80, 90, 100], [60, 75, 90]])
+        self.assertEqual(len(grid['course_grade']), 6)
+        for i, final in enumerate(grid['axes'][0]['values']):
+            for j, midterm in enumerate(grid['axes'][1]['values']):
+                marks = [80, midterm, final]
+                single = self.app.post('/api/forecast/course-grade', json={
+                    "assessments": [dict(a, mark=m) for a, m in zip(assessments, marks)]
+                }).json
+                self.assertAlmostEqual(grid['course_grade'][i][j], single['summary']['earned_weighted'], places=2)
+                gpa = self.app.post('/api/forecast/gpa', json={
+                    "current_summary": {"cumulative_gpa": 3.0, "total_credits": 30},
+                    "hypothetical_courses": [{"code": "X", "credits": 3, "hypothetical": grid['course_grade'][i][j]}]
+                }).json
+                self.assertEqual(grid['cumulative_gpa'][i][j], gpa['projected']['cumulative_gpa'])
+
+        # One axis with the Midterm unmarked: each cell is the forecast's grade
+        line = self.app.post('/api/forecast/course-grade/sensitivity', json={
+            "assessments": assessments, "vary": [{"assessment": "Final", "min": 0, "max": 100, "step": 50}]
+        }).json
+        for final, grade in zip(line['axes'][0]['values'], line['course_grade']):
+            single = self.app.post('/api/forecast/course-grade', json={
+                "assessments": [assessments[0], assessments[1], dict(assessments[2], mark=final)]
+            }).json
+            self.assertAlmostEqual(grade, single['summary']['earned_weighted'], places=2)
+        self.assertEqual(line['course_grade'], [24, 44, 64])
+        self.assertIsNone(line['cumulative_gpa'])
+
+        # Opt-in partial-completion scaling, like grade_engine
+        scaled = self.app.post('/api/forecast/course-grade/sensitivity', json={
+            "assessments": assessments, "scale_partial": True,
+            "vary": [{"assessment": "Final", "min": 0, "max": 100, "step": 50}]
+        }).json
+        self.assertEqual(scaled['course_grade'], [34.29, 62.86, 91.43])
+        too_big = self.app.post('/api/forecast/course-grade/sensitivity', json={
+            "assessments": assessments, "vary": [{"assessment": "Final", "step": 0.001}]
+        })
+        self.assertEqual(too_big.status_code, 400)
+
+    def test_sensitivity_rejects_huge_ranges_before_allocating(self):
+        assessments = [{"name": "A1", "weight": 60, "mark": 80}, {"name": "Final", "weight": 40}]
+        for axis in ({"min": 0, "max": 1e9, "step": 1e-6}, {"min": -1e12, "max": 1e12, "step": 1e-12},
+                     {"step": -1}, {"step": 0}, {"min": "abc"}):
+            started = time.perf_counter()
+            response = self.app.post('/api/forecast/course-grade/sensitivity', json={
+                "assessments": assessments, "vary": [dict(axis, assessment="Final")]
+            })
+            self.assertEqual(response.status_code, 400, axis)
+            self.assertLess(time.perf_counter() - started, 0.5)
+
+        # Out-of-range bounds are clamped to 0-100 rather than rejected
+        clamped = self.app.post('/api/forecast/course-grade/sensitivity', json={
+            "assessments": assessments, "vary": [{"assessment": "Final", "min": -50, "max": 1e9, "step": 50}]
+        }).json
+        self.assertEqual(clamped['axes'][0]['values'], [0, 50, 100])
+
+    def test_oversized_course_lists_are_rejected(self):
+        from backend.config import config
+        courses = [{"code": f"C{i}", "credits": 3 + i / 100} for i in range(config.MAX_FORECAST_COURSES + 1)]
+        response = self.app.post('/api/forecast/gpa', json={"hypothetical_courses": courses, "target_gpa": 3.0})
+        self.assertEqual(response.status_code, 400)
+
+        # At the cap, mixed fractional credits still solve within the table bound
+        started = time.perf_counter()
+        response = self.app.post('/api/forecast/gpa', json={
+            "hypothetical_courses": courses[:-1], "target_gpa": 3.0})
+        self.assertEqual(response.json['target_analysis']['status'], 'Possible')
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_batch_rejects_ragged_scenarios(self):
+        response = self.app.post('/api/forecast/gpa', json={
+            "hypothetical_courses": [{"code": "CS1", "credits": 3}],
+            "scenarios": [[90, 80]]
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class MigrationTests(unittest.TestCase):
+    def test_schema_is_current_and_migrate_is_idempotent(self):
+        from backend.migrations import migrate, ensure_schema, LATEST_VERSION
+        self.assertEqual(ensure_schema(), LATEST_VERSION)
+        self.assertEqual(migrate(), [])
+
+    def test_whatif_rebuild_keeps_existing_rows(self):
+        import sqlite3
+        import tempfile
+        from backend import database
+        from backend.config import config
+        from backend.migrations import MIGRATIONS, Dialect, migrate
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'old.db')
+            # A database at version 8 with one old-style scenario
+            conn = sqlite3.connect(path)
+            conn.execute('PRAGMA foreign_keys = ON')
+            cursor = conn.cursor()
+            for version, description, apply in MIGRATIONS[:8]:
+                apply(cursor, Dialect(conn))
+            cursor.execute('CREATE TABLE schema_version (version INTEGER PRIMARY KEY, description TEXT, '
+                           'applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+            cursor.executemany('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                               [(v, d) for v, d, _ in MIGRATIONS[:8]])
+            cursor.execute('INSERT INTO "COURSE" (course_code, course_name, credit_hours, semester, student_id) '
+                           "VALUES ('CS1', 'CS1', 3, 'Fall 2025', 1)")
+            cursor.execute('INSERT INTO "WHATIFSCENARIO" (scenario_name, desired_grades, student_id, course_id) '
+                           "VALUES ('old', 80, 1, 1)")
+            conn.commit()
+            conn.close()
+
+            uri = config.SQLALCHEMY_DATABASE_URI
+            config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+            try:
+                self.assertEqual([v for v, _ in migrate()], [9])
+                self.assertEqual(query_db('SELECT course_id FROM "WHATIFSCENARIO"')[0]['course_id'], 1)
+                # course_id and desired_grades are optional now
+                execute_db('INSERT INTO "WHATIFSCENARIO" (scenario_name, student_id) VALUES (?, ?)', ('gpa', 1))
+                indexes = {r['name'] for r in query_db("SELECT name FROM sqlite_master WHERE type = 'index'")}
+                self.assertTrue({'idx_whatif_student', 'idx_whatif_course', 'idx_whatif_student_name'} <= indexes)
+                # Deleting the course still cascades to its scenario
+                execute_db('DELETE FROM "COURSE" WHERE course_id = 1')
+                names = [r['scenario_name'] for r in query_db('SELECT scenario_name FROM "WHATIFSCENARIO"')]
+                self.assertEqual(names, ['gpa'])
+            finally:
+                database._sqlite_local.connections.pop(path).really_close()
+                config.SQLALCHEMY_DATABASE_URI = uri
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def test_connection_reused_within_thread(self):
+        first = get_db_connection()
+        first.close()
+        second = get_db_connection()
+        second.close()
+        self.assertIs(first, second)
+        # The connection is still usable after close() handed it back
+        self.assertEqual(second.execute('SELECT 1').fetchone()[0], 1)
+
+    def test_health_check_reports_pool(self):
+        response = app.test_client().get('/')
+        self.assertIn('backend', response.json['pool'])
+
+
+class AdminStudentListTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_ids = []
+        for lastname in ('Zeta', 'Alpha', 'Mu', 'Alpha', 'Beta'):
+            self.student_ids.append(execute_db(
+                '''INSERT INTO "USER" (firstname, lastname, email, password, user_type)
+                   VALUES (?, ?, ?, ?, 'Student')''',
+                ('Pager', lastname, f'pager-{len(self.student_ids)}-{os.getpid()}@test.com', 'x')
+            ))
+
+    def tearDown(self):
+        for student_id in self.student_ids:
+            delete_student(student_id)
+
+    def _collect(self, sort, limit=2):
+        ids, cursor = [], None
+        while True:
+            url = f'/api/admin/students?q=pager-&limit={limit}&sort={sort}'
+            page = self.app.get(url + (f'&cursor={cursor}' if cursor else '')).json
+            self.assertLessEqual(len(page['students']), limit)
+            ids += [s['user_id'] for s in page['students']]
+            cursor = page['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_keyset_pages_cover_every_student_once(self):
+        self.assertEqual(self._collect('user_id'), self.student_ids)
+        self.assertEqual(self._collect('-user_id'), self.student_ids[::-1])
+        a1, a2, b, m, z = (self.student_ids[i] for i in (1, 3, 4, 2, 0))
+        self.assertEqual(self._collect('lastname'), [a1, a2, b, m, z])
+        self.assertEqual(self._collect('-lastname', limit=3), [z, m, b, a2, a1])
+
+    def test_total_and_validation(self):
+        page = self.app.get('/api/admin/students?q=PAGER-&include_total=1&limit=1').json
+        self.assertEqual(page['total'], 5)
+        self.assertEqual(self.app.get('/api/admin/students?cursor=bogus').status_code, 400)
+        self.assertEqual(self.app.get('/api/admin/students?limit=0').status_code, 400)
+        self.assertEqual(self.app.get('/api/admin/students?sort=password').status_code, 400)
+
+    def test_crafted_cursors_and_wildcards_are_rejected(self):
+        import base64, json
+        for payload in (["lastname", ["x"], 1], ["lastname", {"a": 1}, 1], ["lastname", 5, 1],
+                        ["user_id", "1", 1], ["lastname", "x", True]):
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = self.app.get(f'/api/admin/students?limit=1&sort={payload[0]}&cursor={cursor}')
+            self.assertEqual(response.status_code, 400, payload)
+
+        # LIKE wildcards in the search term match literally
+        for q in ('%25', 'pager_', '%25pager'):
+            self.assertEqual(self.app.get(f'/api/admin/students?q={q}&include_total=1&limit=1').json['total'], 0, q)
+        self.assertEqual(self.app.get('/api/admin/students?q=pager-&include_total=1&limit=1').json['total'], 5)
+        # Without parameters the legacy full list is returned
+        self.assertIsInstance(self.app.get('/api/admin/students').json, list)
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_query_budget_flags_repeated_statements(self):
+        with self.assertRaisesRegex(AssertionError, 'N\\+1'):
+            with query_budget(10):
+                for course_id in (1, 2, 3):
+                    query_db('SELECT * FROM "ASSESSMENT" WHERE course_id = ?', (course_id,))
+        with self.assertRaisesRegex(AssertionError, 'budget of 1 exceeded'):
+            with query_budget(1):
+                query_db('SELECT 1')
+                query_db('SELECT 2')
+
+    def test_profile_header(self):
+        from backend.config import config
+        allow = config.SQL_PROFILER_ALLOW_HEADER
+        config.SQL_PROFILER_ALLOW_HEADER = True
+        try:
+            response = app.test_client().get('/', headers={'X-SQL-Profile': '1'})
+        finally:
+            config.SQL_PROFILER_ALLOW_HEADER = allow
+        self.assertRegex(response.headers['X-SQL-Profile'], r'^queries=1; total_ms=')
+
+
+class WeatherServiceTests(unittest.TestCase):
+    def setUp(self):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.hits = []
+        self.fail = False
+        test = self
+
+        class Stub(BaseHTTPRequestHandler):
+            def do_GET(self):
+                test.hits.append(self.path)
+                if test.fail:
+                    self.send_response(502)
+                    self.end_headers()
+                    return
+                body = json.dumps({"current_weather": {
+                    "temperature": 20 + len(test.hits), "windspeed": 5, "time": "2026-01-01T00:00"
+                }}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Stub)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/v1/forecast'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_cached_then_stale_while_revalidate(self):
+        import time
+        from backend.services.weather_service import WeatherService
+        service = WeatherService(self.url, ttl=60, timeout=2)
+        self.assertEqual(service.get_current(49.17, -123.14)['temperature'], 21)
+        self.assertEqual(service.get_current(49.17, -123.14)['temperature'], 21)
+        self.assertEqual(len(self.hits), 1)
+
+        service.ttl = 0
+        self.assertEqual(service.get_current(49.17, -123.14)['temperature'], 21)  # stale, served at once
+        deadline = time.monotonic() + 2
+        while service.get_current(49.17, -123.14)['temperature'] == 21 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreater(service.get_current(49.17, -123.14)['temperature'], 21)
+
+    def test_routes_fall_back_when_upstream_fails(self):
+        from backend.services.weather_service import weather_service
+        base_url = weather_service.base_url
+        weather_service.base_url = self.url
+        weather_service.clear()
+        self.fail = True
+        try:
+            client = app.test_client()
+            self.assertEqual(client.get('/api/campus-weather').json['condition'], 'Offline')
+            self.assertEqual(client.get('/campus-weather').status_code, 503)
+            self.assertEqual(len(self.hits), 2)  # one attempt per location, then backoff
+        finally:
+            weather_service.base_url = base_url
+            weather_service.clear()
+
+
+class ResponseEncodingTests(unittest.TestCase):
+    def test_decimal_and_datetime_are_encoded_natively(self):
+        import datetime
+        import decimal
+        import json
+        encoded = app.json.dumps({"gpa": decimal.Decimal('3.70'), "at": datetime.datetime(2026, 1, 2, 3, 4)})
+        self.assertEqual(json.loads(encoded), {"gpa": 3.7, "at": "2026-01-02T03:04:00"})
+
+    def test_large_responses_are_gzipped(self):
+        import gzip
+        from backend.config import config
+        client = app.test_client()
+        min_size = config.COMPRESSION_MIN_SIZE
+        config.COMPRESSION_MIN_SIZE = 100
+        try:
+            response = client.get('/api/config/assessment-types', headers={'Accept-Encoding': 'gzip'})
+            plain = client.get('/api/config/assessment-types', headers={'Accept-Encoding': 'identity'})
+        finally:
+            config.COMPRESSION_MIN_SIZE = min_size
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertTrue(response.headers['ETag'].startswith('W/'))
+        self.assertEqual(gzip.decompress(response.get_data()), plain.get_data())
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+
+class TransactionTests(unittest.TestCase):
+    def test_rollback_discards_every_statement(self):
+        from backend.database import transaction
+        student_id = create_student_with_grades([('CS101', 3, 'Fall 2025', [(100, 100, 90)])])
+        try:
+            with self.assertRaises(RuntimeError):
+                with transaction() as tx:
+                    tx.execute('DELETE FROM "ASSESSMENT" WHERE student_id = ?', (student_id,))
+                    # Reads inside the block see the uncommitted delete
+                    self.assertEqual(query_db('SELECT COUNT(*) AS n FROM "ASSESSMENT" WHERE student_id = ?',
+                                              (student_id,), one=True)['n'], 0)
+                    raise RuntimeError("abort")
+            self.assertEqual(query_db('SELECT COUNT(*) AS n FROM "ASSESSMENT" WHERE student_id = ?',
+                                      (student_id,), one=True)['n'], 1)
+        finally:
+            delete_student(student_id)
+
+    def test_delete_student_cascades(self):
+        student_id = create_student_with_grades([('CS101', 3, 'Fall 2025', [(100, 100, 90)])])
+        response = app.test_client().delete(f'/api/admin/delete-student/{student_id}')
+        self.assertTrue(response.json['success'])
+        for table in ('COURSE', 'ASSESSMENT', 'GPAREPORT'):
+            row = query_db(f'SELECT COUNT(*) AS n FROM "{table}" WHERE student_id = ?', (student_id,), one=True)
+            self.assertEqual(row['n'], 0, table)
+
+
+class BulkImportTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([])
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def test_json_import_returns_ids(self):
+        response = self.app.post(f'/api/students/{self.student_id}/import', json={"courses": [
+            {"course_code": "CS101", "course_name": "Intro", "credit_hours": 3, "semester": "Fall 2025",
+             "assessments": [{"name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+                              "earned_marks": 90}]},
+            {"course_code": "MA101", "credit_hours": 4, "semester": "Fall 2025",
+             "assessments": [{"name": "Quiz 1", "assessment_type": "Quiz", "weight": 50, "marks": 10,
+                              "earned_marks": 7}, {"name": "Quiz 2", "assessment_type": "Quiz",
+                                                   "weight": 50, "marks": 10}]},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        courses = response.json['courses']
+        stored = self.app.get(f'/api/courses/{self.student_id}').json
+        self.assertEqual([c['course_id'] for c in courses], [c['course_id'] for c in stored])
+        assessments = self.app.get(f"/api/assessments/{courses[1]['course_id']}").json
+        self.assertEqual([a['assessment_id'] for a in assessments], courses[1]['assessment_ids'])
+        self.assertEqual(self.app.get(f'/api/calculate-gpa/{self.student_id}').json['total_credits'], 7)
+
+    def test_csv_errors_are_reported_per_row(self):
+        body = (
+            "course_code,course_name,credit_hours,semester,assessment_name,assessment_type,weight,marks,earned_marks\n"
+            "CS101,Intro,3,Fall 2025,Midterm,Midterm,40,100,80\n"
+            "CS101,Intro,3,Fall 2025,Final,Final,abc,100,\n"
+            "EN101,English,3,Fall 2025,,,,,\n"
+        )
+        url = f'/api/students/{self.student_id}/import'
+        response = self.app.post(url, data=body, content_type='text/csv')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json['errors'], [{"row": 3, "field": "weight", "message": "must be a number"}])
+        self.assertEqual(self.app.get(f'/api/courses/{self.student_id}').json, [])
+
+        # partial=true imports the courses without errors
+        response = self.app.post(url + '?partial=true', data=body, content_type='text/csv')
+        self.assertEqual([c['course_code'] for c in response.json['courses']], ['EN101'])
+
+    def test_fractional_credit_hours(self):
+        url = f'/api/students/{self.student_id}/import'
+        response = self.app.post(url, json=[{"course_code": "LAB1", "credit_hours": 1.5, "semester": "Fall 2025"}])
+        self.assertEqual(response.status_code, 200)
+        body = (
+            "course_code,course_name,credit_hours,semester,assessment_name,assessment_type,weight,marks,earned_marks\n"
+            "CS101,Intro,3.5,Fall 2025,Final,Final,100,100,90\n"
+            "MA101,Math,3.25,Fall 2025,,,,,\n"
+        )
+        response = self.app.post(url + '?partial=true', data=body, content_type='text/csv')
+        self.assertEqual(response.json['errors'],
+                         [{"row": 3, "field": "credit_hours", "message": "must have at most 1 decimal place"}])
+        credits = {c['course_code']: float(c['credit_hours']) for c in self.app.get(f'/api/courses/{self.student_id}').json}
+        self.assertEqual(credits, {"LAB1": 1.5, "CS101": 3.5})
+
+    def test_non_finite_and_boolean_numbers_are_row_errors(self):
+        url = f'/api/students/{self.student_id}/import'
+        response = self.app.post(url, json=[
+            {"course_code": "NAN1", "credit_hours": "nan", "semester": "Fall 2025"},
+            {"course_code": "INF1", "credit_hours": "inf", "semester": "Fall 2025"},
+            {"course_code": "BOOL1", "credit_hours": True, "semester": "Fall 2025",
+             "assessments": [{"name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+                              "earned_marks": False}]},
+        ])
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual([(e['row'], e['field'], e['message']) for e in response.json['errors']], [
+            (0, "credit_hours", "must be a finite number"),
+            (1, "credit_hours", "must be a finite number"),
+            (2, "credit_hours", "must be a number"),
+            (2, "earned_marks", "must be a number")])
+        self.assertEqual(self.app.get(f'/api/courses/{self.student_id}').json, [])
+
+
+
+class AssessmentBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([
+            ('CS101', 3, 'Fall 2025', [(30, 100, 80), (30, 100, 60)]),
+            ('MA101', 3, 'Fall 2025', [(100, 100, 90)]),
+        ])
+        self.course_id, self.other_id = [c['course_id'] for c in self.app.get(f'/api/courses/{self.student_id}').json]
+        self.assessments = self.app.get(f'/api/assessments/{self.course_id}').json
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def test_batch_applies_all_operations_and_returns_grade(self):
+        keep, drop = self.assessments
+        response = self.app.post(f'/api/course/{self.course_id}/assessments/batch', json={
+            "create": [{"name": "Final", "assessment_type": "Final", "weight": 40, "marks": 50, "earned_marks": 45}],
+            "update": [{**keep, "earned_marks": 90, "weight": 60}],
+            "delete": [drop['assessment_id']]
+        })
+        self.assertEqual(response.status_code, 200)
+        result = response.json
+        self.assertEqual((result['updated'], result['deleted'], len(result['created_ids'])), (1, 1, 1))
+        self.assertEqual([a['assessment_id'] for a in result['assessments']],
+                         [keep['assessment_id']] + result['created_ids'])
+        self.assertEqual(result['course']['grade'], 90.0)
+        self.assertEqual(result['course']['total_weight'], 100.0)
+
+    def test_invalid_operation_rolls_back_batch(self):
+        foreign = self.app.get(f'/api/assessments/{self.other_id}').json[0]['assessment_id']
+        response = self.app.post(f'/api/course/{self.course_id}/assessments/batch', json={
+            "create": [{"name": "Final", "assessment_type": "Final", "weight": 40, "marks": 100}],
+            "delete": [self.assessments[0]['assessment_id'], foreign]
+        })
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json['errors'], [{"op": "delete", "index": 1, "field": "assessment_id",
+                                                    "message": "is not an assessment of this course"}])
+        self.assertEqual(self.app.get(f'/api/assessments/{self.course_id}').json, self.assessments)
+        self.assertEqual(self.app.post('/api/course/0/assessments/batch', json={}).status_code, 404)
+
+    def test_operations_must_be_lists(self):
+        url = f'/api/course/{self.course_id}/assessments/batch'
+        response = self.app.post(url, json={"create": "Final", "delete": {"id": 1}})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json['errors'], [
+            {"op": "create", "field": "create", "message": "must be a list"},
+            {"op": "delete", "field": "delete", "message": "must be a list"}])
+        # JSON booleans are not ids, even when True == an assessment_id
+        from backend.services.assessment_batch import BatchValidationError, _validate
+        with self.assertRaises(BatchValidationError):
+            _validate({"delete": [True]}, {1})
+        for op, item in (("delete", True), ("update", {"assessment_id": True, "name": "x"})):
+            response = self.app.post(url, json={op: [item]})
+            self.assertEqual(response.json['errors'], [{"op": op, "index": 0, "field": "assessment_id",
+                                                        "message": "is not an assessment of this course"}])
+        response = self.app.post(url, json={"update": [self.assessments[0]['assessment_id']]})
+        self.assertEqual(response.json['errors'], [{"op": "update", "index": 0, "field": "update",
+                                                    "message": "must be an object"}])
+        self.assertEqual(self.app.get(f'/api/assessments/{self.course_id}').json, self.assessments)
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([
+            ('CS101', 3, 'Fall 2025', [(40, 100, 80), (60, 100, None)]),
+            ('MA101', 4, 'Fall 2025', []),
+        ])
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def test_student_export_streams_csv_in_batches(self):
+        import csv
+        from backend.config import config
+        batch_size = config.EXPORT_BATCH_SIZE
+        config.EXPORT_BATCH_SIZE = 1
+        try:
+            response = self.app.get(f'/api/students/{self.student_id}/export')
+            self.assertTrue(response.is_streamed)
+            chunks = list(response.response)
+        finally:
+            config.EXPORT_BATCH_SIZE = batch_size
+        self.assertEqual(len(chunks), 4)  # header + one chunk per row
+        rows = list(csv.DictReader(b''.join(chunks).decode().splitlines()))
+        self.assertEqual([(r['course_code'], r['earned_marks']) for r in rows],
+                         [('CS101', '80'), ('CS101', ''), ('MA101', '')])
+
+    def test_ndjson_and_admin_export(self):
+        import json
+        response = self.app.get(f'/api/students/{self.student_id}/export?format=ndjson')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([r['weight'] for r in rows], [40, 60, None])
+
+        everyone = self.app.get('/api/admin/export?format=ndjson').get_data(as_text=True).splitlines()
+        mine = [json.loads(line) for line in everyone if f'"student_id":{self.student_id},' in line.replace(' ', '')]
+        self.assertEqual(mine, rows)
+        self.assertEqual(self.app.get(f'/api/students/{self.student_id}/export?format=xml').status_code, 400)
+        self.assertEqual(self.app.get('/api/students/0/export').status_code, 404)
+
+class ScenarioTests(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.student_id = create_student_with_grades([('CS101', 3, 'Fall 2025', [(100, 100, 80)])])
+        self.url = f'/api/students/{self.student_id}/scenarios'
+
+    def tearDown(self):
+        delete_student(self.student_id)
+
+    def test_saved_result_is_reused_until_grades_change(self):
+        body = {"name": "Next term", "type": "gpa", "target_gpa": 3.5,
+                "hypothetical_courses": [{"code": "CS2", "credits": 3, "hypothetical": 95}]}
+        saved = self.app.post(self.url, json=body).json['scenario']
+        self.assertTrue(saved['recomputed'])
+        self.assertEqual(saved['predicted_gpa'], saved['result']['projected']['cumulative_gpa'])
+
+        # Same inputs, same grades: stored result, same row
+        again = self.app.post(self.url, json=body).json['scenario']
+        self.assertEqual((again['scenario_id'], again['recomputed']), (saved['scenario_id'], False))
+        loaded = self.app.get(f"{self.url}/{saved['scenario_id']}").json['scenario']
+        self.assertFalse(loaded['recomputed'])
+        self.assertEqual(loaded['result'], saved['result'])
+
+        # A new graded course makes the scenario stale; opening it recomputes
+        course_id = self.app.post('/api/add-course', json={
+            "course_code": "MA101", "course_name": "Math", "credit_hours": 3,
+            "semester": "Fall 2025", "student_id": self.student_id}).json['course_id']
+        self.app.post('/api/add-assessment', json={
+            "name": "Final", "assessment_type": "Final", "weight": 100, "marks": 100,
+            "earned_marks": 50, "student_id": self.student_id, "course_id": course_id})
+        self.assertTrue(self.app.get(self.url).json['scenarios'][0]['stale'])
+        reloaded = self.app.get(f"{self.url}/{saved['scenario_id']}").json['scenario']
+        self.assertTrue(reloaded['recomputed'])
+        self.assertEqual(reloaded['result']['current']['credits'], 6)
+        self.assertFalse(self.app.get(self.url).json['scenarios'][0]['stale'])
+
+        self.assertEqual(self.app.delete(f"{self.url}/{saved['scenario_id']}").status_code, 200)
+        self.assertEqual(self.app.get(f"{self.url}/{saved['scenario_id']}").status_code, 404)
+
+    def test_course_grade_scenario_and_validation(self):
+        saved = self.app.post(self.url, json={
+            "name": "Final exam", "type": "course_grade", "target_grade": 85,
+            "assessments": [{"name": "A1", "weight": 60, "mark": 90}, {"name": "Final", "weight": 40}]
+        }).json['scenario']
+        self.assertEqual(saved['target'], 85)
+        self.assertEqual(saved['result']['assessments'][1]['minimum_required'], "77.50")
+        self.assertEqual(self.app.post(self.url, json={"name": "x", "type": "gpa"}).status_code, 400)
+        self.assertEqual(self.app.post(self.url, json={"type": "gpa", "hypothetical_courses": []}).status_code, 400)
+
+    def test_course_id_must_belong_to_student(self):
+        body = {"name": "Final exam", "type": "course_grade", "assessments": [{"name": "A1", "weight": 100}]}
+        own_course = query_db('SELECT course_id FROM "COURSE" WHERE student_id = ?', (self.student_id,), one=True)
+        saved = self.app.post(self.url, json=dict(body, course_id=own_course['course_id'])).json['scenario']
+        self.assertEqual(saved['course_id'], own_course['course_id'])
+
+        other_student = create_student_with_grades([('MA101', 3, 'Fall 2025', [(100, 100, 70)])])
+        try:
+            other_course = query_db('SELECT course_id FROM "COURSE" WHERE student_id = ?', (other_student,), one=True)
+            for course_id, status in ((other_course['course_id'], 404), (999999, 404), ("abc", 400), (True, 400)):
+                response = self.app.post(self.url, json=dict(body, course_id=course_id))
+                self.assertEqual(response.status_code, status, course_id)
+        finally:
+            delete_student(other_student)
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        from backend.config import config
+        self.config = config
+        self.token, config.METRICS_TOKEN = config.METRICS_TOKEN, 'test-token'
+        self.auth = {"Authorization": "Bearer test-token"}
+
+    def tearDown(self):
+        self.config.METRICS_TOKEN = self.token
+
+    def test_metrics_require_token(self):
+        client = app.test_client()
+        self.assertEqual(client.get('/metrics').status_code, 401)
+        self.assertEqual(client.get('/metrics', headers={"Authorization": "Bearer wrong"}).status_code, 401)
+        self.config.METRICS_TOKEN = ''
+        self.assertEqual(client.get('/metrics', headers=self.auth).status_code, 404)
+
+    def _own_snapshot(self):
+        path = os.path.join(self.config.METRICS_DIR, f'metrics-{os.getpid()}.json')
+        with open(path) as f:
+            return json.load(f)
+
+    def test_persisted_snapshot_after_requests(self):
+        from backend.metrics import registry
+        client = app.test_client()
+        if registry._pending_flush is not None:
+            registry._pending_flush[1].cancel()
+            registry._pending_flush = None
+        registry._last_flush = 0.0
+        client.get('/api/config/assessment-types')
+        self.assertEqual(self._own_snapshot()['in_flight'], 0)
+
+        # A request inside the rate limit is written by the trailing flush
+        key = 'GET|/api/config/assessment-types|200'
+        interval, self.config.METRICS_FLUSH_INTERVAL = self.config.METRICS_FLUSH_INTERVAL, 0.05
+        try:
+            before = self._own_snapshot()['statuses'][key]
+            client.get('/api/config/assessment-types')
+            time.sleep(0.2)
+            snapshot = self._own_snapshot()
+            self.assertEqual(snapshot['statuses'][key], before + 1)
+            self.assertEqual(snapshot['in_flight'], 0)
+        finally:
+            self.config.METRICS_FLUSH_INTERVAL = interval
+
+    def test_dead_worker_snapshots_are_dropped(self):
+        from backend.metrics import collect_all_workers
+        os.makedirs(self.config.METRICS_DIR, exist_ok=True)
+        # A pid that can't be alive, written long enough ago to be expired
+        path = os.path.join(self.config.METRICS_DIR, 'metrics-999999999.json')
+        with open(path, 'w') as f:
+            json.dump({"pid": 999999999, "statuses": {"GET|/ghost|200": 7}}, f)
+        old = time.time() - self.config.METRICS_SNAPSHOT_TTL - 10
+        os.utime(path, (old, old))
+        self.assertNotIn("GET|/ghost|200", collect_all_workers()["statuses"])
+        self.assertFalse(os.path.exists(path))
+
+    def test_metrics_report_route_latency_and_db_usage(self):
+        client = app.test_client()
+        client.get('/api/config/assessment-types')
+        body = client.get('/metrics', headers=self.auth).get_data(as_text=True)
+        route = 'route="/api/config/assessment-types"'
+        self.assertIn(f'http_requests_total{{method="GET",{route},status="200"}}', body)
+        self.assertIn(f'http_request_duration_seconds_count{{method="GET",{route}}}', body)
+        self.assertIn(f'db_queries_per_request_bucket{{method="GET",{route},le="0"}}', body)
+        self.assertIn('http_requests_in_flight', body)
+        self.assertNotIn('route="/metrics"', body)
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,7 @@
 
 const GpaChart = {
     chartInstance: null,
+    sensitivityInstance: null,
 
     /**
      * Render the GPA trend chart.
@@ -67,6 +68,87 @@ const GpaChart = {
                 }
             }
         });
+    },
+
+    /**
+     * Render a forecast sensitivity grid (POST /api/forecast/course-grade/sensitivity).
+     * The first axis is the x axis; with a second axis, each of its values is one line.
+     * @param {string} canvasId - DOM ID of the canvas element.
+     * @param {Object} grid - { axes: [{ assessment, values }], course_grade, course_gpa }.
+     * @param {string} [metric] - 'course_grade', 'course_gpa' or 'cumulative_gpa'.
+     * @param {number} [target] - optional horizontal target line.
+     */
+    renderSensitivity(canvasId, grid, metric = 'course_grade', target = null) {
+        const ctx = document.getElementById(canvasId);
+        if (!ctx || !grid?.axes?.length) return;
+
+        if (this.sensitivityInstance) {
+            this.sensitivityInstance.destroy();
+        }
+
+        const [xAxis, seriesAxis] = grid.axes;
+        const colors = ['#3498db', '#2ecc71', '#e67e22', '#9b59b6', '#e74c3c', '#1abc9c'];
+        const rows = grid[metric] || [];
+        const series = seriesAxis
+            ? seriesAxis.values.map((value, j) => ({
+                label: `${seriesAxis.assessment}: ${value}%`,
+                data: rows.map(row => row[j])
+            }))
+            : [{ label: metric === 'course_grade' ? 'Course Grade (%)' : 'GPA', data: rows }];
+
+        const datasets = series.map((s, i) => ({
+            ...s,
+            borderColor: colors[i % colors.length],
+            backgroundColor: 'transparent',
+            tension: 0,
+            stepped: metric !== 'course_grade',
+            pointRadius: 2
+        }));
+        if (target !== null && target !== undefined) {
+            datasets.push({
+                label: 'Target',
+                data: xAxis.values.map(() => target),
+                borderColor: '#e74c3c',
+                borderDash: [6, 4],
+                pointRadius: 0
+            });
+        }
+
+        const isGrade = metric === 'course_grade';
+        this.sensitivityInstance = new Chart(ctx, {
+            type: 'line',
+            data: { labels: xAxis.values, datasets },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                scales: {
+                    y: {
+                        beginAtZero: true,
+                        max: isGrade ? 100 : 4.33,
+                        grid: { color: '#f0f0f0' },
+                        ticks: { stepSize: isGrade ? 10 : 0.5 }
+                    },
+                    x: {
+                        title: { display: true, text: `${xAxis.assessment} score (%)` },
+                        grid: { display: false }
+                    }
+                },
+                plugins: {
+                    legend: { display: datasets.length > 1 },
+                    tooltip: {
+                        backgroundColor: 'rgba(0,0,0,0.8)',
+                        padding: 10,
+                        callbacks: {
+                            label: (context) => {
+                                const val = context.raw;
+                                const text = val != null ? Number(val).toFixed(2) : '—';
+                                return `${context.dataset.label}: ${isGrade ? text + '%' : text}`;
+                            }
+                        }
+                    }
+                }
+            }
+        });
     }
 };
 
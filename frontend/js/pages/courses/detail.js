@@ -112,64 +112,79 @@ async function loadCourseDetails() {
 
         // Fetch assessments
         const assessments = await window.API.get(`/api/assessments/${courseId}`);
+        renderAssessments(assessments);
+        renderCourseGrade(localCourseGrade(assessments));
+    } catch (error) {
+        console.error('Error:', error);
+    }
+}
 
-        // Calculate total weight
-        totalWeight = assessments.reduce((sum, a) => sum + Number(a.weight), 0);
-        totalWeight = Math.round(totalWeight * 100) / 100; // Round to 2 decimals
+function renderAssessments(assessments) {
+    // Calculate total weight
+    totalWeight = assessments.reduce((sum, a) => sum + Number(a.weight), 0);
+    totalWeight = Math.round(totalWeight * 100) / 100; // Round to 2 decimals
 
-        // Update weight display
-        updateTotalWeightDisplay();
+    // Update weight display
+    updateTotalWeightDisplay();
 
-        const tbody = document.getElementById('assessmentList');
-        if (assessments.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="6" class="text-center">No assessments found.</td></tr>';
-            return;
-        }
+    const tbody = document.getElementById('assessmentList');
+    if (assessments.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="6" class="text-center">No assessments found.</td></tr>';
+        return;
+    }
 
-        tbody.innerHTML = assessments.map(a => {
-            const controls = `
-                    <button class="btn btn-sm btn-outline-primary" onclick="openEditModal(${a.assessment_id}, '${a.name}', '${a.assessment_type}', ${a.weight}, ${a.marks}, ${a.earned_marks !== null ? a.earned_marks : 'null'})">Edit</button>
-                    <button class="btn btn-sm btn-outline-danger" onclick="deleteAssessment(${a.assessment_id})">Delete</button>
-                `;
-            return `
-            <tr>
-                <td>${a.name}</td>
-                <td>${a.assessment_type}</td>
-                <td>${a.weight}%</td>
-                <td>${a.marks}</td>
-                <td>${a.earned_marks || '-'}</td>
-                <td>${controls}</td>
-            </tr>
-        `}).join('');
-
-        // Calculate course grade percentage locally (matches backend logic)
-        let course_grade = 0;
-        let total_weight = 0;
-        for (const a of assessments) {
-            if (a.earned_marks !== null && a.earned_marks !== undefined) {
-                const percentage = (Number(a.earned_marks) / Number(a.marks)) * 100;
-                course_grade += (percentage * (Number(a.weight) / 100));
-                total_weight += Number(a.weight);
-            }
-        }
+    tbody.innerHTML = assessments.map(a => {
+        const controls = `
+                <button class="btn btn-sm btn-outline-primary" onclick="openEditModal(${a.assessment_id}, '${a.name}', '${a.assessment_type}', ${a.weight}, ${a.marks}, ${a.earned_marks !== null ? a.earned_marks : 'null'})">Edit</button>
+                <button class="btn btn-sm btn-outline-danger" onclick="deleteAssessment(${a.assessment_id})">Delete</button>
+            `;
+        return `
+        <tr>
+            <td>${a.name}</td>
+            <td>${a.assessment_type}</td>
+            <td>${a.weight}%</td>
+            <td>${a.marks}</td>
+            <td>${a.earned_marks || '-'}</td>
+            <td>${controls}</td>
+        </tr>
+    `}).join('');
+}
 
-        const gradeEl = document.getElementById('courseGrade');
-        if (total_weight > 0) {
-            let course_percentage = total_weight < 100 ? (course_grade / total_weight) * 100 : course_grade;
-            if (isFinite(course_percentage)) {
-                gradeEl.textContent = `${course_percentage.toFixed(2)}%`;
-            } else {
-                gradeEl.textContent = '-';
-            }
-        } else {
-            gradeEl.textContent = '-';
+// Course grade percentage computed locally (matches backend logic); used on
+// first load, batch saves return the server's grade instead
+function localCourseGrade(assessments) {
+    let course_grade = 0;
+    let total_weight = 0;
+    for (const a of assessments) {
+        if (a.earned_marks !== null && a.earned_marks !== undefined) {
+            const percentage = (Number(a.earned_marks) / Number(a.marks)) * 100;
+            course_grade += (percentage * (Number(a.weight) / 100));
+            total_weight += Number(a.weight);
         }
+    }
+    if (total_weight <= 0) return { grade: null };
+    const grade = total_weight < 100 ? (course_grade / total_weight) * 100 : course_grade;
+    return { grade: isFinite(grade) ? grade : null };
+}
 
-    } catch (error) {
-        console.error('Error:', error);
+function renderCourseGrade(course) {
+    const gradeEl = document.getElementById('courseGrade');
+    if (course && course.grade !== null && course.grade !== undefined) {
+        const letter = course.letter_grade ? ` (${course.letter_grade})` : '';
+        gradeEl.textContent = `${Number(course.grade).toFixed(2)}%${letter}`;
+    } else {
+        gradeEl.textContent = '-';
     }
 }
 
+// Send creates/updates/deletes in one atomic request and render the result
+async function saveAssessmentBatch(batch) {
+    const result = await window.API.post(`/api/course/${courseId}/assessments/batch`, batch);
+    renderAssessments(result.assessments);
+    renderCourseGrade(result.course);
+    return result;
+}
+
 // Open Edit Course modal and populate fields
 document.getElementById('editCourseBtn')?.addEventListener('click', async () => {
     try {
@@ -241,20 +256,16 @@ document.getElementById('assessmentForm')?.addEventListener('submit', async (e)
         assessment_type: document.getElementById('assessType').value,
         weight: weightValue,
         marks: totalMarks,
-        earned_marks: earnedMarks,
-        student_id: currentUser.id,
-        course_id: courseId
+        earned_marks: earnedMarks
     };
 
     try {
-        let url = `/api/add-assessment`;
-        if (currentAssessmentId) {
-            url = `/api/update-assessment/${currentAssessmentId}`;
-        }
+        const batch = currentAssessmentId
+            ? { update: [{ ...data, assessment_id: currentAssessmentId }] }
+            : { create: [data] };
 
-        await window.API.post(url, payload);
+        await saveAssessmentBatch(batch);
         bootstrap.Modal.getInstance(document.getElementById('addAssessmentModal')).hide();
-        loadCourseDetails();
     } catch (error) {
         alert('Error saving assessment: ' + error.message);
     }
@@ -351,15 +362,7 @@ async function deleteAssessment(id) {
     if (!confirm('Are you sure you want to delete this assessment?')) return;
 
     try {
-        // We need to check if a delete endpoint exists. 
-        // Based on previous context, I don't recall a specific delete-assessment endpoint.
-        // I might need to add it to the backend if it's missing.
-        // Let's assume for now I need to add it or it might not exist.
-        // Checking app.py content from memory: I recall /delete-course but not /delete-assessment.
-        // I will add the endpoint to app.py as well to be safe.
-
-        await window.API.delete(`/api/delete-assessment/${id}`);
-        await loadCourseDetails();
+        await saveAssessmentBatch({ delete: [id] });
     } catch (error) {
         console.error('Error:', error);
     }
@@ -16,64 +16,119 @@ window.onload = async () => {
     await loadStudents();
 };
 
+const STUDENT_PAGE_SIZE = 25;
+
+// Keyset pagination state for the student list
+let studentCursor = null;
+let studentsLoaded = 0;
+let studentsLoading = false;
+let studentListObserver = null;
+
+// Fall semester GPA from a student's courses and their GPA course grades
+function calculateFallGPA(courses, gpaData) {
+    let fallGradePoints = 0;
+    let fallCredits = 0;
+
+    courses.forEach(course => {
+        // Check if semester contains "Fall" (case-insensitive)
+        if (course.semester && course.semester.toLowerCase().includes('fall')) {
+            // Find GPA for this course from gpaData.course_grades
+            const courseGrades = gpaData.course_grades || [];
+            const gradeData = courseGrades.find(g => g.course_code === course.course_code);
+            const gpa = gradeData && typeof gradeData.gpa !== 'undefined' ? Number(gradeData.gpa) : null;
+
+            if (gpa !== null && course.credit_hours) {
+                fallGradePoints += gpa * course.credit_hours;
+                fallCredits += course.credit_hours;
+            }
+        }
+    });
+
+    return fallCredits > 0 ? fallGradePoints / fallCredits : 0.0;
+}
+
+// Reset the list and load the first page
 async function loadStudents() {
+    studentCursor = null;
+    studentsLoaded = 0;
+    document.getElementById('studentList').innerHTML = '';
+    await loadMoreStudents(true);
+    observeListEnd();
+}
+
+// Append the next page of students; GPA cells fill in as they arrive
+async function loadMoreStudents(first = false) {
+    if (studentsLoading || (!first && !studentCursor)) return;
+    studentsLoading = true;
+    const button = document.getElementById('loadMoreStudents');
+    button.disabled = true;
+
     try {
-        const students = await window.API.get('/api/admin/students');
+        let url = `/api/admin/students?limit=${STUDENT_PAGE_SIZE}&sort=user_id`;
+        url += studentCursor ? `&cursor=${encodeURIComponent(studentCursor)}` : '&include_total=1';
+        const page = await window.API.get(url);
 
         const tbody = document.getElementById('studentList');
-        tbody.innerHTML = '';
-
-        for (const student of students) {
-            // Fetch GPA for each student
-            const gpaData = await window.API.get(`/api/admin/student/${student.user_id}/gpa`);
-
-            // Fetch courses to calculate Fall semester GPA
-            const courses = await window.API.get(`/api/courses/${student.user_id}`);
-
-            // Calculate Fall semester GPA on the frontend
-            let fallGPA = 0.0;
-            let fallGradePoints = 0;
-            let fallCredits = 0;
-
-            courses.forEach(course => {
-                // Check if semester contains "Fall" (case-insensitive)
-                if (course.semester && course.semester.toLowerCase().includes('fall')) {
-                    // Find GPA for this course from gpaData.course_grades
-                    const courseGrades = gpaData.course_grades || [];
-                    const gradeData = courseGrades.find(g => g.course_code === course.course_code);
-                    const gpa = gradeData && typeof gradeData.gpa !== 'undefined' ? Number(gradeData.gpa) : null;
-
-                    if (gpa !== null && course.credit_hours) {
-                        fallGradePoints += gpa * course.credit_hours;
-                        fallCredits += course.credit_hours;
-                    }
-                }
-            });
-
-            // Calculate Fall semester GPA
-            if (fallCredits > 0) {
-                fallGPA = fallGradePoints / fallCredits;
-            }
-
+        const rows = page.students.map(student => {
             const tr = document.createElement('tr');
             tr.innerHTML = `
                     <td>${student.user_id}</td>
                     <td>${student.firstname} ${student.lastname}</td>
                     <td>${student.email}</td>
-                    <td>${fallGPA.toFixed(2)} / ${gpaData.cumulative_gpa.toFixed(2)}</td>
+                    <td class="student-gpa">...</td>
                     <td>
                         <button class="btn btn-sm btn-primary" onclick="viewStudent(${student.user_id}, '${student.firstname} ${student.lastname}')">View Details</button>
                         <button class="btn btn-sm btn-danger ms-2" onclick="deleteStudent(${student.user_id}, '${student.firstname} ${student.lastname}')">Delete</button>
                     </td>
                 `;
             tbody.appendChild(tr);
-        }
+            return { student, tr };
+        });
 
+        studentCursor = page.next_cursor;
+        studentsLoaded += page.students.length;
+        if (typeof page.total === 'number') {
+            document.getElementById('studentCount').dataset.total = page.total;
+        }
+        updateStudentCount();
+        button.classList.toggle('d-none', !studentCursor);
+
+        // Fetch GPA for the page's students in parallel
+        await Promise.all(rows.map(async ({ student, tr }) => {
+            const cell = tr.querySelector('.student-gpa');
+            try {
+                const [gpaData, courses] = await Promise.all([
+                    window.API.get(`/api/admin/student/${student.user_id}/gpa`),
+                    window.API.get(`/api/courses/${student.user_id}`)
+                ]);
+                cell.textContent = `${calculateFallGPA(courses, gpaData).toFixed(2)} / ${gpaData.cumulative_gpa.toFixed(2)}`;
+            } catch (err) {
+                cell.textContent = 'N/A';
+            }
+        }));
     } catch (error) {
         console.error('Error:', error);
+    } finally {
+        studentsLoading = false;
+        button.disabled = false;
     }
 }
 
+function updateStudentCount() {
+    const countEl = document.getElementById('studentCount');
+    const total = countEl.dataset.total;
+    countEl.textContent = total ? `Showing ${studentsLoaded} of ${total} students` : `Showing ${studentsLoaded} students`;
+}
+
+// Load the next page automatically when the "Load more" button scrolls into view
+function observeListEnd() {
+    if (studentListObserver || !('IntersectionObserver' in window)) return;
+    studentListObserver = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMoreStudents();
+    });
+    studentListObserver.observe(document.getElementById('loadMoreStudents'));
+}
+
 async function deleteStudent(studentId, studentName) {
     if (!confirm(`Delete student ${studentName}? This will remove their courses and assessments.`)) return;
     try {
@@ -102,30 +157,7 @@ async function viewStudent(studentId, studentName) {
         const courses = await window.API.get(`/api/courses/${studentId}`);
 
         if (gpaData) {
-            // Calculate Fall semester GPA on the frontend
-            let fallGPA = 0.0;
-            let fallGradePoints = 0;
-            let fallCredits = 0;
-
-            courses.forEach(course => {
-                // Check if semester contains "Fall" (case-insensitive)
-                if (course.semester && course.semester.toLowerCase().includes('fall')) {
-                    // Find GPA for this course from gpaData.course_grades
-                    const courseGrades = gpaData.course_grades || [];
-                    const gradeData = courseGrades.find(g => g.course_code === course.course_code);
-                    const gpa = gradeData && typeof gradeData.gpa !== 'undefined' ? Number(gradeData.gpa) : null;
-
-                    if (gpa !== null && course.credit_hours) {
-                        fallGradePoints += gpa * course.credit_hours;
-                        fallCredits += course.credit_hours;
-                    }
-                }
-            });
-
-            // Calculate Fall semester GPA
-            if (fallCredits > 0) {
-                fallGPA = fallGradePoints / fallCredits;
-            }
+            const fallGPA = calculateFallGPA(courses, gpaData);
 
             gpaEl.innerHTML = `<strong>GPA (Semester / Cumulative):</strong> ${fallGPA.toFixed(2)} / ${gpaData.cumulative_gpa.toFixed(2)}`;
         } else {
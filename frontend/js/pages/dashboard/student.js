@@ -5,6 +5,7 @@ let courseGrades = []; // populated by calculate-gpa
 let allCourses = []; // store all courses for assessment trend analysis
 let assessmentTypeTrendChartInstance = null; // store chart instance for updates
 let gpaChartInstance = null; // store GPA chart instance to destroy before recreating
+let dashboardBundle = null; // GPA, courses and trends from /api/students/<id>/dashboard
 
 // Student Dashboard Controller
 // Refactored to use Services and Components.
@@ -63,6 +64,7 @@ async function loadDashboardData(retryCount = 0) {
     if (banner) banner.classList.add('d-none');
 
     await loadWeather();
+    await loadDashboardBundle();
     await loadGPA();
     await loadCourses();
     await loadAllAssessmentTypesTrend();
@@ -81,31 +83,27 @@ async function loadWeather() {
     }
 }
 
-async function loadGPA() {
-    let gpaData = null;
-    let courses = [];
-
-    // 1. Fetch GPA data
+/**
+ * Fetch GPA summary, courses, semester GPAs and assessment trends in one request.
+ */
+async function loadDashboardBundle() {
     try {
-        gpaData = await window.API.get(`/api/calculate-gpa/${currentUser.id}`);
-        courseGrades = gpaData.course_grades || [];
+        dashboardBundle = await window.API.get(`/api/students/${currentUser.id}/dashboard`);
     } catch (error) {
-        console.error('GPA calculation error:', error);
-        courseGrades = [];
+        console.error('Dashboard data error:', error);
+        dashboardBundle = null;
     }
+    allCourses = Array.isArray(dashboardBundle?.courses) ? dashboardBundle.courses : [];
+}
 
-    // 2. Fetch courses
-    try {
-        courses = await window.API.get(`/api/courses/${currentUser.id}`);
-        if (!Array.isArray(courses)) courses = [];
-    } catch (error) {
-        console.error('Error fetching courses for GPA:', error);
-        courses = [];
-    }
+async function loadGPA() {
+    const gpaData = dashboardBundle ? dashboardBundle.gpa : null;
+    const courses = allCourses;
+    courseGrades = gpaData?.course_grades || [];
 
-    // 3. Render (always runs even if APIs failed)
+    // Render (always runs even if the API failed)
     try {
-        const semesterGPAs = calculateSemesterGPAs(courses, courseGrades);
+        const semesterGPAs = dashboardBundle?.semester_gpas || [];
         const latestSem = semesterGPAs.length > 0 ? semesterGPAs[semesterGPAs.length - 1] : null;
         const latestSemGPA = latestSem ? latestSem.gpa : 0;
 
@@ -140,10 +138,8 @@ function getCourseGPA(courseCode) {
 
 async function loadCourses() {
     try {
-        const courses = await window.API.get(`/api/courses/${currentUser.id}`);
-
-        // Store courses globally for assessment trend analysis
-        allCourses = courses;
+        if (!dashboardBundle) throw new Error('Dashboard data unavailable');
+        const courses = [...allCourses];
 
         const tbody = document.getElementById('coursesList');
         if (!tbody) return;
@@ -226,56 +222,6 @@ async function deleteCourse(courseId, courseCode) {
     }
 }
 
-function calculateSemesterGPAs(courses, courseGrades) {
-    // Group courses by semester
-    const semesterMap = {};
-
-    courses.forEach(course => {
-        const semester = course.semester || 'Unknown';
-        if (!semesterMap[semester]) {
-            semesterMap[semester] = {
-                courses: [],
-                totalPoints: 0,
-                totalCredits: 0
-            };
-        }
-
-        // Find GPA for this course
-        const gradeData = courseGrades.find(g => g.course_code === course.course_code);
-        const gpa = gradeData && typeof gradeData.gpa !== 'undefined' ? Number(gradeData.gpa) : null;
-
-        if (gpa !== null && course.credit_hours) {
-            semesterMap[semester].totalPoints += gpa * course.credit_hours;
-            semesterMap[semester].totalCredits += course.credit_hours;
-        }
-    });
-
-    // Calculate GPA for each semester and sort
-    const semesterOrder = ['Spring', 'Summer', 'Fall', 'Winter'];
-    const result = Object.entries(semesterMap)
-        .map(([semester, data]) => ({
-            semester,
-            gpa: data.totalCredits > 0 ? data.totalPoints / data.totalCredits : 0
-        }))
-        .sort((a, b) => {
-            // Extract year and season
-            const [seasonA, yearA] = a.semester.split(' ');
-            const [seasonB, yearB] = b.semester.split(' ');
-
-            // Sort by year first
-            if (yearA !== yearB) {
-                return (yearA || '0') - (yearB || '0');
-            }
-
-            // Then by season
-            const indexA = semesterOrder.indexOf(seasonA);
-            const indexB = semesterOrder.indexOf(seasonB);
-            return (indexA === -1 ? 999 : indexA) - (indexB === -1 ? 999 : indexB);
-        });
-
-    return result;
-}
-
 /**
  * Shorten semester labels: 'Fall 2026' → "Fall '26"
  */
@@ -471,70 +417,9 @@ async function loadAssessmentTypeTrend() {
 }
 
 async function fetchAssessmentsBySemester(assessmentType) {
-    // Group courses by semester
-    const semesterMap = {};
-
-    // Fetch assessments for each course
-    for (const course of allCourses) {
-        const semester = course.semester || 'Unknown';
-
-        try {
-            const assessments = await window.API.get(`/api/assessments/${course.course_id}`);
-
-            // Filter assessments by type
-            const filteredAssessments = assessments.filter(a =>
-                a.assessment_type === assessmentType
-            );
-
-            if (filteredAssessments.length > 0) {
-                if (!semesterMap[semester]) {
-                    semesterMap[semester] = {
-                        totalScore: 0,
-                        count: 0,
-                        assessments: []
-                    };
-                }
-
-                // Calculate scores for this semester
-                filteredAssessments.forEach(assessment => {
-                    if (assessment.marks > 0 && assessment.earned_marks !== null) {
-                        const score = (assessment.earned_marks / assessment.marks) * 100;
-                        semesterMap[semester].totalScore += score;
-                        semesterMap[semester].count += 1;
-                        semesterMap[semester].assessments.push(assessment);
-                    }
-                });
-            }
-        } catch (error) {
-            console.error(`Error fetching assessments for course ${course.course_id}:`, error);
-        }
-    }
-
-    // Calculate averages and sort by semester
-    const semesterOrder = ['Spring', 'Summer', 'Fall', 'Winter'];
-    const result = Object.entries(semesterMap)
-        .map(([semester, data]) => ({
-            semester,
-            averageScore: data.count > 0 ? data.totalScore / data.count : null,
-            count: data.count
-        }))
-        .sort((a, b) => {
-            // Extract year and season
-            const [seasonA, yearA] = a.semester.split(' ');
-            const [seasonB, yearB] = b.semester.split(' ');
-
-            // Sort by year first
-            if (yearA !== yearB) {
-                return (yearA || '0') - (yearB || '0');
-            }
-
-            // Then by season
-            const indexA = semesterOrder.indexOf(seasonA);
-            const indexB = semesterOrder.indexOf(seasonB);
-            return (indexA === -1 ? 999 : indexA) - (indexB === -1 ? 999 : indexB);
-        });
-
-    return result;
+    // Per-semester averages are pre-aggregated by the dashboard endpoint
+    const trends = dashboardBundle?.assessment_trends || {};
+    return trends[assessmentType] || [];
 }
 
 function renderAssessmentTypeTrendChart(typeDataArray, selectedType) {
@@ -15,8 +15,10 @@ window.onload = async () => {
     setupHeader(user);
     setupEventListeners();
 
-    // 3. Load Initial Data (Current Summary)
+    // 3. Load Initial Data (Current Summary, saved scenarios)
+    window.currentUserId = user.id;
     await loadCurrentSummary(user.id);
+    await loadScenarioList();
 };
 
 function setupHeader(user) {
@@ -53,12 +55,16 @@ function setupEventListeners() {
     document.getElementById('addCourseRow')?.addEventListener('click', addEmptyRow);
     document.getElementById('runAnalysisBtn')?.addEventListener('click', runAnalysis);
     document.getElementById('resetInputs')?.addEventListener('click', resetInputs);
+    document.getElementById('saveScenarioBtn')?.addEventListener('click', saveScenario);
+    document.getElementById('savedScenarios')?.addEventListener('change', (e) => {
+        if (e.target.value) openScenario(e.target.value);
+    });
 
     // Initialize with one row
     addEmptyRow();
 }
 
-function addEmptyRow() {
+function addEmptyRow(course = null) {
     const tbody = document.getElementById('whatIfBody');
     if (!tbody) return;
 
@@ -83,6 +89,14 @@ function addEmptyRow() {
         }
     });
 
+    if (course) {
+        const inputs = tr.querySelectorAll('input');
+        inputs[0].value = course.code || '';
+        inputs[1].value = course.name || '';
+        inputs[2].value = course.credits;
+        inputs[3].value = course.hypothetical ?? '';
+    }
+
     tbody.appendChild(tr);
 }
 
@@ -93,16 +107,7 @@ function resetInputs() {
     addEmptyRow();
 }
 
-async function runAnalysis() {
-    // Gather Inputs
-    const currentSummary = window.currentSummary || { cumulative_gpa: 0, total_credits: 0 };
-    const targetGPA = parseFloat(document.getElementById('targetGPA').value);
-
-    if (isNaN(targetGPA) || targetGPA < 0 || targetGPA > 4.33) {
-        alert("Please enter a valid target GPA (0.0 - 4.33)");
-        return;
-    }
-
+function gatherCourses() {
     const rows = Array.from(document.querySelectorAll('#whatIfBody tr'));
     const hypotheticalCourses = [];
 
@@ -111,18 +116,94 @@ async function runAnalysis() {
         if (inputs.length < 4) return;
 
         const code = inputs[0].value.trim();
+        const name = inputs[1].value.trim();
         const credits = parseFloat(inputs[2].value);
         const hypoGrade = inputs[3].value ? parseFloat(inputs[3].value) : null;
 
         if (code && !isNaN(credits)) {
             hypotheticalCourses.push({
                 code: code,
+                name: name,
                 credits: credits,
                 hypothetical: hypoGrade
             });
         }
     });
 
+    return hypotheticalCourses;
+}
+
+async function loadScenarioList(selectedId = null) {
+    const select = document.getElementById('savedScenarios');
+    if (!select) return;
+    try {
+        const { scenarios } = await window.forecastService.listScenarios(window.currentUserId);
+        select.innerHTML = '<option value="">Saved scenarios...</option>' + scenarios
+            .filter(s => s.type === 'gpa')
+            .map(s => `<option value="${s.scenario_id}">${s.name}${s.stale ? ' (grades changed)' : ''}</option>`)
+            .join('');
+        if (selectedId) select.value = selectedId;
+    } catch (e) {
+        console.error('Failed to load saved scenarios', e);
+    }
+}
+
+async function saveScenario() {
+    const name = document.getElementById('scenarioName')?.value.trim();
+    const hypotheticalCourses = gatherCourses();
+    const targetGPA = parseFloat(document.getElementById('targetGPA').value);
+
+    if (!name) {
+        alert("Please enter a name for this scenario.");
+        return;
+    }
+    if (hypotheticalCourses.length === 0) {
+        alert("Please add at least one valid future course.");
+        return;
+    }
+
+    try {
+        // The current summary is left out so the server uses (and tracks) the stored grades
+        const { scenario } = await window.forecastService.saveScenario(window.currentUserId, {
+            name: name,
+            type: 'gpa',
+            hypothetical_courses: hypotheticalCourses,
+            target_gpa: isNaN(targetGPA) ? null : targetGPA
+        });
+        renderResults(scenario.result);
+        await loadScenarioList(scenario.scenario_id);
+    } catch (error) {
+        alert("Error saving scenario: " + error.message);
+    }
+}
+
+async function openScenario(scenarioId) {
+    try {
+        const { scenario } = await window.forecastService.loadScenario(window.currentUserId, scenarioId);
+        const tbody = document.getElementById('whatIfBody');
+        tbody.innerHTML = '';
+        scenario.inputs.hypothetical_courses.forEach(course => addEmptyRow(course));
+        document.getElementById('targetGPA').value = scenario.inputs.target_gpa ?? '';
+        document.getElementById('scenarioName').value = scenario.name;
+        renderResults(scenario.result);
+        if (scenario.recomputed) await loadScenarioList(scenario.scenario_id);
+    } catch (error) {
+        alert("Error loading scenario: " + error.message);
+    }
+}
+
+async function runAnalysis() {
+    // Gather Inputs
+    const currentSummary = window.currentSummary || { cumulative_gpa: 0, total_credits: 0 };
+    const targetGPA = parseFloat(document.getElementById('targetGPA').value);
+
+    if (isNaN(targetGPA) || targetGPA < 0 || targetGPA > 4.33) {
+        alert("Please enter a valid target GPA (0.0 - 4.33)");
+        return;
+    }
+
+    const hypotheticalCourses = gatherCourses();
+
     if (hypotheticalCourses.length === 0) {
         alert("Please add at least one valid future course.");
         return;
@@ -165,7 +246,7 @@ function renderResults(result) {
             <td class="text-center">${c.credits}</td>
             <td class="text-center">${c.hypothetical !== null ? c.hypothetical.toFixed(2) : '-'}</td>
             <td class="text-center fw-bold ${getMinReqColor(c.minimum_required)}">${c.minimum_required}</td>
-            <td class="text-center">-</td> 
+            <td class="text-center">${c.minimum_letter || '-'}</td>
         </tr>
     `).join('');
 
@@ -63,8 +63,32 @@ async function runAnalysis() {
             alert("Note: The target grade is mathematically impossible with current known marks.");
         }
 
+        await renderSensitivity(assessments, targetGrade);
+
     } catch (error) {
         console.error(error);
         alert("Error running analysis: " + error.message);
     }
 }
+
+// Chart the course grade against the heaviest unmarked assessment's score
+async function renderSensitivity(assessments, targetGrade) {
+    const card = document.getElementById('sensitivityCard');
+    const pending = assessments.filter(a => a.mark === null);
+    if (!card || pending.length === 0) {
+        if (card) card.style.display = 'none';
+        return;
+    }
+
+    const heaviest = pending.reduce((best, a) => (a.weight > best.weight ? a : best));
+    try {
+        const grid = await window.forecastService.courseGradeSensitivity(assessments, [
+            { assessment: assessments.indexOf(heaviest), min: 0, max: 100, step: 5 }
+        ]);
+        card.style.display = 'block';
+        window.GpaChart.renderSensitivity('sensitivityChart', grid, 'course_grade', targetGrade);
+    } catch (error) {
+        console.error('Sensitivity chart failed:', error);
+        card.style.display = 'none';
+    }
+}
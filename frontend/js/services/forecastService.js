@@ -2,19 +2,62 @@
 // Handles "What-If" scenario calculations via Backend API.
 
 const forecastService = {
-    async predictGPA(currentGPA, currentCredits, courses, targetGPA) {
+    /**
+     * @param {Object} [options] - e.g. { mode: 'monte_carlo', student_id, simulations, seed }
+     *   adds a "monte_carlo" block with the probability of reaching the target
+     */
+    async predictGPA(currentGPA, currentCredits, courses, targetGPA, options = {}) {
         return window.API.post('/api/forecast/gpa', {
             current_summary: { cumulative_gpa: currentGPA, total_credits: currentCredits },
             hypothetical_courses: courses,
+            target_gpa: targetGPA || null,
+            ...options
+        });
+    },
+
+    /**
+     * Evaluate many grade combinations in one request.
+     * @param {Array<Array<number|null>>} scenarios - one row per scenario, one % per course
+     */
+    async predictGPABatch(currentGPA, currentCredits, courses, scenarios, targetGPA) {
+        return window.API.post('/api/forecast/gpa', {
+            current_summary: { cumulative_gpa: currentGPA, total_credits: currentCredits },
+            hypothetical_courses: courses,
+            scenarios: scenarios,
             target_gpa: targetGPA || null
         });
     },
 
-    async predictCourseGrade(assessments, targetGrade) {
+    async predictCourseGrade(assessments, targetGrade, options = {}) {
         return window.API.post('/api/forecast/course-grade', {
             assessments: assessments,
-            target_grade: targetGrade || null
+            target_grade: targetGrade || null,
+            ...options
+        });
+    },
+
+    /**
+     * Course grade/GPA over a grid of marks in one request.
+     * @param {Array<Object>} vary - one or two { assessment, min, max, step } ranges
+     */
+    async courseGradeSensitivity(assessments, vary) {
+        return window.API.post('/api/forecast/course-grade/sensitivity', {
+            assessments: assessments,
+            vary: vary
         });
+    },
+
+    // Saved what-if scenarios (results are cached server-side per grades version)
+    async listScenarios(studentId) {
+        return window.API.get(`/api/students/${studentId}/scenarios`);
+    },
+
+    async saveScenario(studentId, scenario) {
+        return window.API.post(`/api/students/${studentId}/scenarios`, scenario);
+    },
+
+    async loadScenario(studentId, scenarioId) {
+        return window.API.get(`/api/students/${studentId}/scenarios/${scenarioId}`);
     }
 };
 
@@ -0,0 +1,98 @@
+# JSON / Compression Benchmark
+# Compares Flask's default JSON provider with FastJSONProvider on the admin
+# student list and the course/assessment payloads, and reports bytes on the
+# wire with and without compression. Runs against a throwaway SQLite DB
+# (DATABASE_URL is pointed at it before the app is imported):
+#
+#     python scripts/bench_json.py [--students 2000]
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import tempfile
+import timeit
+
+# Run from anywhere: make the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _seed(execute_db, students, courses_per_student, assessments_per_course):
+    first_student = None
+    for s in range(students):
+        student_id = execute_db(
+            '''INSERT INTO "USER" (firstname, lastname, email, password, user_type)
+               VALUES (?, ?, ?, ?, 'Student')''',
+            (f'First{s}', f'Last{s}', f'bench{s}@test.com', 'x')
+        )
+        first_student = first_student or student_id
+        for c in range(courses_per_student if student_id == first_student else 0):
+            course_id = execute_db(
+                '''INSERT INTO "COURSE" (course_code, course_name, credit_hours, semester, student_id)
+                   VALUES (?, ?, ?, ?, ?)''',
+                (f'CS{100 + c}', f'Course {c}', 3, 'Fall 2025', student_id)
+            )
+            for a in range(assessments_per_course):
+                execute_db(
+                    '''INSERT INTO "ASSESSMENT" (name, assessment_type, weight, marks, earned_marks, student_id, course_id)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                    (f'Item {a}', 'Quiz', 10, 100, 50 + a, student_id, course_id)
+                )
+    return first_student
+
+
+def _as_postgres(rows):
+    """psycopg2 returns DECIMAL columns as Decimal and timestamps as datetime."""
+    now = datetime.datetime(2026, 1, 1, 12, 0)
+    return [{
+        k: decimal.Decimal(str(v)) if isinstance(v, float) else v
+        for k, v in row.items()
+    } | {"created_at": now} for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--courses', type=int, default=40)
+    parser.add_argument('--assessments', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from flask.json.provider import DefaultJSONProvider
+    from backend.app import app
+    from backend.database import execute_db
+    from backend.json_provider import FastJSONProvider
+    from backend.compression import brotli
+
+    student_id = _seed(execute_db, args.students, args.courses, args.assessments)
+    client = app.test_client()
+    course_id = client.get(f'/api/courses/{student_id}').json[0]['course_id']
+    endpoints = [
+        '/api/admin/students',
+        f'/api/courses/{student_id}',
+        f'/api/assessments/{course_id}',
+    ]
+
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    print(f"brotli: {'yes' if brotli else 'no'}")
+    print(f"{'endpoint':<32}{'default ms':>12}{'fast ms':>10}{'identity B':>12}{'gzip B':>10}{'br B':>10}")
+    for path in endpoints:
+        payload = _as_postgres(client.get(path, headers={'Accept-Encoding': 'identity'}).json)
+        default_ms = min(timeit.repeat(lambda: default_provider.dumps(payload), number=1, repeat=args.repeat)) * 1000
+        fast_ms = min(timeit.repeat(lambda: fast_provider.dumps(payload), number=1, repeat=args.repeat)) * 1000
+
+        sizes = []
+        for encoding in ('identity', 'gzip', 'br'):
+            response = client.get(path, headers={'Accept-Encoding': encoding})
+            if encoding != 'identity' and response.headers.get('Content-Encoding') != encoding:
+                sizes.append('-')
+            else:
+                sizes.append(len(response.get_data()))
+        print(f"{path:<32}{default_ms:>12.2f}{fast_ms:>10.2f}{sizes[0]:>12}{sizes[1]:>10}{sizes[2]:>10}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())